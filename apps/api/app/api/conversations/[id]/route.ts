@@ -1,19 +1,26 @@
 import { NextRequest, NextResponse } from "next/server";
-import { eq, asc } from "drizzle-orm";
+import { and, asc, eq, gte, ne } from "drizzle-orm";
 import { db } from "@/lib/db";
 import * as schema from "@/lib/db/schema";
 
+const UUID_RE =
+  /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
 /**
  * GET /api/conversations/:id
  *
  * Get a conversation with all its messages.
+ * With ?after=<message id | ISO timestamp>, only messages created at or after
+ * that message (excluding it) or time are returned, so pollers can fetch
+ * just what is new.
  */
 export async function GET(
-  _request: NextRequest,
+  request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
   try {
     const { id } = await params;
+    const after = new URL(request.url).searchParams.get("after");
 
     const conversation = await db.query.conversations.findFirst({
       where: eq(schema.conversations.id, id),
@@ -31,11 +38,45 @@ export async function GET(
       where: eq(schema.patients.id, conversation.patientId),
     });
 
+    // Resolve the ?after= cursor to a timestamp
+    const filters = [eq(schema.messages.conversationId, id)];
+    if (after) {
+      let since: Date | undefined;
+      if (UUID_RE.test(after)) {
+        const cursor = await db.query.messages.findFirst({
+          where: and(
+            eq(schema.messages.id, after),
+            eq(schema.messages.conversationId, id)
+          ),
+        });
+        if (!cursor) {
+          return NextResponse.json(
+            { error: `Message ${after} not found in this conversation` },
+            { status: 404 }
+          );
+        }
+        since = cursor.createdAt;
+        filters.push(ne(schema.messages.id, after));
+      } else {
+        since = new Date(after);
+        if (Number.isNaN(since.getTime())) {
+          return NextResponse.json(
+            {
+              error: "Validation error",
+              details: { after: ["Expected a message id or an ISO timestamp"] },
+            },
+            { status: 400 }
+          );
+        }
+      }
+      filters.push(gte(schema.messages.createdAt, since));
+    }
+
     // Load messages
     const messages = await db
       .select()
       .from(schema.messages)
-      .where(eq(schema.messages.conversationId, id))
+      .where(and(...filters))
       .orderBy(asc(schema.messages.createdAt));
 
     return NextResponse.json({
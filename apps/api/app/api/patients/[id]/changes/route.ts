@@ -0,0 +1,141 @@
+import { createHash } from "node:crypto";
+import { NextRequest, NextResponse } from "next/server";
+import { getPatientEHR } from "@/lib/agent/prompts";
+
+type Dated = {
+  start?: Date | string | null;
+  stop?: Date | string | null;
+  date?: Date | string | null;
+};
+
+/** Whether a record started, stopped or happened at or after `since`. */
+function changedSince(record: Dated, since: Date): boolean {
+  return [record.start, record.stop, record.date].some(
+    (value) => value != null && new Date(value) >= since
+  );
+}
+
+const FINGERPRINT_FIELDS = [
+  "id",
+  "start",
+  "stop",
+  "date",
+  "code",
+  "description",
+  "encounterId",
+  "value",
+] as const;
+
+/**
+ * SHA-256 over every record's identity, dates, code, description and value,
+ * independent of record order. Mirrors `ehr_fingerprint` in the Python
+ * client, which compares it with the merged profile.
+ */
+function fingerprint(records: Record<string, object[]>): string {
+  const lines: string[] = [];
+  for (const [kind, rows] of Object.entries(records)) {
+    for (const row of rows) {
+      const fields = row as Record<string, unknown>;
+      lines.push(
+        JSON.stringify([
+          kind,
+          ...FINGERPRINT_FIELDS.map((field) => {
+            const value = fields[field];
+            return value instanceof Date ? value.toISOString() : value ?? null;
+          }),
+        ])
+      );
+    }
+  }
+  return createHash("sha256").update(lines.sort().join("\n")).digest("hex");
+}
+
+/**
+ * GET /api/patients/:id/changes?since=<ISO timestamp>
+ *
+ * Get the EHR records of a patient that changed at or after `since`, for
+ * refreshing a cached profile. The schema has no modification timestamps, so
+ * a record counts as changed when its own start, stop or date falls at or
+ * after `since`. Edits that leave every date before `since` (a corrected
+ * code, a reseed with the same dates) are not returned; instead, the summary
+ * counts and `fingerprint`, a hash of the full current EHR, let clients detect
+ * a merged profile that differs from the server and refetch it in full.
+ */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const sinceParam = new URL(request.url).searchParams.get("since");
+    const since = sinceParam ? new Date(sinceParam) : undefined;
+    if (!since || Number.isNaN(since.getTime())) {
+      return NextResponse.json(
+        {
+          error: "Validation error",
+          details: { since: ["Expected an ISO 8601 timestamp"] },
+        },
+        { status: 400 }
+      );
+    }
+
+    const until = new Date().toISOString();
+    const ehr = await getPatientEHR(id);
+
+    if (!ehr) {
+      return NextResponse.json({ error: "Patient not found" }, { status: 404 });
+    }
+
+    const changed = <T extends Dated>(records: T[]) =>
+      records.filter((record) => changedSince(record, since));
+    const recentObservations = ehr.observations.slice(-30);
+
+    return NextResponse.json({
+      data: {
+        since: since.toISOString(),
+        until,
+        patient: ehr.patient,
+        summary: {
+          conditionsCount: ehr.conditions.length,
+          activeConditions: ehr.conditions
+            .filter((c) => !c.stop)
+            .map((c) => c.description),
+          medicationsCount: ehr.medications.length,
+          activeMedications: ehr.medications
+            .filter((m) => !m.stop)
+            .map((m) => m.description),
+          allergiesCount: ehr.allergies.length,
+          allergies: ehr.allergies.map((a) => a.description),
+          encountersCount: ehr.encounters.length,
+          proceduresCount: ehr.procedures.length,
+          immunizationsCount: ehr.immunizations.length,
+          activeCareplanCount: ehr.careplans.filter((c) => !c.stop).length,
+        },
+        conditions: changed(ehr.conditions),
+        medications: changed(ehr.medications),
+        allergies: changed(ehr.allergies),
+        procedures: changed(ehr.procedures),
+        careplans: changed(ehr.careplans),
+        recentObservations: changed(recentObservations),
+        encounters: changed(ehr.encounters),
+        immunizations: changed(ehr.immunizations),
+        fingerprint: fingerprint({
+          conditions: ehr.conditions,
+          medications: ehr.medications,
+          allergies: ehr.allergies,
+          procedures: ehr.procedures,
+          careplans: ehr.careplans,
+          recentObservations,
+          encounters: ehr.encounters,
+          immunizations: ehr.immunizations,
+        }),
+      },
+    });
+  } catch (error) {
+    console.error("Error fetching patient changes:", error);
+    return NextResponse.json(
+      { error: "Failed to fetch patient changes" },
+      { status: 500 }
+    );
+  }
+}
@@ -228,6 +228,117 @@ export async function GET(request: NextRequest) {
           },
         },
       },
+      "/api/patients/{id}/changes": {
+        get: {
+          tags: ["Patients"],
+          summary: "Get patient EHR changes",
+          description:
+            "Returns the patient's EHR records whose start, stop or date falls at or after `since`, plus the current demographics and summary, for refreshing a cached profile. Records edited without a new start, stop or date are not returned. Merge the records into the cached profile by their identity; if the merged counts differ from the summary counts, or the merged profile's `fingerprint` differs, re-fetch the full profile. **Requires admin token.**",
+          operationId: "getPatientChanges",
+          security: [{ BearerAuth: [] }],
+          parameters: [
+            {
+              name: "id",
+              in: "path",
+              required: true,
+              schema: { type: "string", format: "uuid" },
+              description: "Patient UUID",
+            },
+            {
+              name: "since",
+              in: "query",
+              required: true,
+              schema: { type: "string", format: "date-time" },
+              description:
+                "ISO 8601 timestamp, typically the `until` of the previous refresh",
+            },
+          ],
+          responses: {
+            "200": {
+              description: "Changed EHR records with the current summary",
+              content: {
+                "application/json": {
+                  schema: {
+                    type: "object",
+                    properties: {
+                      data: {
+                        type: "object",
+                        properties: {
+                          since: { type: "string", format: "date-time" },
+                          until: {
+                            type: "string",
+                            format: "date-time",
+                            description: "Server time of this snapshot; pass as the next `since`",
+                          },
+                          patient: {
+                            $ref: "#/components/schemas/Patient",
+                          },
+                          summary: {
+                            $ref: "#/components/schemas/EHRSummary",
+                          },
+                          conditions: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          medications: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          allergies: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          procedures: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          careplans: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          recentObservations: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          encounters: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          immunizations: {
+                            type: "array",
+                            items: { type: "object" },
+                          },
+                          fingerprint: {
+                            type: "string",
+                            description:
+                              "SHA-256 of the full current EHR; if the merged profile's fingerprint differs, re-fetch it",
+                          },
+                        },
+                      },
+                    },
+                  },
+                },
+              },
+            },
+            "400": {
+              description: "Missing or invalid `since`",
+              content: {
+                "application/json": {
+                  schema: { $ref: "#/components/schemas/Error" },
+                },
+              },
+            },
+            "404": {
+              description: "Patient not found",
+              content: {
+                "application/json": {
+                  schema: { $ref: "#/components/schemas/Error" },
+                },
+              },
+            },
+          },
+        },
+      },
       "/api/conversations": {
         get: {
           tags: ["Conversations"],
@@ -387,7 +498,8 @@ export async function GET(request: NextRequest) {
           tags: ["Conversations"],
           summary: "Get conversation",
           description:
-            "Retrieve a conversation with all its messages (full conversation history).",
+            "Retrieve a conversation with all its messages (full conversation history). " +
+            "Pass `after` to receive only the messages created since a given message or time.",
           operationId: "getConversation",
           security: [{ BearerAuth: [] }],
           parameters: [
@@ -398,6 +510,14 @@ export async function GET(request: NextRequest) {
               schema: { type: "string", format: "uuid" },
               description: "Conversation UUID",
             },
+            {
+              name: "after",
+              in: "query",
+              required: false,
+              schema: { type: "string" },
+              description:
+                "Message UUID or ISO 8601 timestamp. Only messages created at or after it are returned (the cursor message itself is excluded).",
+            },
           ],
           responses: {
             "200": {
@@ -1,14 +1,52 @@
 from __future__ import annotations
 
+import importlib
 import logging
+from typing import Any
 
+import click
 import typer
-from rich.logging import RichHandler
+from typer.core import TyperGroup
+
+# Commands are registered by name and imported only when invoked (or when
+# help needs their signature), so ``--help`` and every other command do not
+# pay for LangChain, Pydantic or httpx.
+_COMMANDS: dict[str, str] = {
+    "interview": "cli.interview:interview",
+    "loadtest": "cli.loadtest:loadtest",
+    "roster": "cli.roster:roster",
+    "score": "cli.scoring:score",
+    "search": "cli.search:search",
+}
+
+
+def _load_command(name: str) -> click.Command:
+    """Import a registered command and convert it to a click command."""
+    module_name, attr = _COMMANDS[name].split(":")
+    fn = getattr(importlib.import_module(module_name), attr)
+    single = typer.Typer(add_completion=False)
+    single.command(name=name)(fn)
+    return typer.main.get_command(single)
+
+
+class _LazyGroup(TyperGroup):
+    """Typer group that imports each command's module on first use."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        registered = super().list_commands(ctx)
+        return [*registered, *(name for name in _COMMANDS if name not in registered)]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in _COMMANDS:
+            self.add_command(_load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
 
 app = typer.Typer(
     name="virtual-clinic",
     help="Virtual Clinic CLI",
     no_args_is_help=True,
+    cls=_LazyGroup,
 )
 
 
@@ -23,6 +61,8 @@ def _setup(
     ),
 ) -> None:
     """Configure logging based on verbosity level."""
+    from rich.logging import RichHandler
+
     level = {0: logging.WARNING, 1: logging.INFO}.get(verbose, logging.DEBUG)
     logging.basicConfig(
         level=level,
@@ -38,8 +78,10 @@ def _setup(
     )
 
 
-# Register commands -----------------------------------------------------------
-
-from cli.interview import interview as _interview_fn  # noqa: E402
-
-app.command()(_interview_fn)
+def __getattr__(name: str) -> Any:
+    """Resolve command modules (``cli.interview``, ...) lazily."""
+    for target in _COMMANDS.values():
+        module_name = target.split(":")[0]
+        if module_name == f"{__name__}.{name}":
+            return importlib.import_module(module_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
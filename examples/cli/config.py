@@ -2,10 +2,24 @@
 
 from __future__ import annotations
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class DeploymentConfig(BaseModel):
+    """One doctor LLM deployment in ``AZURE_OPENAI_DEPLOYMENTS``.
+
+    Unset connection fields fall back to the ``AZURE_OPENAI_*`` settings.
+    """
+
+    deployment: str
+    endpoint: str | None = None
+    api_key: str | None = None
+    api_version: str | None = None
+    weight: float = Field(default=1.0, gt=0)
+    max_concurrency: int | None = Field(default=None, ge=1)
+
+
 class Config(BaseSettings):
     """Virtual Clinic example configuration."""
 
@@ -16,6 +30,7 @@ class Config(BaseSettings):
 
     virtual_clinic_token: str
     virtual_clinic_base_url: str = "https://virtual-clinic-api.vercel.app"
+    virtual_clinic_roster_path: str = ".virtual-clinic/roster.json"
 
     azure_openai_endpoint: str = Field(validation_alias="AZURE_OPENAI_ENDPOINT")
     azure_openai_api_key: str = Field(validation_alias="AZURE_OPENAI_API_KEY")
@@ -27,3 +42,31 @@ class Config(BaseSettings):
         default="2024-08-01-preview",
         validation_alias="AZURE_OPENAI_API_VERSION",
     )
+    azure_openai_prompt_cost_per_million: float = Field(
+        default=0.0,
+        validation_alias="AZURE_OPENAI_PROMPT_COST_PER_MILLION",
+    )
+    azure_openai_completion_cost_per_million: float = Field(
+        default=0.0,
+        validation_alias="AZURE_OPENAI_COMPLETION_COST_PER_MILLION",
+    )
+    azure_openai_deployments: list[DeploymentConfig] = Field(
+        default_factory=list,
+        validation_alias="AZURE_OPENAI_DEPLOYMENTS",
+    )
+
+    def doctor_deployments(self) -> list[DeploymentConfig]:
+        """The doctor's deployments, with connection defaults filled in."""
+        specs = self.azure_openai_deployments or [
+            DeploymentConfig(deployment=self.azure_openai_deployment)
+        ]
+        return [
+            spec.model_copy(
+                update={
+                    "endpoint": spec.endpoint or self.azure_openai_endpoint,
+                    "api_key": spec.api_key or self.azure_openai_api_key,
+                    "api_version": spec.api_version or self.azure_openai_api_version,
+                }
+            )
+            for spec in specs
+        ]
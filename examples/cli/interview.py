@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import json
 import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import typer
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
-from langchain_openai import AzureChatOpenAI
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
@@ -12,16 +14,32 @@ from rich.text import Text
 
 from virtual_clinic import (
     AuthenticationError,
+    DeadlineExceededError,
     ForbiddenError,
     NotFoundError,
-    VirtualClinic,
     VirtualClinicError,
 )
 
-from cli.config import Config
-from cli.prompts import TaskType, get_system_prompt
+from cli.llm_pool import LLMPool, doctor_pool
+from cli.profiling import Profiler
+from cli.prompts import (
+    AssessmentDetector,
+    DetectorName,
+    TaskType,
+    assessment_detector,
+    get_system_prompt,
+)
+from cli.usage import Budget, Pricing, UsageLedger, print_usage
 from cli.utils import format_rich
 
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+    from virtual_clinic import Deadline, VirtualClinic
+
+# LangChain, the API client and the config are imported inside the functions
+# that use them, so that loading this module (e.g. for ``--help``) is cheap.
+
 logger = logging.getLogger(__name__)
 console = Console()
 
@@ -29,12 +47,24 @@ console = Console()
 def _resolve_patient(
     client: VirtualClinic,
     patient_id: str | None,
+    filters: dict[str, Any],
+    roster_path: str,
 ) -> tuple[str, str]:
     """Return ``(patient_id, patient_name)``."""
     if patient_id:
         detail = client.patients.get(patient_id)
         return patient_id, f"{detail.patient.first} {detail.patient.last}"
 
+    if filters:
+        from cli.roster import load_roster
+
+        matches = load_roster(client, roster_path).select(**filters)
+        if not matches:
+            logger.error(f"No patients match {filters}.")
+            raise typer.Exit(1)
+        p = matches[0]
+        return p.id, f"{p.first} {p.last}"
+
     patients = client.patients.list(page=1, limit=5)
     if not patients.data:
         logger.error("No patients found. Has the database been seeded?")
@@ -44,6 +74,112 @@ def _resolve_patient(
     return p.id, f"{p.first} {p.last}"
 
 
+def _run_record(
+    conversation_id: str,
+    patient_id: str,
+    task_type: TaskType,
+    messages: list[BaseMessage],
+    assessment: str | None,
+    status: str = "completed",
+    usage: UsageLedger | None = None,
+) -> dict[str, Any]:
+    """Build the saved form of an interview run.
+
+    ``status`` is ``"completed"``, ``"budget_exhausted"``,
+    ``"deadline_exceeded"`` or ``"interrupted"``; the last two hold the
+    partial transcript. ``usage``
+    adds the doctor's per-turn token usage and its totals.
+    """
+    return {
+        "conversation_id": conversation_id,
+        "patient_id": patient_id,
+        "task_type": task_type,
+        "status": status,
+        "assessment": assessment,
+        "usage": usage.to_dict() if usage is not None else None,
+        "messages": [
+            {"role": m.name or m.type, "content": m.content} for m in messages
+        ],
+    }
+
+
+def _save_run(output_dir: Path, record: dict[str, Any]) -> Path:
+    """Write a run record to ``<output_dir>/<conversation_id>.json``."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{record['conversation_id']}.json"
+    path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+    return path
+
+
+def _invoke(
+    llm: LLMPool, messages: list[BaseMessage], deadline: Deadline | None
+) -> BaseMessage:
+    """Call the LLM, bounded by the time left before ``deadline``."""
+    if deadline is None:
+        return llm.invoke(messages)
+    if deadline.expired:
+        raise DeadlineExceededError("llm")
+    try:
+        return llm.invoke(messages, timeout=deadline.remaining())
+    except Exception as exc:
+        if deadline.expired:
+            raise DeadlineExceededError("llm") from exc
+        raise
+
+
+_COMPACT_KEEP = 4
+"""Messages (two doctor/patient exchanges) kept verbatim when compacting."""
+
+
+def _compact(messages: list[BaseMessage], before: int) -> list[BaseMessage]:
+    """Return the prompt with ``messages[1:before]`` condensed.
+
+    The doctor's earlier questions are dropped and the patient's answers
+    folded into one note after the system prompt.
+    """
+    from langchain_core.messages import SystemMessage
+
+    answers = [m.content for m in messages[1:before] if m.name == "patient"]
+    notes = "\n".join(f"- {answer}" for answer in answers)
+    return [
+        messages[0],
+        SystemMessage(
+            content=f"Earlier in this interview the patient told you:\n{notes}"
+        ),
+        *messages[before:],
+    ]
+
+
+def _ask_doctor(
+    llm: LLMPool,
+    messages: list[BaseMessage],
+    turn: int | str,
+    *,
+    deadline: Deadline | None,
+    profiler: Profiler,
+    ledger: UsageLedger,
+    compact_before: int | None,
+) -> BaseMessage:
+    """Call the doctor LLM and record its usage in ``ledger`` and the profile."""
+    prompt = messages if compact_before is None else _compact(messages, compact_before)
+    with profiler.span("llm.invoke", turn=turn) as span:
+        started = time.perf_counter()
+        response = _invoke(llm, prompt, deadline)
+        usage = ledger.record(turn, response, time.perf_counter() - started)
+        deployment = response.response_metadata.get("deployment")
+        span.update(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cost=usage.cost,
+            deployment=deployment,
+        )
+    logger.info(
+        f"Turn {turn}: {usage.prompt_tokens} prompt + {usage.completion_tokens} "
+        f"completion tokens in {usage.latency_s:.2f}s ({deployment})"
+    )
+    return response
+
+
 def _print_message(label: str, style: str, content: str) -> None:
     """Print a single interview message."""
     console.print(Text(f"[{label}]", style=style))
@@ -53,45 +189,109 @@ def _print_message(label: str, style: str, content: str) -> None:
 
 def _run_interview(
     client: VirtualClinic,
-    llm: AzureChatOpenAI,
+    llm: LLMPool,
     conversation_id: str,
     messages: list[BaseMessage],
     max_turns: int,
+    deadline: Deadline | None = None,
+    profiler: Profiler | None = None,
+    ledger: UsageLedger | None = None,
+    budget: Budget | None = None,
+    detect: AssessmentDetector | None = None,
 ) -> str | None:
-    """Execute the interview loop. Returns the assessment text or ``None``."""
+    """Execute the interview loop. Returns the assessment text or ``None``.
+
+    As soon as ``detect`` recognizes a doctor turn as the assessment, the
+    loop stops and returns it, without sending it to the patient or asking
+    for a wrap-up.
+
+    ``messages`` is extended in place, so it holds the partial transcript if
+    the loop is cut short by the deadline or an interrupt. Each doctor turn's
+    token usage is recorded in ``ledger``. Once ``budget`` has no room left
+    for another turn like the last one, the doctor is asked to wrap up early;
+    if it is already exhausted, the loop stops without the wrap-up call and
+    returns ``None``. Once a prompt exceeds its
+    ``compact_at`` size, older turns are condensed in later prompts (the
+    transcript itself is kept whole).
+
+    Raises:
+        DeadlineExceededError: If ``deadline`` passes during the interview.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    profiler = profiler or Profiler(enabled=False)
+    ledger = ledger if ledger is not None else UsageLedger()
+    budget = budget or Budget()
+    compact_before: int | None = None
+
+    def ask(turn: int | str) -> BaseMessage:
+        return _ask_doctor(
+            llm,
+            messages,
+            turn,
+            deadline=deadline,
+            profiler=profiler,
+            ledger=ledger,
+            compact_before=compact_before,
+        )
+
     console.rule(format_rich("Interview", "bold"))
     console.print()
 
     for turn in range(1, max_turns + 1):
+        if ledger.turns and not budget.allows(ledger, ledger.turns[-1]):
+            logger.warning(
+                f"LLM budget nearly used ({ledger.total_tokens} tokens, "
+                f"cost {ledger.cost:.4f}), forcing wrap-up."
+            )
+            break
         logger.info(f"Turn {turn}/{max_turns}")
 
-        response = llm.invoke(messages)
-        doctor_msg = response.content
-
-        messages.append(AIMessage(content=doctor_msg, name="doctor"))
-        _print_message("Doctor", "bold cyan", doctor_msg)
-
-        reply = client.conversations.send_message(
-            conversation_id,
-            content=doctor_msg,
-        )
-        messages.append(HumanMessage(content=reply.content, name="patient"))
-        _print_message("Patient", "bold green", reply.content)
+        with profiler.span("turn", turn=turn):
+            response = ask(turn)
+            if budget.should_compact(ledger.turns[-1]):
+                compact_before = max(1, len(messages) - _COMPACT_KEEP)
+                logger.info(f"Compacting the first {compact_before} messages")
+            doctor_msg = response.content
+
+            messages.append(AIMessage(content=doctor_msg, name="doctor"))
+            with profiler.span("print_message", turn=turn):
+                _print_message("Doctor", "bold cyan", doctor_msg)
+            if detect is not None and detect(doctor_msg):
+                logger.info(f"Assessment delivered on turn {turn}.")
+                return doctor_msg
+
+            with profiler.span("conversations.send_message", turn=turn):
+                reply = client.conversations.send_message(
+                    conversation_id,
+                    content=doctor_msg,
+                )
+            messages.append(HumanMessage(content=reply.content, name="patient"))
+            with profiler.span("print_message", turn=turn):
+                _print_message("Patient", "bold green", reply.content)
     else:
         logger.warning(f"Max turns ({max_turns}) reached, forcing wrap-up.")
-        messages.append(
-            HumanMessage(
-                content="Please wrap up the interview and provide your diagnostic assessment now.",
-                name="patient",
-            )
+
+    if budget.exhausted(ledger):
+        logger.warning(
+            f"LLM budget exhausted ({ledger.total_tokens} tokens, "
+            f"cost {ledger.cost:.4f}), stopping without a wrap-up."
+        )
+        return None
+    messages.append(
+        HumanMessage(
+            content="Please wrap up the interview and provide your diagnostic assessment now.",
+            name="patient",
         )
-        response = llm.invoke(messages)
-        final = response.content
+    )
+    response = ask("wrap-up")
+    final = response.content
 
-        if final:
+    if final:
+        with profiler.span("print_message", turn="wrap-up"):
             _print_message("Doctor", "bold cyan", final)
 
-        return final or None
+    return final or None
 
 
 def interview(
@@ -113,28 +313,144 @@ def interview(
         "-n",
         help="Max interview rounds.",
     ),
+    gender: str | None = typer.Option(
+        None, "--gender", help="Pick a patient of this gender (from the cached roster)."
+    ),
+    state: str | None = typer.Option(
+        None, "--state", help="Pick a patient from this state (from the cached roster)."
+    ),
+    race: str | None = typer.Option(
+        None, "--race", help="Pick a patient of this race (from the cached roster)."
+    ),
+    min_age: int | None = typer.Option(
+        None, "--min-age", help="Pick a patient at least this old (from the cached roster)."
+    ),
+    max_age: int | None = typer.Option(
+        None, "--max-age", help="Pick a patient at most this old (from the cached roster)."
+    ),
+    output_dir: Path | None = typer.Option(
+        None,
+        "--output-dir",
+        "-o",
+        help="Save the transcript and assessment as JSON in this directory.",
+    ),
+    store: Path | None = typer.Option(
+        None,
+        "--store",
+        "-s",
+        help="Append the transcript and assessment to this transcript store.",
+    ),
+    deadline_seconds: float | None = typer.Option(
+        None,
+        "--deadline",
+        help="Wall-clock budget in seconds for the whole interview. API and LLM "
+        "calls are given only the time left; the partial transcript is saved "
+        "when it runs out.",
+    ),
+    profile: Path | None = typer.Option(
+        None,
+        "--profile",
+        help="Record timing spans for each phase and turn, write them to this "
+        "file as Chrome trace-event JSON and print a summary.",
+    ),
+    max_tokens: int | None = typer.Option(
+        None,
+        "--max-tokens",
+        help="Stop the interview before it uses more than this many LLM tokens, "
+        "asking the doctor to wrap up while there is room.",
+    ),
+    max_cost: float | None = typer.Option(
+        None,
+        "--max-cost",
+        help="Stop the interview before it costs more than this, asking the "
+        "doctor to wrap up while there is room (see the "
+        "AZURE_OPENAI_*_COST_PER_MILLION settings).",
+    ),
+    compact_at: int | None = typer.Option(
+        None,
+        "--compact-at",
+        help="Condense older turns once a doctor prompt reaches this many tokens.",
+    ),
+    keepalive: float | None = typer.Option(
+        None,
+        "--keepalive",
+        help="Ping the API every this many seconds while the doctor thinks, so "
+        "each turn reuses a warm connection.",
+    ),
+    stop_on: DetectorName = typer.Option(
+        "heading",
+        "--stop-on",
+        help="End the interview as soon as the doctor's turn is the assessment: "
+        "'heading' (the '## Assessment' heading the prompt asks for), "
+        "'sections' (all of the task's assessment sections) or 'off'.",
+    ),
+    llm_cache: Path | None = typer.Option(
+        None,
+        "--llm-cache",
+        help="Serve repeated doctor prompts from a completion cache in this "
+        "directory (shareable between runs and processes).",
+    ),
 ) -> None:
     """Conduct a clinical interview with a simulated patient."""
+    from contextlib import nullcontext
+
+    from langchain_core.messages import SystemMessage
+
+    from virtual_clinic import Deadline, VirtualClinic
+
+    from cli.config import Config
+    from cli.llm_cache import CompletionCache
+    from cli.store import TranscriptStore
+
     config = Config()
+    deadline = Deadline(deadline_seconds) if deadline_seconds else None
+    profiler = Profiler(enabled=profile is not None)
+    ledger = UsageLedger(
+        Pricing(
+            prompt_per_million=config.azure_openai_prompt_cost_per_million,
+            completion_per_million=config.azure_openai_completion_cost_per_million,
+        )
+    )
+    budget = Budget(max_tokens=max_tokens, max_cost=max_cost, compact_at=compact_at)
 
     logger.info(f"Connecting to {config.virtual_clinic_base_url}")
     logger.info(
-        f"Azure deployment: {config.azure_openai_deployment}  |  Max turns: {max_turns}"
+        "Azure deployments: "
+        + ", ".join(spec.deployment for spec in config.doctor_deployments())
+        + f"  |  Max turns: {max_turns}"
     )
 
     try:
         with VirtualClinic(
             base_url=config.virtual_clinic_base_url, token=config.virtual_clinic_token
-        ) as client:
-            health = client.health()
+        ) as client, deadline or nullcontext():
+            with profiler.span("health"):
+                health = client.health()
             logger.info(f"API {health.status}  |  DB {health.database}")
+            if keepalive:
+                client.start_keepalive(keepalive)
+
+            filters = {
+                key: value
+                for key, value in {
+                    "gender": gender,
+                    "state": state,
+                    "race": race,
+                    "min_age": min_age,
+                    "max_age": max_age,
+                }.items()
+                if value is not None
+            }
+            with profiler.span("resolve_patient"):
+                pid, patient_name = _resolve_patient(
+                    client, patient_id, filters, config.virtual_clinic_roster_path
+                )
 
-            pid, patient_name = _resolve_patient(client, patient_id)
-
-            convo = client.conversations.create(
-                patient_id=pid,
-                task_type=task_type,
-            )
+            with profiler.span("conversations.create"):
+                convo = client.conversations.create(
+                    patient_id=pid,
+                    task_type=task_type,
+                )
 
             console.print(
                 Panel(
@@ -150,14 +466,50 @@ def interview(
             )
             messages: list[BaseMessage] = [system_msg]
 
-            llm = AzureChatOpenAI(
-                azure_endpoint=config.azure_openai_endpoint,
-                api_key=config.azure_openai_api_key,
-                azure_deployment=config.azure_openai_deployment,
-                api_version=config.azure_openai_api_version,
-            )
+            with profiler.span("llm.setup"):
+                cache = CompletionCache(llm_cache) if llm_cache is not None else None
+                llm = doctor_pool(config, cache)
+
+            assessment: str | None = None
+            status = "completed"
+            try:
+                with profiler.span("interview"):
+                    assessment = _run_interview(
+                        client,
+                        llm,
+                        convo.id,
+                        messages,
+                        max_turns,
+                        deadline,
+                        profiler,
+                        ledger,
+                        budget,
+                        assessment_detector(stop_on, task_type),
+                    )
+                if assessment is None and budget.exhausted(ledger):
+                    status = "budget_exhausted"
+            except DeadlineExceededError as exc:
+                status = "deadline_exceeded"
+                logger.warning(
+                    f"Deadline exceeded during {exc.operation}; "
+                    "saving the partial transcript."
+                )
+            except KeyboardInterrupt:
+                status = "interrupted"
 
-            assessment = _run_interview(client, llm, convo.id, messages, max_turns)
+            record = _run_record(
+                convo.id, pid, task_type, messages, assessment, status, ledger
+            )
+            with profiler.span("save_run"):
+                if output_dir is not None:
+                    path = _save_run(output_dir, record)
+                    logger.info(f"Saved run to {path}")
+                if store is not None:
+                    with TranscriptStore(store) as transcripts:
+                        transcripts.append(record)
+                    logger.info(f"Appended run to {store}")
+            if status == "interrupted":
+                raise KeyboardInterrupt
 
             if assessment:
                 console.rule(format_rich("Assessment", "bold"))
@@ -165,6 +517,14 @@ def interview(
                 console.print(Markdown(assessment))
                 console.print()
 
+            if ledger.turns:
+                print_usage(ledger, console)
+            if cache is not None:
+                logger.info(
+                    f"LLM cache: {cache.hits} hits, {cache.misses} misses "
+                    f"({llm_cache})"
+                )
+
             console.rule(format_rich("Done", "bold green"))
 
     except AuthenticationError:
@@ -184,3 +544,8 @@ def interview(
     except KeyboardInterrupt:
         console.print("\n" + format_rich("Interrupted.", "yellow"))
         raise typer.Exit(130)
+    finally:
+        if profile is not None:
+            profiler.write(profile)
+            profiler.print_summary(console)
+            logger.info(f"Wrote trace to {profile}")
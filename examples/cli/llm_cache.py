@@ -0,0 +1,153 @@
+"""Disk-backed cache of doctor LLM completions.
+
+Re-running an experiment with deterministic settings replays byte-identical
+prompts, so the doctor's answers can be served from disk instead of paying
+for every call again. A completion is keyed by the SHA-256 of the
+serialized prompt messages together with the model identity (deployments,
+model and sampling parameters), so changing any of them misses the cache.
+
+Layout of a cache directory::
+
+    3f/3fa2...e1.zst   # zstd(JSON of the LangChain message), one per key
+
+Entries are written to a temporary file and renamed into place, so any
+number of processes can share a cache directory. Reading an entry refreshes
+its modification time; once the directory grows past ``max_bytes``, the
+least recently used entries are deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import zstandard
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+_SUFFIX = ".zst"
+
+
+def cache_key(messages: list[BaseMessage], identity: dict[str, Any]) -> str:
+    """Hex SHA-256 of ``messages`` and the model ``identity``.
+
+    Only each message's type, name and content are hashed; ids and response
+    metadata vary between identical runs.
+    """
+    payload = {
+        "model": identity,
+        "messages": [
+            {"type": m.type, "name": m.name, "content": m.content} for m in messages
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CompletionCache:
+    """Content-addressed completions on disk, evicted least recently used.
+
+    Args:
+        root: Cache directory (created if missing).
+        max_bytes: Size the cache is trimmed back under after a write.
+        level: zstd compression level.
+    """
+
+    def __init__(
+        self, root: str | Path, *, max_bytes: int = 1 << 30, level: int = 3
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+        self._size = sum(size for _, _, size in self._entries())
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> BaseMessage | None:
+        """Return the cached completion for ``key``, or ``None``."""
+        from langchain_core.messages import messages_from_dict
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            record = json.loads(self._decompressor.decompress(data))
+        except (zstandard.ZstdError, ValueError):
+            # A truncated entry, e.g. from a full disk: treat it as a miss.
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return messages_from_dict([record])[0]
+
+    def put(self, key: str, message: BaseMessage) -> None:
+        """Store ``message`` as the completion for ``key``."""
+        from langchain_core.messages import message_to_dict
+
+        encoded = json.dumps(message_to_dict(message)).encode()
+        data = self._compressor.compress(encoded)
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._size += len(data) - replaced
+            full = self._size > self.max_bytes
+        if full:
+            self._evict()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> list[tuple[float, Path, int]]:
+        entries: list[tuple[float, Path, int]] = []
+        for path in self.root.glob(f"*/*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries until under 90% of the limit.
+
+        The directory is rescanned, so entries written by other processes are
+        counted too.
+        """
+        entries = sorted(self._entries())
+        size = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        for _, path, entry_size in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        with self._lock:
+            self._size = size
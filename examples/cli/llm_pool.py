@@ -0,0 +1,229 @@
+"""Balance doctor LLM calls across several Azure OpenAI deployments.
+
+One deployment's rate limit caps how fast interviews can run. An
+:class:`LLMPool` spreads calls over every configured deployment: each call
+goes to the least-loaded one (in-flight calls, then calls served, relative
+to its weight), never above its ``max_concurrency``. A deployment that
+throttles (HTTP 429/503) is benched for its ``Retry-After`` time and the
+call fails over to the next one.
+
+The pool has the ``invoke`` method of a LangChain chat model, so it can be
+used wherever the doctor LLM is. With a
+:class:`~cli.llm_cache.CompletionCache`, prompts seen before are answered
+from disk without calling any deployment.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import BaseMessage
+
+    from cli.config import Config
+    from cli.llm_cache import CompletionCache
+
+_THROTTLED = frozenset({429, 503})
+_DEFAULT_COOLDOWN = 10.0
+"""Seconds a throttled deployment is benched when it sends no Retry-After."""
+
+
+@dataclass
+class Deployment:
+    """A chat model in the pool.
+
+    Args:
+        name: Label for logs and traces (the Azure deployment name).
+        llm: The chat model.
+        weight: Relative share of calls.
+        max_concurrency: Calls allowed in flight at once (``None``: no limit).
+    """
+
+    name: str
+    llm: BaseChatModel
+    weight: float = 1.0
+    max_concurrency: int | None = None
+    in_flight: int = 0
+    served: int = 0
+    benched_until: float = 0.0
+
+    def available(self, now: float) -> bool:
+        if self.benched_until > now:
+            return False
+        return self.max_concurrency is None or self.in_flight < self.max_concurrency
+
+    def load(self) -> tuple[float, float]:
+        # Per unit of weight, so calls made one at a time (all tied on
+        # in-flight) are still spread by weight through ``served``.
+        return self.in_flight / self.weight, self.served / self.weight
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    """Seconds to back off if ``exc`` is a throttling error, else ``None``."""
+    if getattr(exc, "status_code", None) not in _THROTTLED:
+        return None
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", _DEFAULT_COOLDOWN))
+    except (TypeError, ValueError):
+        return _DEFAULT_COOLDOWN
+
+
+class LLMPool:
+    """Least-loaded, weighted pool of chat models with failover.
+
+    Safe to share between threads; calls beyond every deployment's
+    ``max_concurrency`` wait for a free slot.
+    """
+
+    def __init__(
+        self,
+        deployments: Sequence[Deployment],
+        *,
+        cache: CompletionCache | None = None,
+    ) -> None:
+        if not deployments:
+            raise ValueError("LLMPool needs at least one deployment")
+        self.deployments = list(deployments)
+        self.cache = cache
+        self._ready = threading.Condition()
+
+    def identity(self) -> dict[str, Any]:
+        """What determines a completion besides the prompt, for cache keys."""
+        return {
+            "deployments": sorted(
+                (
+                    d.name,
+                    getattr(d.llm, "model_name", None),
+                    getattr(d.llm, "temperature", None),
+                    getattr(d.llm, "seed", None),
+                )
+                for d in self.deployments
+            ),
+        }
+
+    def invoke(
+        self, messages: list[BaseMessage], *, timeout: float | None = None
+    ) -> BaseMessage:
+        """Call the least-loaded deployment, failing over when one throttles.
+
+        The served response's ``response_metadata["deployment"]`` names the
+        deployment that answered (``"cache"`` for a cache hit, which reports
+        no token usage).
+
+        Args:
+            messages: The prompt.
+            timeout: Overall time limit in seconds, including waiting for a
+                free deployment.
+
+        Raises:
+            TimeoutError: If no deployment became free within ``timeout``.
+            Exception: The last throttling error, once every deployment has
+                throttled this call; any other error from the model at once.
+        """
+        key = None
+        if self.cache is not None:
+            from cli.llm_cache import cache_key
+
+            key = cache_key(messages, self.identity())
+            cached = self.cache.get(key)
+            if cached is not None:
+                cached.usage_metadata = None  # type: ignore[attr-defined]
+                cached.response_metadata = {"deployment": "cache"}
+                return cached
+
+        expires = None if timeout is None else time.monotonic() + timeout
+        tried: set[int] = set()
+        last_error: BaseException | None = None
+        while True:
+            deployment = self._acquire(tried, expires)
+            if deployment is None:
+                assert last_error is not None
+                raise last_error
+            tried.add(id(deployment))
+            kwargs: dict[str, Any] = {}
+            if expires is not None:
+                kwargs["timeout"] = max(0.0, expires - time.monotonic())
+            try:
+                response = deployment.llm.invoke(messages, **kwargs)
+            except Exception as exc:
+                backoff = _retry_after(exc)
+                self._release(deployment, backoff)
+                if backoff is None:
+                    raise
+                last_error = exc
+                continue
+            self._release(deployment, None)
+            if self.cache is not None and key is not None:
+                self.cache.put(key, response)
+            response.response_metadata["deployment"] = deployment.name
+            return response
+
+    def _acquire(self, tried: set[int], expires: float | None) -> Deployment | None:
+        """Reserve the best untried deployment, or ``None`` if all were tried."""
+        with self._ready:
+            while True:
+                candidates = [d for d in self.deployments if id(d) not in tried]
+                if not candidates:
+                    return None
+                now = time.monotonic()
+                available = [d for d in candidates if d.available(now)]
+                if available:
+                    deployment = min(available, key=Deployment.load)
+                    deployment.in_flight += 1
+                    return deployment
+                # Wake up when a call finishes or the first bench ends.
+                benches = [d.benched_until - now for d in candidates]
+                wait = min((b for b in benches if b > 0), default=None)
+                if expires is not None:
+                    left = expires - now
+                    if left <= 0:
+                        raise TimeoutError("no doctor LLM deployment became free")
+                    wait = left if wait is None else min(wait, left)
+                self._ready.wait(wait)
+
+    def _release(self, deployment: Deployment, backoff: float | None) -> None:
+        with self._ready:
+            deployment.in_flight -= 1
+            if backoff is None:
+                deployment.served += 1
+            else:
+                deployment.benched_until = time.monotonic() + backoff
+            self._ready.notify_all()
+
+
+def doctor_pool(config: Config, cache: CompletionCache | None = None) -> LLMPool:
+    """Build the doctor's pool from ``AZURE_OPENAI_DEPLOYMENTS``.
+
+    Without that setting, the pool holds the single ``AZURE_OPENAI_DEPLOYMENT``.
+    """
+    from langchain_openai import AzureChatOpenAI
+
+    specs = config.doctor_deployments()
+    # With somewhere to fail over to, don't wait out a throttled deployment's
+    # retries first.
+    max_retries = 0 if len(specs) > 1 else 2
+    return LLMPool(
+        [
+            Deployment(
+                name=spec.deployment,
+                llm=AzureChatOpenAI(
+                    azure_endpoint=spec.endpoint,
+                    api_key=spec.api_key,
+                    azure_deployment=spec.deployment,
+                    api_version=spec.api_version,
+                    max_retries=max_retries,
+                ),
+                weight=spec.weight,
+                max_concurrency=spec.max_concurrency,
+            )
+            for spec in specs
+        ],
+        cache=cache,
+    )
@@ -0,0 +1,457 @@
+"""Load-test the Virtual Clinic API (or a local stand-in) with synthetic conversations.
+
+Each synthetic conversation runs ``conversations.create``, then ``--turns``
+``conversations.send_message`` calls with canned doctor questions, then
+``conversations.get``. Conversations run on a thread pool sharing one
+client. They are started as fast as ``--concurrency`` allows (closed loop)
+or at a fixed ``--rate`` per second (open loop).
+
+Every request is timed per endpoint. Failures are counted by exception
+class (``ServerError``, ``NotFoundError``, ``CircuitOpenError``, httpx
+timeouts, ...) and abort the rest of that conversation.
+
+``--deadline`` bounds the whole batch and ``--conversation-deadline`` each
+conversation (see :class:`virtual_clinic.Deadline`). Requests only get the
+time left; conversations not yet started when the batch deadline passes are
+skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from virtual_clinic import Deadline, VirtualClinicError
+
+from cli.profiling import Profiler
+from cli.prompts import TaskType
+from cli.utils import format_rich
+
+if TYPE_CHECKING:
+    from virtual_clinic import VirtualClinic
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+QUESTIONS: tuple[str, ...] = (
+    "Hello, what brings you in today?",
+    "How long has this been going on?",
+    "Are you taking any medications at the moment?",
+    "Do you have any allergies?",
+    "Have you had any surgeries or procedures in the past?",
+    "Have you been to the hospital or the emergency room recently?",
+    "Do you have any other medical conditions I should know about?",
+    "Are your vaccinations up to date?",
+)
+"""Doctor questions sent in turn order (cycled when ``--turns`` is larger)."""
+
+PERCENTILES: tuple[float, ...] = (50.0, 95.0, 99.0)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class LoadStats:
+    """Thread-safe per-endpoint latency and error counters."""
+
+    latencies: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    errors: Counter[tuple[str, str]] = field(default_factory=Counter)
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    turns: int = 0
+    profiler: Profiler = field(
+        default_factory=lambda: Profiler(enabled=False), repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def call(
+        self, endpoint: str, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Run ``fn``, recording its latency (or its error) under ``endpoint``."""
+        started = time.perf_counter()
+        try:
+            with self.profiler.span(endpoint):
+                result = fn(*args, **kwargs)
+        except Exception as exc:
+            with self._lock:
+                self.errors[endpoint, type(exc).__name__] += 1
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            if endpoint == "conversations.send_message":
+                self.turns += 1
+        return result
+
+    def finish(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def skip(self, count: int = 1) -> None:
+        with self._lock:
+            self.skipped += count
+
+    def report(
+        self, *, target: str, duration: float, conversations: int
+    ) -> dict[str, Any]:
+        """Summarise the run as a JSON-serialisable dict."""
+        endpoints: dict[str, Any] = {}
+        for endpoint in sorted({*self.latencies, *(ep for ep, _ in self.errors)}):
+            values = sorted(self.latencies.get(endpoint, []))
+            errors = sum(n for (ep, _), n in self.errors.items() if ep == endpoint)
+            endpoints[endpoint] = {
+                "requests": len(values) + errors,
+                "errors": errors,
+                **{f"p{q:g}_ms": percentile(values, q) * 1000 for q in PERCENTILES},
+                "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+                "max_ms": values[-1] * 1000 if values else 0.0,
+            }
+        by_class: Counter[str] = Counter()
+        for (_, name), n in self.errors.items():
+            by_class[name] += n
+        requests = sum(e["requests"] for e in endpoints.values())
+        return {
+            "target": target,
+            "conversations": conversations,
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "turns": self.turns,
+            "requests": requests,
+            "duration_s": duration,
+            "conversations_per_s": self.completed / duration if duration else 0.0,
+            "turns_per_s": self.turns / duration if duration else 0.0,
+            "requests_per_s": requests / duration if duration else 0.0,
+            "endpoints": endpoints,
+            "errors": dict(by_class.most_common()),
+            "errors_by_endpoint": {
+                f"{ep} {name}": n for (ep, name), n in sorted(self.errors.items())
+            },
+        }
+
+
+def run_conversation(
+    client: VirtualClinic,
+    stats: LoadStats,
+    patient_id: str,
+    task_type: TaskType,
+    turns: int,
+    deadline: Deadline | None = None,
+    conversation_seconds: float | None = None,
+) -> None:
+    """Run one synthetic conversation, recording every request in ``stats``.
+
+    Runs within the batch ``deadline`` (entered again on this worker thread)
+    and its own ``conversation_seconds`` budget.
+    """
+    if deadline is not None and deadline.expired:
+        stats.skip()
+        return
+    own = Deadline(conversation_seconds) if conversation_seconds else None
+    try:
+        with deadline or nullcontext(), own or nullcontext():
+            with stats.profiler.span("conversation", patient_id=patient_id):
+                _converse(client, stats, patient_id, task_type, turns)
+    except Exception as exc:
+        logger.debug(f"Conversation failed: {type(exc).__name__}: {exc}")
+        stats.finish(ok=False)
+    else:
+        stats.finish(ok=True)
+
+
+def _converse(
+    client: VirtualClinic,
+    stats: LoadStats,
+    patient_id: str,
+    task_type: TaskType,
+    turns: int,
+) -> None:
+    convo = stats.call(
+        "conversations.create",
+        client.conversations.create,
+        patient_id=patient_id,
+        task_type=task_type,
+    )
+    for turn in range(turns):
+        stats.call(
+            "conversations.send_message",
+            client.conversations.send_message,
+            convo.id,
+            content=QUESTIONS[turn % len(QUESTIONS)],
+        )
+    stats.call("conversations.get", client.conversations.get, convo.id)
+
+
+def run_load(
+    client: VirtualClinic,
+    patient_ids: list[str],
+    *,
+    conversations: int,
+    turns: int,
+    concurrency: int,
+    rate: float | None = None,
+    task_type: TaskType = "diagnosis",
+    deadline_seconds: float | None = None,
+    conversation_seconds: float | None = None,
+    profiler: Profiler | None = None,
+) -> tuple[LoadStats, float]:
+    """Run ``conversations`` synthetic conversations; return stats and duration.
+
+    Patients are assigned round-robin. With ``rate``, conversation starts are
+    paced at that many per second (still capped by ``concurrency``). On
+    Ctrl-C, queued conversations are cancelled and running ones abandoned.
+    With a ``profiler``, every conversation and request is recorded as a span.
+    """
+    stats = LoadStats(profiler=profiler) if profiler else LoadStats()
+    deadline = Deadline(deadline_seconds) if deadline_seconds else None
+    started = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest")
+    try:
+        for i in range(conversations):
+            if rate:
+                delay = started + i / rate - time.perf_counter()
+                if deadline is not None:
+                    delay = min(delay, deadline.remaining())
+                if delay > 0:
+                    time.sleep(delay)
+            if deadline is not None and deadline.expired:
+                stats.skip(conversations - i)
+                break
+            pool.submit(
+                run_conversation,
+                client,
+                stats,
+                patient_ids[i % len(patient_ids)],
+                task_type,
+                turns,
+                deadline,
+                conversation_seconds,
+            )
+        pool.shutdown(wait=True)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    return stats, time.perf_counter() - started
+
+
+def _patient_ids(client: VirtualClinic, count: int) -> list[str]:
+    """Return up to ``count`` patient ids from ``GET /api/patients`` (admin)."""
+    ids: list[str] = []
+    page = 1
+    while len(ids) < count:
+        result = client.patients.list(page=page, limit=min(100, count))
+        ids.extend(p.id for p in result.data)
+        if page >= result.pagination.total_pages:
+            break
+        page += 1
+    return ids[:count]
+
+
+def print_report(report: dict[str, Any], console: Console) -> None:
+    """Render a :meth:`LoadStats.report` as tables."""
+    table = Table(
+        title=(
+            f"{report['completed']}/{report['conversations']} conversations"
+            + (f" ({report['skipped']} skipped), " if report["skipped"] else ", ")
+            + f"{report['turns']} turns in {report['duration_s']:.1f}s  "
+            f"({report['turns_per_s']:.1f} turns/s, "
+            f"{report['requests_per_s']:.1f} req/s)"
+        )
+    )
+    table.add_column("Endpoint")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right")
+    for q in PERCENTILES:
+        table.add_column(f"p{q:g} ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    for endpoint, row in report["endpoints"].items():
+        table.add_row(
+            endpoint,
+            str(row["requests"]),
+            str(row["errors"]),
+            *(f"{row[f'p{q:g}_ms']:.1f}" for q in PERCENTILES),
+            f"{row['max_ms']:.1f}",
+        )
+    console.print(table)
+
+    if report["errors"]:
+        errors = Table(title="Errors")
+        errors.add_column("Endpoint")
+        errors.add_column("Exception")
+        errors.add_column("Count", justify="right")
+        for key, n in report["errors_by_endpoint"].items():
+            endpoint, name = key.split(" ", 1)
+            errors.add_row(endpoint, name, str(n))
+        console.print(errors)
+
+
+def loadtest(
+    conversations: int = typer.Option(
+        100, "--conversations", "-n", help="Synthetic conversations to run."
+    ),
+    turns: int = typer.Option(
+        5, "--turns", "-k", help="send_message calls per conversation."
+    ),
+    concurrency: int = typer.Option(
+        10, "--concurrency", "-c", min=1, help="Conversations in flight at once."
+    ),
+    rate: float | None = typer.Option(
+        None,
+        "--rate",
+        "-r",
+        help="Start conversations at this many per second (default: as fast as "
+        "--concurrency allows).",
+    ),
+    task_type: TaskType = typer.Option(
+        "diagnosis", "--task-type", "-t", help="Task type of the conversations."
+    ),
+    patients: int = typer.Option(
+        20, "--patients", help="Distinct patients to spread conversations over."
+    ),
+    patient_id: list[str] | None = typer.Option(
+        None,
+        "--patient-id",
+        "-p",
+        help="Use these patients instead of listing them (no admin token needed).",
+    ),
+    standin: bool = typer.Option(
+        False,
+        "--standin",
+        help="Run against an in-process stand-in API with synthetic patients.",
+    ),
+    latency: list[str] | None = typer.Option(
+        None,
+        "--latency",
+        help="Stand-in latency as ENDPOINT=MEDIAN[:P99[:ERROR_RATE]] in seconds "
+        "(repeatable).",
+    ),
+    base_url: str | None = typer.Option(
+        None, "--base-url", help="Override VIRTUAL_CLINIC_BASE_URL."
+    ),
+    deadline: float | None = typer.Option(
+        None,
+        "--deadline",
+        help="Wall-clock budget in seconds for the whole run; conversations not "
+        "started in time are skipped.",
+    ),
+    conversation_deadline: float | None = typer.Option(
+        None,
+        "--conversation-deadline",
+        help="Wall-clock budget in seconds for each conversation.",
+    ),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write the report as JSON to this file ('-' for stdout).",
+    ),
+    profile: Path | None = typer.Option(
+        None,
+        "--profile",
+        help="Record a span per conversation and request, write them to this file "
+        "as Chrome trace-event JSON and print a summary.",
+    ),
+    warmup: bool = typer.Option(
+        False,
+        "--warmup",
+        help="Open one connection per worker before the clock starts, so "
+        "connection setup is left out of the percentiles.",
+    ),
+) -> None:
+    """Drive concurrent synthetic conversations and report latency percentiles."""
+    from virtual_clinic import VirtualClinic
+
+    console = Console()
+    profiler = Profiler(enabled=profile is not None)
+    if standin:
+        from virtual_clinic.standin import StandIn, parse_latency, synthetic_patients
+
+        try:
+            models = dict(parse_latency(value) for value in latency or [])
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc), param_hint="--latency")
+        api = StandIn(synthetic_patients(patients, seed=0), latency=models, seed=0)
+        target = "stand-in"
+        client = VirtualClinic(token="loadtest", transport=api.transport())
+    else:
+        from cli.config import Config
+
+        config = Config()
+        target = base_url or config.virtual_clinic_base_url
+        client = VirtualClinic(base_url=target, token=config.virtual_clinic_token)
+
+    with client:
+        try:
+            ids = list(patient_id or []) or _patient_ids(client, patients)
+        except VirtualClinicError as exc:
+            logger.error(f"Could not list patients: {exc.message}")
+            raise typer.Exit(1)
+        if not ids:
+            logger.error("No patients found. Has the database been seeded?")
+            raise typer.Exit(1)
+
+        if warmup:
+            opened = client.warmup(concurrency)
+            logger.info(f"Warmed up {opened}/{concurrency} connections")
+
+        logger.info(
+            f"Running {conversations} conversations x {turns} turns against {target} "
+            f"(concurrency {concurrency}"
+            + (f", {rate:g}/s)" if rate else ")")
+        )
+        try:
+            stats, duration = run_load(
+                client,
+                ids,
+                conversations=conversations,
+                turns=turns,
+                concurrency=concurrency,
+                rate=rate,
+                task_type=task_type,
+                deadline_seconds=deadline,
+                conversation_seconds=conversation_deadline,
+                profiler=profiler,
+            )
+        except KeyboardInterrupt:
+            console.print("\n" + format_rich("Interrupted.", "yellow"))
+            raise typer.Exit(130)
+
+    report = stats.report(target=target, duration=duration, conversations=conversations)
+    if profile is not None:
+        profiler.write(profile)
+        logger.info(f"Wrote trace to {profile}")
+    if output is not None and str(output) == "-":
+        print(json.dumps(report, indent=2))
+        return
+    print_report(report, console)
+    if profile is not None:
+        profiler.print_summary(console)
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Wrote report to {output}")
@@ -0,0 +1,137 @@
+"""Lightweight span profiler for ``--profile``.
+
+Spans are recorded as Chrome trace events ("complete" events, ``ph: "X"``),
+so the JSON written by :meth:`Profiler.write` opens in ``chrome://tracing``
+or https://ui.perfetto.dev with one track per thread. Spans on the same
+thread nest by time (e.g. ``turn`` > ``llm.invoke``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager
+
+from rich.console import Console
+from rich.table import Table
+
+
+class Profiler:
+    """Collects timed spans from any number of threads.
+
+    Args:
+        enabled: When ``False``, :meth:`span` is a no-op, so call sites need
+            no conditionals.
+    """
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._events: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def span(self, name: str, **args: Any) -> ContextManager[dict[str, Any]]:
+        """Time the enclosed block as a span called ``name``.
+
+        Keyword arguments are attached to the event (e.g. ``turn=3``). The
+        context manager yields the arguments dict, so values only known at
+        the end of the block (e.g. token counts) can be added to it.
+        """
+        if not self.enabled:
+            return nullcontext({})
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name: str, args: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        """Recorded trace events, in completion order."""
+        with self._lock:
+            return list(self._events)
+
+    def write(self, path: str | Path) -> None:
+        """Write the spans as Chrome trace-event JSON."""
+        names = {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": self._pid,
+        }
+        threads = {t.ident: t.name for t in threading.enumerate()}
+        events = self.events
+        metadata = [
+            {**names, "tid": tid, "args": {"name": threads.get(tid, str(tid))}}
+            for tid in sorted({e["tid"] for e in events})
+        ]
+        payload = {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+        Path(path).write_text(json.dumps(payload), encoding="utf-8")
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Per-span-name totals, largest total first.
+
+        ``share`` is the span's total time over the wall time covered by all
+        spans. Nested spans overlap their parents, and spans on different
+        threads overlap each other, so shares can add up to more than 1.
+        """
+        events = self.events
+        if not events:
+            return []
+        wall = max(e["ts"] + e["dur"] for e in events) - min(e["ts"] for e in events)
+        durations: dict[str, list[float]] = defaultdict(list)
+        for event in events:
+            durations[event["name"]].append(event["dur"] / 1e6)
+        rows = [
+            {
+                "name": name,
+                "count": len(values),
+                "total_s": sum(values),
+                "mean_ms": sum(values) / len(values) * 1000,
+                "max_ms": max(values) * 1000,
+                "share": sum(values) * 1e6 / wall if wall else 0.0,
+            }
+            for name, values in durations.items()
+        ]
+        return sorted(rows, key=lambda row: -row["total_s"])
+
+    def print_summary(self, console: Console) -> None:
+        """Print :meth:`summary` as a table."""
+        table = Table(title="Where the time went")
+        table.add_column("Span")
+        table.add_column("Count", justify="right")
+        table.add_column("Total s", justify="right")
+        table.add_column("Mean ms", justify="right")
+        table.add_column("Max ms", justify="right")
+        table.add_column("Share", justify="right")
+        for row in self.summary():
+            table.add_row(
+                row["name"],
+                str(row["count"]),
+                f"{row['total_s']:.2f}",
+                f"{row['mean_ms']:.1f}",
+                f"{row['max_ms']:.1f}",
+                f"{row['share']:.1%}",
+            )
+        console.print(table)
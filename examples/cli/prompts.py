@@ -6,6 +6,8 @@ Task-specific sections are appended depending on the clinical objective.
 
 from __future__ import annotations
 
+import re
+from collections.abc import Callable
 from typing import Literal
 
 TaskType = Literal["diagnosis", "treatment", "event"]
@@ -106,8 +108,51 @@ to reduce the risk.
 }
 
 
+ASSESSMENT_PROMPT = """\
+## Delivering Your Assessment
+
+Start the message with your clinical assessment with the line \
+`## Assessment`, followed by the structure above. Do not ask any further \
+questions in that message: the interview ends with it.
+"""
+
+ASSESSMENT_SECTIONS: dict[TaskType, tuple[str, ...]] = {
+    "diagnosis": ("Key findings", "Differential diagnosis"),
+    "treatment": ("Key findings", "Proposed treatment plan"),
+    "event": ("Key findings", "Event prediction"),
+}
+"""Section titles every assessment for the task type contains."""
+
+AssessmentDetector = Callable[[str], bool]
+"""Decides whether a doctor turn is the final assessment."""
+
+DetectorName = Literal["heading", "sections", "off"]
+
+_ASSESSMENT_HEADING = re.compile(
+    r"^\s*#+\s*assessment\b", re.IGNORECASE | re.MULTILINE
+)
+
+
 def get_system_prompt(task_type: TaskType, patient_name: str) -> str:
     """Build the full system prompt for the given task type."""
     base = BASE_PROMPT.format(patient_name=patient_name)
     task = TASK_PROMPTS[task_type]
-    return f"{base}\n{task}"
+    return f"{base}\n{task}\n{ASSESSMENT_PROMPT}"
+
+
+def assessment_detector(
+    name: DetectorName, task_type: TaskType
+) -> AssessmentDetector | None:
+    """Return the detector called ``name``, or ``None`` for ``"off"``.
+
+    ``"heading"`` looks for the ``## Assessment`` heading the system prompt
+    asks for. ``"sections"`` looks for all of the task's
+    :data:`ASSESSMENT_SECTIONS` instead, for prompts without that
+    instruction.
+    """
+    if name == "off":
+        return None
+    if name == "heading":
+        return lambda text: _ASSESSMENT_HEADING.search(text) is not None
+    sections = [title.lower() for title in ASSESSMENT_SECTIONS[task_type]]
+    return lambda text: all(title in text.lower() for title in sections)
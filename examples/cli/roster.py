@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from virtual_clinic import VirtualClinicError
+
+from cli.utils import format_rich
+
+if TYPE_CHECKING:
+    from virtual_clinic import RosterIndex, VirtualClinic
+
+logger = logging.getLogger(__name__)
+console = Console()
+
+
+def load_roster(
+    client: VirtualClinic,
+    path: str | Path,
+    *,
+    refresh: bool = False,
+) -> RosterIndex:
+    """Load the cached roster, fetching and caching it first if needed."""
+    from virtual_clinic import RosterIndex
+
+    path = Path(path)
+    if path.exists() and not refresh:
+        logger.info(f"Loading roster from {path}")
+        return RosterIndex.load(path)
+
+    logger.info("Fetching patient roster from the API")
+    roster = RosterIndex.fetch(client)
+    roster.save(path)
+    logger.info(f"Cached {len(roster)} patients to {path}")
+    return roster
+
+
+def roster(
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Re-fetch the roster from the API even if a cached copy exists.",
+    ),
+    by: str = typer.Option(
+        "gender",
+        "--by",
+        "-b",
+        help="Column to break the roster down by (gender, race, ethnicity, city, state).",
+    ),
+) -> None:
+    """Build (or show) the locally cached patient roster."""
+    from virtual_clinic import VirtualClinic
+
+    from cli.config import Config
+
+    config = Config()
+
+    try:
+        with VirtualClinic(
+            base_url=config.virtual_clinic_base_url, token=config.virtual_clinic_token
+        ) as client:
+            index = load_roster(client, config.virtual_clinic_roster_path, refresh=refresh)
+    except VirtualClinicError as exc:
+        logger.error(f"API error: {exc.message}")
+        raise typer.Exit(1)
+
+    try:
+        counts = index.values(by)
+    except KeyError:
+        logger.error(f"Unknown column: {by}")
+        raise typer.Exit(1)
+
+    table = Table(title=f"{len(index)} patients by {by}")
+    table.add_column(by.capitalize())
+    table.add_column("Patients", justify="right")
+    for value, count in sorted(counts.items(), key=lambda item: -item[1]):
+        table.add_row(value or format_rich("unknown", "dim"), str(count))
+    console.print(table)
@@ -0,0 +1,369 @@
+"""Score interview assessments against EHR ground truth.
+
+Each run (one interview) is a JSON file written by ``interview --output-dir``,
+or a record in a :class:`~cli.store.TranscriptStore` (``interview --store``)::
+
+    {"conversation_id": ..., "patient_id": ..., "task_type": ...,
+     "assessment": "...", "messages": [{"role": ..., "content": ...}, ...]}
+
+Patient ground truth comes from cached ``PatientDetail`` JSON files named
+``<patient_id>.json``. Runs are grouped by patient so each worker process
+parses a patient's EHR and builds its term index once, then scores every run
+for that patient.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from virtual_clinic import VirtualClinicError
+
+# Worker processes import this module to unpickle jobs; keep its import-time
+# dependencies light and load the API client, config and store on demand.
+
+logger = logging.getLogger(__name__)
+
+_SEMANTIC_TAG = re.compile(
+    r"\((?:disorder|finding|situation|procedure|morphologic abnormality"
+    r"|regime/therapy|person|event|observable entity)\)"
+)
+_TOKEN = re.compile(r"[a-z][a-z0-9]+")
+_STOPWORDS = frozenset(
+    """a an and as at by for from in of on or the to with without due history
+    other than not""".split()
+)
+_DOSAGE_WORDS = frozenset(
+    """mg ml mcg hr actuat oral tablet tablets capsule capsules injection
+    injectable solution suspension extended release delayed prefilled syringe
+    topical cream ointment inhaler inhalation nasal spray dose unt meq patch
+    transdermal chewable disintegrating pack day""".split()
+)
+
+GROUND_TRUTH_ENCOUNTER_CLASSES = frozenset({"emergency", "inpatient", "urgentcare"})
+"""Encounter classes that count as clinical events for ``event`` runs."""
+
+
+# ---------------------------------------------------------------------------
+# Normalisation and ground truth
+# ---------------------------------------------------------------------------
+
+
+def _stem(token: str) -> str:
+    """Very light plural stripping so "migraines" matches "migraine"."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase, drop SNOMED semantic tags, stopwords and dosage words."""
+    text = _SEMANTIC_TAG.sub(" ", text.lower())
+    return [
+        _stem(tok)
+        for tok in _TOKEN.findall(text)
+        if tok not in _STOPWORDS and tok not in _DOSAGE_WORDS
+    ]
+
+
+def ground_truth(detail: dict[str, Any], task_type: str) -> dict[str, str]:
+    """Return ``{code: description}`` the assessment should mention.
+
+    Args:
+        detail: A patient's raw (camelCase) ``PatientDetail`` JSON.
+        task_type: ``"diagnosis"``, ``"treatment"`` or ``"event"``.
+    """
+    terms: dict[str, str] = {}
+    if task_type == "diagnosis":
+        for rec in detail.get("conditions", []):
+            if not rec.get("stop"):
+                terms[rec["code"]] = rec["description"]
+    elif task_type == "treatment":
+        for kind in ("medications", "careplans"):
+            for rec in detail.get(kind, []):
+                if not rec.get("stop"):
+                    terms[rec["code"]] = rec["description"]
+    elif task_type == "event":
+        for rec in detail.get("encounters", []):
+            if rec.get("encounterClass") not in GROUND_TRUTH_ENCOUNTER_CLASSES:
+                continue
+            if rec.get("reasonCode") and rec.get("reasonDescription"):
+                terms[rec["reasonCode"]] = rec["reasonDescription"]
+            elif rec.get("code") and rec.get("description"):
+                terms[rec["code"]] = rec["description"]
+    return terms
+
+
+class TermIndex:
+    """Inverted ``token -> terms`` index over one patient's ground truth.
+
+    Matching an assessment only touches the terms that share a token with it,
+    instead of comparing every term against the whole text.
+    """
+
+    def __init__(self, terms: dict[str, str]) -> None:
+        self.codes = list(terms)
+        self.descriptions = [terms[code] for code in self.codes]
+        self.tokens = [frozenset(normalize(d)) for d in self.descriptions]
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for i, tokens in enumerate(self.tokens):
+            for tok in tokens:
+                self.postings[tok].append(i)
+
+    def match(self, text: str, *, threshold: float) -> list[int]:
+        """Return indices of terms whose token coverage in ``text`` is ``>= threshold``."""
+        hits: dict[int, int] = defaultdict(int)
+        for tok in set(normalize(text)):
+            for i in self.postings.get(tok, ()):
+                hits[i] += 1
+        return sorted(
+            i
+            for i, count in hits.items()
+            if self.tokens[i] and count / len(self.tokens[i]) >= threshold
+        )
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class RunScore:
+    """Score of one interview run."""
+
+    run: str
+    conversation_id: str | None
+    patient_id: str
+    task_type: str
+    truth: int
+    matched: int
+    recall: float | None
+    matched_terms: list[str] = field(default_factory=list)
+    missed_terms: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+def _score_patient(
+    job: tuple[str | None, list[dict[str, Any]], float],
+) -> list[RunScore]:
+    """Score every run of one patient (executed in a worker process)."""
+    patient_path, runs, threshold = job
+    detail: dict[str, Any] | None = None
+    if patient_path is not None:
+        detail = json.loads(Path(patient_path).read_text(encoding="utf-8"))
+
+    indexes: dict[str, TermIndex] = {}
+    scores: list[RunScore] = []
+    for run in runs:
+        task_type = run.get("task_type", "diagnosis")
+        base = {
+            "run": run["_path"],
+            "conversation_id": run.get("conversation_id"),
+            "patient_id": run["patient_id"],
+            "task_type": task_type,
+        }
+        if detail is None:
+            scores.append(
+                RunScore(**base, truth=0, matched=0, recall=None, error="no cached patient")
+            )
+            continue
+        index = indexes.get(task_type)
+        if index is None:
+            index = indexes[task_type] = TermIndex(ground_truth(detail, task_type))
+        hits = set(index.match(run.get("assessment") or "", threshold=threshold))
+        truth = len(index.codes)
+        scores.append(
+            RunScore(
+                **base,
+                truth=truth,
+                matched=len(hits),
+                recall=len(hits) / truth if truth else None,
+                matched_terms=[index.descriptions[i] for i in sorted(hits)],
+                missed_terms=[
+                    d for i, d in enumerate(index.descriptions) if i not in hits
+                ],
+            )
+        )
+    return scores
+
+
+def load_runs(paths: Iterable[Path]) -> list[dict[str, Any]]:
+    """Read run JSON files, remembering where each came from."""
+    runs: list[dict[str, Any]] = []
+    for path in paths:
+        try:
+            run = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning(f"Skipping {path}: {exc}")
+            continue
+        if "patient_id" not in run:
+            logger.warning(f"Skipping {path}: no patient_id")
+            continue
+        run["_path"] = str(path)
+        runs.append(run)
+    return runs
+
+
+def load_store(root: Path) -> list[dict[str, Any]]:
+    """Read the latest record of every conversation in a transcript store."""
+    from cli.store import TranscriptStore
+
+    runs: list[dict[str, Any]] = []
+    with TranscriptStore(root) as store:
+        for run in store:
+            run["_path"] = f"{root}#{run['conversation_id']}"
+            runs.append(run)
+    return runs
+
+
+def score_runs(
+    runs: list[dict[str, Any]],
+    patients_dir: Path,
+    *,
+    workers: int | None = None,
+    threshold: float = 1.0,
+) -> list[RunScore]:
+    """Score runs across a process pool, one task per patient."""
+    by_patient: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for run in runs:
+        by_patient[run["patient_id"]].append(run)
+
+    jobs: list[tuple[str | None, list[dict[str, Any]], float]] = []
+    for pid, patient_runs in by_patient.items():
+        path = patients_dir / f"{pid}.json"
+        jobs.append((str(path) if path.exists() else None, patient_runs, threshold))
+
+    scores: list[RunScore] = []
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            scores.extend(_score_patient(job))
+        return scores
+
+    chunksize = max(1, len(jobs) // ((workers or 8) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_score_patient, jobs, chunksize=chunksize):
+            scores.extend(result)
+    return scores
+
+
+def cache_patients(
+    patient_ids: Iterable[str], patients_dir: Path, *, refresh: bool = False
+) -> None:
+    """Download missing ``PatientDetail`` JSON files into ``patients_dir``."""
+    from virtual_clinic import VirtualClinic
+
+    from cli.config import Config
+
+    missing = [
+        pid
+        for pid in sorted(set(patient_ids))
+        if refresh or not (patients_dir / f"{pid}.json").exists()
+    ]
+    if not missing:
+        return
+
+    config = Config()
+    patients_dir.mkdir(parents=True, exist_ok=True)
+    with VirtualClinic(
+        base_url=config.virtual_clinic_base_url, token=config.virtual_clinic_token
+    ) as client:
+        for pid in missing:
+            logger.info(f"Caching patient {pid}")
+            detail = client.patients.get(pid)
+            (patients_dir / f"{pid}.json").write_text(
+                detail.model_dump_json(by_alias=True), encoding="utf-8"
+            )
+
+
+# ---------------------------------------------------------------------------
+# Command
+# ---------------------------------------------------------------------------
+
+
+def score(
+    runs_dir: Path = typer.Argument(
+        ..., help="Directory of interview run JSON files, or a transcript store."
+    ),
+    patients_dir: Path = typer.Option(
+        Path(".virtual-clinic/patients"),
+        "--patients-dir",
+        help="Directory of cached PatientDetail JSON files (<patient_id>.json).",
+    ),
+    fetch: bool = typer.Option(
+        False, "--fetch", help="Download missing patients from the API first."
+    ),
+    workers: int | None = typer.Option(
+        None, "--workers", "-w", help="Worker processes (default: CPU count)."
+    ),
+    threshold: float = typer.Option(
+        1.0,
+        "--threshold",
+        help="Fraction of a ground-truth term's tokens that must appear to count as a match.",
+    ),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write per-run scores to this JSONL file."
+    ),
+) -> None:
+    """Score interview assessments against the patients' EHR ground truth."""
+    console = Console()
+    if (runs_dir / "index.bin").exists():
+        runs = load_store(runs_dir)
+    else:
+        runs = load_runs(sorted(runs_dir.rglob("*.json")))
+    if not runs:
+        logger.error(f"No runs found in {runs_dir}")
+        raise typer.Exit(1)
+
+    if fetch:
+        try:
+            cache_patients((run["patient_id"] for run in runs), patients_dir)
+        except VirtualClinicError as exc:
+            logger.error(f"API error: {exc.message}")
+            raise typer.Exit(1)
+
+    scores = score_runs(runs, patients_dir, workers=workers, threshold=threshold)
+
+    if output is not None:
+        with output.open("w", encoding="utf-8") as fh:
+            for s in scores:
+                fh.write(json.dumps(asdict(s)) + "\n")
+
+    table = Table(title=f"{len(scores)} runs")
+    table.add_column("Task")
+    table.add_column("Runs", justify="right")
+    table.add_column("Scored", justify="right")
+    table.add_column("Mean recall", justify="right")
+    table.add_column("Any match", justify="right")
+    by_task: dict[str, list[RunScore]] = defaultdict(list)
+    for s in scores:
+        by_task[s.task_type].append(s)
+    for task_type, task_scores in sorted(by_task.items()):
+        scored = [s for s in task_scores if s.recall is not None]
+        mean = sum(s.recall or 0.0 for s in scored) / len(scored) if scored else 0.0
+        any_match = sum(1 for s in scored if s.matched) / len(scored) if scored else 0.0
+        table.add_row(
+            task_type,
+            str(len(task_scores)),
+            str(len(scored)),
+            f"{mean:.3f}",
+            f"{any_match:.1%}",
+        )
+    console.print(table)
+
+    unscored = sum(1 for s in scores if s.error)
+    if unscored:
+        logger.warning(f"{unscored} runs had no cached patient (use --fetch).")
@@ -0,0 +1,719 @@
+"""Full-text search over interview transcripts.
+
+Finding the conversations where a patient mentioned a symptom, or where the
+doctor asked about a medication, would otherwise mean reading every
+transcript. A :class:`TranscriptIndex` keeps an inverted index over message
+content: for each term, the messages that contain it and the term's
+positions in each, so keyword and phrase queries read only the posting lists
+of the terms they name.
+
+Layout of an index directory::
+
+    MANIFEST           # JSON: live segments, how far each source was indexed
+    seg-000001.post    # posting lists: doc ids, position offsets, positions
+    seg-000001.msgs    # per message: conversation, index in it, role
+    seg-000001.meta    # zstd(JSON): term -> (offset, count), conversations, roles
+    seg-000002.post    # each update adds a segment ...
+
+Segments are immutable. Each update indexes the transcripts written since
+the last one into a new segment and then rewrites the manifest, so readers
+never see a partial update. Once there are more than ``max_segments``, they
+are merged into one. A conversation indexed again (e.g. a partial transcript
+followed by the final one) supersedes its earlier copy, like in the
+:class:`~cli.store.TranscriptStore`.
+
+Posting lists are arrays of native-endian 32-bit integers read straight out
+of a memory map, so an index is not portable between machines of different
+byte order; rebuild it instead. Use one writing process per index.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import typer
+import zstandard
+from rich.console import Console
+from rich.table import Table
+
+from cli.prompts import TaskType
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_NAME = "MANIFEST"
+_SEGMENT_PATTERN = "seg-{:06d}"
+_TOKEN = re.compile(r"[^\W_]+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into casefolded runs of letters and digits."""
+    return [token.casefold() for token in _TOKEN.findall(text)]
+
+
+def parse_query(query: str) -> list[tuple[str, ...]]:
+    """Split a query into clauses: single terms and ``"quoted phrases"``.
+
+    A bare word that tokenizes into several terms (``covid-19``) is a phrase.
+    """
+    clauses: list[tuple[str, ...]] = []
+    for phrase, word in _QUERY.findall(query):
+        terms = tuple(tokenize(phrase or word))
+        if terms:
+            clauses.append(terms)
+    return clauses
+
+
+def _text(content: Any) -> str:
+    """Message content as text; LangChain content may be a list of blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in content
+            if isinstance(part, (str, dict))
+        )
+    return ""
+
+
+@dataclass(frozen=True)
+class Hit:
+    """A message that matched a query."""
+
+    conversation_id: str
+    patient_id: str
+    task_type: str
+    message_index: int
+    role: str
+
+
+# ---------------------------------------------------------------------------
+# Segments
+# ---------------------------------------------------------------------------
+
+
+class _Postings:
+    """One term's posting list in a segment."""
+
+    def __init__(self, data: Any, offset: int, docs: int) -> None:
+        self.docs = array("I", data[offset : offset + 4 * docs])
+        offset += 4 * docs
+        self.starts = array("I", data[offset : offset + 4 * (docs + 1)])
+        self._data = data
+        self._positions = offset + 4 * (docs + 1)
+
+    def positions(self, i: int) -> array[int]:
+        """Positions of the term in the ``i``-th message of the list."""
+        start = self._positions + 4 * self.starts[i]
+        end = self._positions + 4 * self.starts[i + 1]
+        return array("I", self._data[start:end])
+
+    def positions_of(self, doc: int) -> array[int]:
+        return self.positions(bisect_left(self.docs, doc))
+
+
+class _Segment:
+    """A read-only segment, with its posting lists memory-mapped."""
+
+    def __init__(self, root: Path, number: int) -> None:
+        stem = root / _SEGMENT_PATTERN.format(number)
+        meta = json.loads(
+            zstandard.ZstdDecompressor().decompress(Path(f"{stem}.meta").read_bytes())
+        )
+        self.number = number
+        self.terms: dict[str, list[int]] = meta["terms"]
+        self.conversations: list[list[str]] = meta["conversations"]
+        self.roles: list[str] = meta["roles"]
+
+        count = meta["messages"]
+        data = Path(f"{stem}.msgs").read_bytes()
+        self.message_conversation = array("I", data[: 4 * count])
+        self.message_index = array("I", data[4 * count : 8 * count])
+        self.message_role = array("B", data[8 * count : 9 * count])
+
+        self._map: mmap.mmap | None = None
+        with open(f"{stem}.post", "rb") as fh:
+            if os.fstat(fh.fileno()).st_size:
+                self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def postings(self, term: str) -> _Postings | None:
+        entry = self.terms.get(term)
+        if entry is None or self._map is None:
+            return None
+        return _Postings(self._map, *entry)
+
+    def match(self, clauses: Sequence[tuple[str, ...]]) -> set[int]:
+        """Messages that contain every clause; rarest clauses first."""
+
+        def rarity(clause: tuple[str, ...]) -> int:
+            return min(self.terms.get(term, (0, 0))[1] for term in clause)
+
+        docs: set[int] | None = None
+        for clause in sorted(clauses, key=rarity):
+            docs = self._match_clause(clause, docs)
+            if not docs:
+                return set()
+        return docs or set()
+
+    def _match_clause(
+        self, terms: tuple[str, ...], within: set[int] | None
+    ) -> set[int]:
+        postings: list[_Postings] = []
+        for term in terms:
+            found = self.postings(term)
+            if found is None:
+                return set()
+            postings.append(found)
+        docs = _intersect([p.docs for p in postings], within)
+        if len(postings) == 1:
+            return docs
+        return {doc for doc in docs if _adjacent(postings, doc)}
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def _contains(docs: array[int], doc: int) -> bool:
+    i = bisect_left(docs, doc)
+    return i < len(docs) and docs[i] == doc
+
+
+def _intersect(lists: list[array[int]], within: set[int] | None) -> set[int]:
+    """Doc ids in every list (and in ``within``, if given).
+
+    Small candidate sets are probed into longer lists by binary search
+    instead of hashing the whole list.
+    """
+    lists = sorted(lists, key=len)
+    if within is None:
+        docs, lists = set(lists[0]), lists[1:]
+    else:
+        docs = within
+    for other in lists:
+        if len(docs) * 16 < len(other):
+            docs = {doc for doc in docs if _contains(other, doc)}
+        else:
+            docs = docs.intersection(other)
+        if not docs:
+            break
+    return docs
+
+
+def _adjacent(postings: list[_Postings], doc: int) -> bool:
+    """Whether the terms occur consecutively, in order, somewhere in ``doc``."""
+    starts = set(postings[0].positions_of(doc))
+    for offset, later in enumerate(postings[1:], 1):
+        starts.intersection_update(p - offset for p in later.positions_of(doc))
+        if not starts:
+            return False
+    return True
+
+
+class _SegmentBuilder:
+    """Accumulates records (or the live part of old segments) for a new segment."""
+
+    def __init__(self) -> None:
+        self.conversations: list[list[str]] = []
+        self.roles: dict[str, int] = {}
+        self.message_conversation = array("I")
+        self.message_index = array("I")
+        self.message_role = array("B")
+        # term -> (doc ids, offsets into positions, positions)
+        self.postings: dict[str, tuple[array[int], array[int], array[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.message_conversation)
+
+    def _entry(self, term: str) -> tuple[array[int], array[int], array[int]]:
+        entry = self.postings.get(term)
+        if entry is None:
+            entry = self.postings[term] = (array("I"), array("I", [0]), array("I"))
+        return entry
+
+    def add(self, record: dict[str, Any]) -> None:
+        conversation = len(self.conversations)
+        self.conversations.append(
+            [
+                record["conversation_id"],
+                record.get("patient_id") or "",
+                record.get("task_type") or "",
+            ]
+        )
+        for index, message in enumerate(record.get("messages") or []):
+            doc = len(self.message_conversation)
+            role = str(message.get("role", ""))
+            self.message_conversation.append(conversation)
+            self.message_index.append(index)
+            self.message_role.append(self.roles.setdefault(role, len(self.roles)))
+
+            positions: dict[str, list[int]] = {}
+            for position, term in enumerate(tokenize(_text(message.get("content")))):
+                positions.setdefault(term, []).append(position)
+            for term, where in positions.items():
+                docs, starts, term_positions = self._entry(term)
+                docs.append(doc)
+                term_positions.extend(where)
+                starts.append(len(term_positions))
+
+    def extend(self, segment: _Segment, live: set[int]) -> None:
+        """Copy the ``live`` conversations of ``segment``, renumbered."""
+        conversations: dict[int, int] = {}
+        for conversation in sorted(live):
+            conversations[conversation] = len(self.conversations)
+            self.conversations.append(segment.conversations[conversation])
+        roles = [self.roles.setdefault(role, len(self.roles)) for role in segment.roles]
+
+        docs_map: dict[int, int] = {}
+        for doc, conversation in enumerate(segment.message_conversation):
+            renumbered = conversations.get(conversation)
+            if renumbered is None:
+                continue
+            docs_map[doc] = len(self.message_conversation)
+            self.message_conversation.append(renumbered)
+            self.message_index.append(segment.message_index[doc])
+            self.message_role.append(roles[segment.message_role[doc]])
+
+        for term in segment.terms:
+            postings = segment.postings(term)
+            if postings is None:
+                continue
+            docs, starts, term_positions = self._entry(term)
+            for i, doc in enumerate(postings.docs):
+                renumbered = docs_map.get(doc)
+                if renumbered is None:
+                    continue
+                docs.append(renumbered)
+                term_positions.extend(postings.positions(i))
+                starts.append(len(term_positions))
+
+    def write(self, root: Path, number: int) -> None:
+        stem = root / _SEGMENT_PATTERN.format(number)
+        terms: dict[str, list[int]] = {}
+        with open(f"{stem}.post", "wb") as fh:
+            for term, (docs, starts, positions) in self.postings.items():
+                if not docs:
+                    continue  # every message with it was superseded
+                terms[term] = [fh.tell(), len(docs)]
+                docs.tofile(fh)
+                starts.tofile(fh)
+                positions.tofile(fh)
+        with open(f"{stem}.msgs", "wb") as fh:
+            self.message_conversation.tofile(fh)
+            self.message_index.tofile(fh)
+            self.message_role.tofile(fh)
+        meta = {
+            "messages": len(self),
+            "conversations": self.conversations,
+            "roles": list(self.roles),
+            "terms": terms,
+        }
+        Path(f"{stem}.meta").write_bytes(
+            zstandard.ZstdCompressor().compress(
+                json.dumps(meta, separators=(",", ":")).encode("utf-8")
+            )
+        )
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+class TranscriptIndex:
+    """Inverted index over the messages of interview transcripts.
+
+    Args:
+        root: Index directory (created if missing).
+        max_segments: Merge the segments into one once there are more.
+        batch_messages: Start a new segment after this many messages when
+            indexing a large backlog, bounding memory use.
+
+    Usage::
+
+        with TranscriptIndex("transcripts/.search") as index:
+            index.update("transcripts/")     # index what was added since
+            for hit in index.search('"chest pain" aspirin', role="patient"):
+                ...
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_segments: int = 8,
+        batch_messages: int = 250_000,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self.batch_messages = batch_messages
+        self._manifest = self._load_manifest()
+        self._segments: dict[int, _Segment] = {}
+        self._live: dict[int, set[int]] = {}
+        self._open()
+
+    # -- updating -------------------------------------------------------------
+
+    def add(self, records: Iterable[dict[str, Any]]) -> int:
+        """Index ``records`` (transcript records as saved by ``interview``).
+
+        Returns:
+            The number of records indexed.
+        """
+        builder = _SegmentBuilder()
+        added = 0
+        for record in records:
+            builder.add(record)
+            added += 1
+            if len(builder) >= self.batch_messages:
+                self._commit(builder)
+                builder = _SegmentBuilder()
+        self._commit(builder)
+        return added
+
+    def update(self, source: str | Path) -> int:
+        """Index the transcripts written to ``source`` since the last update.
+
+        ``source`` is a :class:`~cli.store.TranscriptStore` directory (read
+        from where the last update stopped) or a directory of run JSON files
+        (new and modified files are read).
+
+        Returns:
+            The number of records indexed.
+        """
+        source = Path(source)
+        if (source / "index.bin").exists():
+            return self._update_from_store(source)
+        return self._update_from_files(source)
+
+    def _update_from_store(self, root: Path) -> int:
+        from cli.store import TranscriptStore
+
+        key = str(root.resolve())
+        builder = _SegmentBuilder()
+        position = self._manifest["stores"].get(key, 0)
+        added = 0
+        with TranscriptStore(root) as store:
+            for position, record in store.tail(position):
+                builder.add(record)
+                added += 1
+                if len(builder) >= self.batch_messages:
+                    self._commit(builder, stores={key: position})
+                    builder = _SegmentBuilder()
+        if added:
+            self._commit(builder, stores={key: position})
+        return added
+
+    def _update_from_files(self, root: Path) -> int:
+        known: dict[str, int] = self._manifest["files"]
+        builder = _SegmentBuilder()
+        files: dict[str, int] = {}
+        added = 0
+        for path in sorted(root.rglob("*.json")):
+            key = str(path.resolve())
+            mtime = path.stat().st_mtime_ns
+            if known.get(key) == mtime:
+                continue
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning(f"Skipping {path}: {exc}")
+                continue
+            if "conversation_id" not in record:
+                continue
+            builder.add(record)
+            files[key] = mtime
+            added += 1
+            if len(builder) >= self.batch_messages:
+                self._commit(builder, files=files)
+                builder, files = _SegmentBuilder(), {}
+        if files:
+            self._commit(builder, files=files)
+        return added
+
+    def _commit(
+        self,
+        builder: _SegmentBuilder,
+        *,
+        stores: dict[str, int] | None = None,
+        files: dict[str, int] | None = None,
+    ) -> None:
+        """Write ``builder`` as a new segment and record progress atomically."""
+        if builder.conversations:
+            number = self._manifest["next"]
+            builder.write(self.root, number)
+            self._manifest["segments"].append(number)
+            self._manifest["next"] = number + 1
+        self._manifest["stores"].update(stores or {})
+        self._manifest["files"].update(files or {})
+        self._save_manifest()
+        self._open()
+        if len(self._segments) > self.max_segments:
+            self.merge()
+
+    def merge(self) -> None:
+        """Merge all segments into one, dropping superseded conversations."""
+        if len(self._segments) <= 1:
+            return
+        builder = _SegmentBuilder()
+        for number in self._manifest["segments"]:
+            builder.extend(self._segments[number], self._live[number])
+        old = list(self._manifest["segments"])
+        self._manifest["segments"] = []
+        if builder.conversations:
+            number = self._manifest["next"]
+            builder.write(self.root, number)
+            self._manifest["segments"] = [number]
+            self._manifest["next"] = number + 1
+        self._save_manifest()
+        self._open()
+        for number in old:
+            for suffix in (".post", ".msgs", ".meta"):
+                path = self.root / f"{_SEGMENT_PATTERN.format(number)}{suffix}"
+                path.unlink(missing_ok=True)
+
+    # -- querying -------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        *,
+        role: str | None = None,
+        task_type: str | None = None,
+        patient_id: str | None = None,
+        limit: int | None = 20,
+    ) -> list[Hit]:
+        """Messages matching every term and ``"quoted phrase"`` in ``query``.
+
+        Terms match whole words, case-insensitively. Hits come newest first.
+
+        Args:
+            query: Words and quoted phrases.
+            role: Only messages from this role (``"doctor"``, ``"patient"``,
+                ``"system"``).
+            task_type: Only conversations of this task type.
+            patient_id: Only conversations with this patient.
+            limit: Stop after this many hits (``None``: all of them).
+
+        Raises:
+            ValueError: If the query has no terms.
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            raise ValueError(f"query has no searchable terms: {query!r}")
+        hits: list[Hit] = []
+        for number in reversed(self._manifest["segments"]):
+            segment = self._segments[number]
+            live = self._live[number]
+            if patient_id is not None or task_type is not None:
+                live = {
+                    c
+                    for c in live
+                    if patient_id in (None, segment.conversations[c][1])
+                    and task_type in (None, segment.conversations[c][2])
+                }
+            if not live:
+                continue
+            if role is not None and role not in segment.roles:
+                continue
+            role_code = None if role is None else segment.roles.index(role)
+
+            for doc in sorted(segment.match(clauses), reverse=True):
+                conversation = segment.message_conversation[doc]
+                if conversation not in live:
+                    continue
+                if role_code is not None and segment.message_role[doc] != role_code:
+                    continue
+                conversation_id, pid, task = segment.conversations[conversation]
+                hits.append(
+                    Hit(
+                        conversation_id=conversation_id,
+                        patient_id=pid,
+                        task_type=task,
+                        message_index=segment.message_index[doc],
+                        role=segment.roles[segment.message_role[doc]],
+                    )
+                )
+                if limit is not None and len(hits) >= limit:
+                    return hits
+        return hits
+
+    def __len__(self) -> int:
+        """Number of indexed messages in live (not superseded) conversations."""
+        return sum(
+            sum(1 for c in segment.message_conversation if c in self._live[number])
+            for number, segment in self._segments.items()
+        )
+
+    # -- manifest and segments ------------------------------------------------
+
+    def _load_manifest(self) -> dict[str, Any]:
+        path = self.root / _MANIFEST_NAME
+        if not path.exists():
+            return {"segments": [], "next": 1, "stores": {}, "files": {}}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save_manifest(self) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._manifest, f)
+            os.replace(tmp, self.root / _MANIFEST_NAME)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _open(self) -> None:
+        """Open new segments, close dropped ones and find live conversations."""
+        numbers = self._manifest["segments"]
+        for number in set(self._segments) - set(numbers):
+            self._segments.pop(number).close()
+        for number in numbers:
+            if number not in self._segments:
+                self._segments[number] = _Segment(self.root, number)
+
+        latest: dict[str, tuple[int, int]] = {}
+        for number in numbers:
+            for conversation, (conversation_id, *_) in enumerate(
+                self._segments[number].conversations
+            ):
+                latest[conversation_id] = (number, conversation)
+        self._live = {number: set() for number in numbers}
+        for number, conversation in latest.values():
+            self._live[number].add(conversation)
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    def __enter__(self) -> TranscriptIndex:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Command
+# ---------------------------------------------------------------------------
+
+
+def _messages(source: Path, hits: list[Hit]) -> list[str]:
+    """Content of each hit's message, read back from the transcript source."""
+    from cli.store import TranscriptStore
+
+    store = TranscriptStore(source) if (source / "index.bin").exists() else None
+    contents: list[str] = []
+    try:
+        for hit in hits:
+            try:
+                if store is not None:
+                    record = store.get(hit.conversation_id)
+                else:
+                    path = source / f"{hit.conversation_id}.json"
+                    record = json.loads(path.read_text(encoding="utf-8"))
+                message = record["messages"][hit.message_index]
+                contents.append(_text(message["content"]))
+            except (KeyError, IndexError, OSError, ValueError):
+                contents.append("")
+    finally:
+        if store is not None:
+            store.close()
+    return contents
+
+
+def _snippet(text: str, terms: set[str], width: int = 100) -> str:
+    """About ``width`` characters of ``text`` around the first matching term."""
+    start = 0
+    for match in _TOKEN.finditer(text):
+        if match.group().casefold() in terms:
+            start = max(0, match.start() - width // 3)
+            break
+    snippet = " ".join(text[start : start + width].split())
+    prefix = "…" if start else ""
+    suffix = "…" if start + width < len(text) else ""
+    return f"{prefix}{snippet}{suffix}"
+
+
+def search(
+    source: Path = typer.Argument(
+        ..., help="Transcript store or directory of interview run JSON files."
+    ),
+    query: str = typer.Argument(
+        ..., help='Words and "quoted phrases"; messages must match all of them.'
+    ),
+    index_dir: Path | None = typer.Option(
+        None, "--index", help="Index directory (default: <source>/.search)."
+    ),
+    role: str | None = typer.Option(
+        None, "--role", "-r", help="Only messages from this role (doctor, patient)."
+    ),
+    task_type: TaskType | None = typer.Option(
+        None, "--task-type", "-t", help="Only conversations of this task type."
+    ),
+    patient_id: str | None = typer.Option(
+        None, "--patient-id", help="Only conversations with this patient."
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum hits to show."),
+    update: bool = typer.Option(
+        True,
+        "--update/--no-update",
+        help="Index transcripts written since the last search first.",
+    ),
+) -> None:
+    """Search interview transcripts for words and phrases."""
+    console = Console()
+    with TranscriptIndex(index_dir or source / ".search") as index:
+        if update:
+            added = index.update(source)
+            if added:
+                logger.info(f"Indexed {added} new transcripts from {source}")
+        started = time.perf_counter()
+        try:
+            hits = index.search(
+                query,
+                role=role,
+                task_type=task_type,
+                patient_id=patient_id,
+                limit=limit,
+            )
+        except ValueError as exc:
+            logger.error(str(exc))
+            raise typer.Exit(1)
+        elapsed = (time.perf_counter() - started) * 1000
+
+    terms = {term for clause in parse_query(query) for term in clause}
+    table = Table(show_header=True)
+    table.add_column("Conversation")
+    table.add_column("Patient")
+    table.add_column("Task")
+    table.add_column("Role")
+    table.add_column("#", justify="right")
+    table.add_column("Message")
+    for hit, content in zip(hits, _messages(source, hits)):
+        table.add_row(
+            hit.conversation_id[:8],
+            hit.patient_id[:8],
+            hit.task_type,
+            hit.role,
+            str(hit.message_index),
+            _snippet(content, terms),
+        )
+    console.print(table)
+    console.print(f"{len(hits)} hits in {elapsed:.1f} ms")
@@ -0,0 +1,253 @@
+"""Append-only, zstd-compressed transcript store.
+
+Layout of a store directory::
+
+    segment-000000.log   # [header][zstd(JSON record)] [header][...] ...
+    segment-000001.log   # a new segment starts once the current one is full
+    index.bin            # fixed-width entries: key, segment, offset, length
+
+Writes are sequential appends: the compressed record goes to the current
+segment, then a 32-byte entry goes to the index. The index is memory-mapped
+for reads, so any transcript can be fetched by conversation id with one seek,
+without scanning the segments. Appending a record for an existing id
+supersedes the earlier one (e.g. a partial transcript followed by the final
+one).
+
+A store supports one writing process at a time; any number of processes may
+read it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+import threading
+import uuid
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import zstandard
+
+_HEADER = struct.Struct("<II")  # compressed length, crc32 of compressed bytes
+_ENTRY = struct.Struct("<16sIQI")  # key, segment, offset, length (with header)
+_INDEX_NAME = "index.bin"
+_SEGMENT_PATTERN = "segment-{:06d}.log"
+
+
+def _key(conversation_id: str) -> bytes:
+    """16-byte index key: the UUID's bytes, or a hash for other ids."""
+    try:
+        return uuid.UUID(conversation_id).bytes
+    except ValueError:
+        return hashlib.blake2b(conversation_id.encode(), digest_size=16).digest()
+
+
+class TranscriptStore:
+    """Append-only store of interview transcripts keyed by conversation id.
+
+    Args:
+        root: Store directory (created if missing).
+        segment_bytes: Start a new segment once the current one exceeds this.
+        level: zstd compression level.
+
+    Usage::
+
+        with TranscriptStore("runs/") as store:
+            store.append({"conversation_id": cid, "messages": [...], ...})
+            record = store.get(cid)
+            for record in store:
+                ...
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        segment_bytes: int = 64 << 20,
+        level: int = 3,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+
+        self._index_path = self.root / _INDEX_NAME
+        self._index_path.touch(exist_ok=True)
+        self._index_map: mmap.mmap | None = None
+        self._entries: dict[bytes, tuple[int, int, int]] = {}
+        self._indexed_bytes = 0
+
+        self._writer: Any = None
+        self._index_writer: Any = None
+        self._segment = max(self._segments(), default=0)
+        self._readers: dict[int, Any] = {}
+
+    # -- writing --------------------------------------------------------------
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Append one record. It must have a ``conversation_id``."""
+        conversation_id = record["conversation_id"]
+        data = json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+        # zstandard (de)compressor objects are not thread-safe.
+        with self._lock:
+            payload = self._compressor.compress(data)
+            frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+            writer = self._segment_writer(len(frame))
+            offset = writer.tell()
+            writer.write(frame)
+            writer.flush()
+
+            entry = (self._segment, offset, len(frame))
+            if self._index_writer is None:
+                self._index_writer = self._index_path.open("ab")
+            self._index_writer.write(_ENTRY.pack(_key(conversation_id), *entry))
+            self._index_writer.flush()
+
+    def _segment_writer(self, size: int) -> Any:
+        """Return the current segment, rolling over to a new one if full."""
+        if self._writer is None:
+            path = self.root / _SEGMENT_PATTERN.format(self._segment)
+            self._writer = path.open("ab")
+        used = self._writer.tell()
+        if used > 0 and used + size > self._segment_bytes:
+            self._writer.close()
+            self._segment += 1
+            path = self.root / _SEGMENT_PATTERN.format(self._segment)
+            self._writer = path.open("ab")
+        return self._writer
+
+    # -- reading --------------------------------------------------------------
+
+    def get(self, conversation_id: str) -> dict[str, Any]:
+        """Return the latest record for ``conversation_id``.
+
+        Raises:
+            KeyError: If the store has no record for it.
+        """
+        with self._lock:
+            self._refresh_index()
+            entry = self._entries.get(_key(conversation_id))
+        if entry is None:
+            raise KeyError(conversation_id)
+        return self._read(*entry)
+
+    def __contains__(self, conversation_id: object) -> bool:
+        if not isinstance(conversation_id, str):
+            return False
+        with self._lock:
+            self._refresh_index()
+            return _key(conversation_id) in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Yield the latest record of every conversation, in write order."""
+        with self._lock:
+            self._refresh_index()
+            entries = sorted(self._entries.values())
+        for entry in entries:
+            yield self._read(*entry)
+
+    def scan(self) -> Iterator[dict[str, Any]]:
+        """Yield every record ever written, superseded ones included.
+
+        Reads the segments sequentially, which is the fastest way to process
+        a whole store.
+        """
+        decompressor = zstandard.ZstdDecompressor()
+        for segment in sorted(self._segments()):
+            path = self.root / _SEGMENT_PATTERN.format(segment)
+            with path.open("rb") as fh:
+                while True:
+                    header = fh.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        break
+                    length, crc = _HEADER.unpack(header)
+                    payload = fh.read(length)
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break  # torn write at the end of the segment
+                    yield json.loads(decompressor.decompress(payload))
+
+    def tail(self, start: int = 0) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield ``(position, record)`` for records appended after ``start``.
+
+        Records come in write order, superseded ones included. ``position``
+        counts the records written so far; pass the last one seen as
+        ``start`` to resume where a previous call stopped.
+        """
+        with self._lock:
+            self._refresh_index()
+            if self._index_map is None:
+                return
+            entries = list(
+                _ENTRY.iter_unpack(
+                    self._index_map[start * _ENTRY.size : self._indexed_bytes]
+                )
+            )
+        for position, (_, segment, offset, length) in enumerate(entries, start + 1):
+            yield position, self._read(segment, offset, length)
+
+    def _read(self, segment: int, offset: int, length: int) -> dict[str, Any]:
+        with self._lock:
+            reader = self._readers.get(segment)
+            if reader is None:
+                path = self.root / _SEGMENT_PATTERN.format(segment)
+                reader = self._readers[segment] = path.open("rb")
+            reader.seek(offset)
+            frame = reader.read(length)
+            size, crc = _HEADER.unpack_from(frame)
+            payload = frame[_HEADER.size : _HEADER.size + size]
+            if zlib.crc32(payload) != crc:
+                raise ValueError(f"Corrupt record in segment {segment} at {offset}")
+            data = self._decompressor.decompress(payload)
+        return json.loads(data)
+
+    def _refresh_index(self) -> None:
+        """Map any index entries appended since the last call."""
+        size = self._index_path.stat().st_size
+        size -= size % _ENTRY.size  # ignore a partially written entry
+        if size <= self._indexed_bytes:
+            return
+        if self._index_map is None or len(self._index_map) < size:
+            if self._index_map is not None:
+                self._index_map.close()
+            with self._index_path.open("rb") as fh:
+                self._index_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        for key, segment, offset, length in _ENTRY.iter_unpack(
+            self._index_map[self._indexed_bytes : size]
+        ):
+            self._entries[key] = (segment, offset, length)
+        self._indexed_bytes = size
+
+    def _segments(self) -> list[int]:
+        return [int(p.stem.split("-")[1]) for p in self.root.glob("segment-*.log")]
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def close(self) -> None:
+        """Close all open files."""
+        with self._lock:
+            for fh in (self._writer, self._index_writer, *self._readers.values()):
+                if fh is not None:
+                    fh.close()
+            self._writer = self._index_writer = None
+            self._readers.clear()
+            if self._index_map is not None:
+                self._index_map.close()
+                self._index_map = None
+
+    def __enter__(self) -> TranscriptStore:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
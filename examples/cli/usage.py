@@ -0,0 +1,191 @@
+"""Token and cost accounting for the doctor LLM.
+
+Each doctor turn's prompt and completion tokens (from the response's
+``usage_metadata``) and latency are recorded in a :class:`UsageLedger`,
+which aggregates them per conversation and prices them with
+:class:`Pricing`. A :class:`Budget` decides when an interview must stop
+(total tokens or cost) or have its older turns compacted (prompt size).
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+
+
+@dataclass(frozen=True)
+class Pricing:
+    """Price of the doctor deployment, in currency units per million tokens."""
+
+    prompt_per_million: float = 0.0
+    completion_per_million: float = 0.0
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (
+            prompt_tokens * self.prompt_per_million
+            + completion_tokens * self.completion_per_million
+        ) / 1_000_000
+
+
+@dataclass
+class TurnUsage:
+    """Usage of one doctor LLM call."""
+
+    turn: int | str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_s: float
+    cost: float
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+
+def token_counts(message: Any) -> tuple[int, int]:
+    """Return ``(prompt_tokens, completion_tokens)`` reported for an LLM reply.
+
+    Reads LangChain's ``usage_metadata``, falling back to the OpenAI
+    ``token_usage`` in ``response_metadata``; ``(0, 0)`` if neither is set.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    token_usage = (getattr(message, "response_metadata", None) or {}).get(
+        "token_usage"
+    )
+    if token_usage:
+        return (
+            token_usage.get("prompt_tokens", 0),
+            token_usage.get("completion_tokens", 0),
+        )
+    return 0, 0
+
+
+@dataclass
+class UsageLedger:
+    """Per-turn LLM usage of one conversation, with running totals."""
+
+    pricing: Pricing = field(default_factory=Pricing)
+    turns: list[TurnUsage] = field(default_factory=list)
+
+    def record(self, turn: int | str, message: Any, latency_s: float) -> TurnUsage:
+        """Record the usage reported on ``message`` (an LLM reply)."""
+        prompt, completion = token_counts(message)
+        usage = TurnUsage(
+            turn=turn,
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            latency_s=latency_s,
+            cost=self.pricing.cost(prompt, completion),
+        )
+        self.turns.append(usage)
+        return usage
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(t.prompt_tokens for t in self.turns)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(t.completion_tokens for t in self.turns)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cost(self) -> float:
+        return sum(t.cost for t in self.turns)
+
+    @property
+    def latency_s(self) -> float:
+        return sum(t.latency_s for t in self.turns)
+
+    def totals(self) -> dict[str, Any]:
+        return {
+            "calls": len(self.turns),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cost": self.cost,
+            "latency_s": self.latency_s,
+            "completion_tokens_per_s": (
+                self.completion_tokens / self.latency_s if self.latency_s else 0.0
+            ),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Per-turn usage and totals, for saved runs."""
+        return {
+            "turns": [t.to_dict() for t in self.turns],
+            "total": self.totals(),
+        }
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Limits on a conversation's LLM usage.
+
+    Args:
+        max_tokens: Never let the conversation use more than this many tokens.
+        max_cost: Never let the conversation cost more than this.
+        compact_at: Compact older turns once a prompt reaches this many tokens.
+    """
+
+    max_tokens: int | None = None
+    max_cost: float | None = None
+    compact_at: int | None = None
+
+    def exhausted(self, ledger: UsageLedger) -> bool:
+        """Whether the conversation should stop and wrap up."""
+        if self.max_tokens is not None and ledger.total_tokens >= self.max_tokens:
+            return True
+        return self.max_cost is not None and ledger.cost >= self.max_cost
+
+    def allows(self, ledger: UsageLedger, usage: TurnUsage) -> bool:
+        """Whether another call using about as much as ``usage`` stays within limits."""
+        if (
+            self.max_tokens is not None
+            and ledger.total_tokens + usage.total_tokens > self.max_tokens
+        ):
+            return False
+        return self.max_cost is None or ledger.cost + usage.cost <= self.max_cost
+
+    def should_compact(self, usage: TurnUsage) -> bool:
+        """Whether the prompt behind ``usage`` was too large."""
+        return self.compact_at is not None and usage.prompt_tokens >= self.compact_at
+
+
+def print_usage(ledger: UsageLedger, console: Console) -> None:
+    """Print per-turn usage and totals as a table."""
+    table = Table(title="LLM usage")
+    table.add_column("Turn", justify="right")
+    table.add_column("Prompt", justify="right")
+    table.add_column("Completion", justify="right")
+    table.add_column("Latency s", justify="right")
+    table.add_column("Cost", justify="right")
+    for t in ledger.turns:
+        table.add_row(
+            str(t.turn),
+            str(t.prompt_tokens),
+            str(t.completion_tokens),
+            f"{t.latency_s:.2f}",
+            f"{t.cost:.4f}",
+        )
+    table.add_section()
+    table.add_row(
+        "Total",
+        str(ledger.prompt_tokens),
+        str(ledger.completion_tokens),
+        f"{ledger.latency_s:.2f}",
+        f"{ledger.cost:.4f}",
+        style="bold",
+    )
+    console.print(table)
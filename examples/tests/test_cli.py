@@ -0,0 +1,42 @@
+"""The lazily loaded CLI behaves like one with every command registered up front."""
+
+from __future__ import annotations
+
+import importlib
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+import cli
+
+
+def _eager_app() -> typer.Typer:
+    """The app as it was built before commands were loaded lazily."""
+    app = typer.Typer(
+        name="virtual-clinic", help="Virtual Clinic CLI", no_args_is_help=True
+    )
+    app.callback()(cli._setup)
+    for name, target in cli._COMMANDS.items():
+        module_name, attr = target.split(":")
+        app.command(name=name)(getattr(importlib.import_module(module_name), attr))
+    return app
+
+
+@pytest.mark.parametrize("name", list(cli._COMMANDS))
+def test_subcommand_help_is_unchanged(name: str) -> None:
+    runner = CliRunner()
+    lazy = runner.invoke(cli.app, [name, "--help"], terminal_width=100)
+    eager = runner.invoke(_eager_app(), [name, "--help"], terminal_width=100)
+
+    assert lazy.exit_code == 0, lazy.output
+    assert lazy.output == eager.output
+    assert "--install-completion" not in lazy.output
+
+
+def test_top_level_help_lists_every_command() -> None:
+    result = CliRunner().invoke(cli.app, ["--help"], terminal_width=100)
+    assert result.exit_code == 0
+    for name in cli._COMMANDS:
+        assert name in result.output
+    assert "--install-completion" in result.output
@@ -0,0 +1,141 @@
+"""The interview loop, with a scripted doctor against the stand-in."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+
+from virtual_clinic import VirtualClinic
+from virtual_clinic.standin import StandIn, synthetic_patients
+
+from cli.interview import _run_interview
+from cli.prompts import AssessmentDetector, assessment_detector
+from cli.usage import Budget, UsageLedger
+
+
+class ScriptedDoctor:
+    """Stands in for the LLM pool, asking numbered questions.
+
+    Call ``n`` answers ``replies[n]`` if given. Every reply reports
+    ``prompt_tokens`` prompt and 10 completion tokens.
+    """
+
+    def __init__(
+        self, prompt_tokens: int = 100, replies: dict[int, str] | None = None
+    ) -> None:
+        self.prompt_tokens = prompt_tokens
+        self.replies = replies or {}
+        self.prompts: list[list[BaseMessage]] = []
+
+    def invoke(self, messages: list[BaseMessage], **kwargs: Any) -> AIMessage:
+        self.prompts.append(list(messages))
+        n = len(self.prompts)
+        return AIMessage(
+            content=self.replies.get(n, f"Question {n}?"),
+            usage_metadata={
+                "input_tokens": self.prompt_tokens,
+                "output_tokens": 10,
+                "total_tokens": self.prompt_tokens + 10,
+            },
+        )
+
+
+@pytest.fixture
+def conversation() -> Iterator[tuple[VirtualClinic, str]]:
+    patients = synthetic_patients(1, seed=0)
+    api = StandIn(patients, seed=0)
+    with VirtualClinic(token="test", transport=api.transport()) as client:
+        convo = client.conversations.create(
+            patient_id=patients[0].patient.id, task_type="diagnosis"
+        )
+        yield client, convo.id
+
+
+def _interview(
+    conversation: tuple[VirtualClinic, str],
+    doctor: ScriptedDoctor,
+    budget: Budget,
+    max_turns: int = 10,
+    detect: AssessmentDetector | None = None,
+) -> tuple[str | None, UsageLedger, list[BaseMessage]]:
+    client, conversation_id = conversation
+    ledger = UsageLedger()
+    messages: list[BaseMessage] = [SystemMessage(content="You are a doctor.")]
+    assessment = _run_interview(
+        client,
+        doctor,  # type: ignore[arg-type]
+        conversation_id,
+        messages,
+        max_turns,
+        ledger=ledger,
+        budget=budget,
+        detect=detect,
+    )
+    return assessment, ledger, messages
+
+
+def test_wraps_up_while_the_budget_has_room(
+    conversation: tuple[VirtualClinic, str],
+) -> None:
+    doctor = ScriptedDoctor()
+    assessment, ledger, _ = _interview(conversation, doctor, Budget(max_tokens=400))
+
+    # Three turns of 110 tokens leave no room for a fourth; the wrap-up fits.
+    assert [t.turn for t in ledger.turns] == [1, 2, 3, "wrap-up"]
+    assert ledger.total_tokens == 440
+    assert assessment == "Question 4?"
+
+
+def test_exhausted_budget_skips_the_wrap_up_call(
+    conversation: tuple[VirtualClinic, str],
+) -> None:
+    doctor = ScriptedDoctor(prompt_tokens=500)
+    assessment, ledger, messages = _interview(
+        conversation, doctor, Budget(max_tokens=400)
+    )
+
+    assert assessment is None
+    assert len(doctor.prompts) == 1
+    assert [t.turn for t in ledger.turns] == [1]
+    assert messages[-1].name == "patient"
+
+
+def test_compaction_condenses_older_turns_in_later_prompts(
+    conversation: tuple[VirtualClinic, str],
+) -> None:
+    doctor = ScriptedDoctor()
+    _, _, messages = _interview(
+        conversation, doctor, Budget(compact_at=100), max_turns=4
+    )
+
+    first, *_, last = doctor.prompts
+    assert first == messages[:1]
+    assert "Earlier in this interview the patient told you" in last[1].content
+    assert "Question 1?" not in [m.content for m in last]
+    assert last[-1] is messages[-1]
+    # The transcript itself stays whole: four exchanges and the wrap-up request.
+    assert len(messages) == 1 + 2 * 4 + 1
+
+
+def test_stops_as_soon_as_the_assessment_is_delivered(
+    conversation: tuple[VirtualClinic, str],
+) -> None:
+    client, conversation_id = conversation
+    assessment_text = "## Assessment\n**Key findings** ..."
+    doctor = ScriptedDoctor(replies={2: assessment_text})
+    assessment, ledger, messages = _interview(
+        conversation,
+        doctor,
+        Budget(),
+        detect=assessment_detector("heading", "diagnosis"),
+    )
+
+    assert assessment == assessment_text
+    assert [t.turn for t in ledger.turns] == [1, 2]
+    # The assessment was neither sent to the patient nor followed by a wrap-up.
+    assert messages[-1].content == assessment_text
+    sent = client.conversations.get_messages(conversation_id)
+    assert [m.content for m in sent if m.role == "user"] == ["Question 1?"]
@@ -0,0 +1,96 @@
+"""The disk cache of doctor completions."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from cli.llm_cache import CompletionCache, cache_key
+from cli.llm_pool import Deployment, LLMPool
+
+
+def _disk_size(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.glob("*/*.zst"))
+
+
+def test_cache_key_ignores_ids_but_not_content_or_model() -> None:
+    prompt = [SystemMessage(content="You are a doctor."), HumanMessage(content="Hi")]
+    same = [SystemMessage(content="You are a doctor.", id="x"), HumanMessage("Hi")]
+    model = {"deployments": [("gpt", None, 0.0, None)]}
+
+    assert cache_key(prompt, model) == cache_key(same, model)
+    assert cache_key(prompt, model) != cache_key(prompt[:1], model)
+    assert cache_key(prompt, model) != cache_key(prompt, {"deployments": []})
+
+
+def test_round_trip_and_hit_counts(tmp_path: Path) -> None:
+    cache = CompletionCache(tmp_path)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, AIMessage(content="Any allergies?"))
+
+    message = cache.get("ab" * 32)
+    assert isinstance(message, AIMessage)
+    assert message.content == "Any allergies?"
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Another process sharing the directory sees the entry.
+    assert CompletionCache(tmp_path).get("ab" * 32) is not None
+
+
+def test_replacing_an_entry_counts_its_size_once(tmp_path: Path) -> None:
+    cache = CompletionCache(tmp_path)
+    cache.put("cd" * 32, AIMessage(content="short"))
+    cache.put("cd" * 32, AIMessage(content="a much longer answer " * 20))
+    cache.put("cd" * 32, AIMessage(content="short again"))
+
+    assert cache._size == _disk_size(tmp_path)
+    assert CompletionCache(tmp_path)._size == cache._size
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    keys = [f"{i:02x}" * 32 for i in range(4)]
+    cache = CompletionCache(tmp_path)
+    for i, key in enumerate(keys):
+        cache.put(key, AIMessage(content=f"answer {i} " * 50))
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get(keys[0])  # now the most recently used
+
+    cache.max_bytes = _disk_size(tmp_path) - 1
+    cache.put("ff" * 32, AIMessage(content="new"))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get("ff" * 32) is not None
+    assert _disk_size(tmp_path) <= cache.max_bytes * 0.9
+
+
+def test_truncated_entry_is_a_miss(tmp_path: Path) -> None:
+    cache = CompletionCache(tmp_path)
+    cache.put("ee" * 32, AIMessage(content="answer"))
+    path = cache._path("ee" * 32)
+    path.write_bytes(path.read_bytes()[:5])
+
+    assert cache.get("ee" * 32) is None
+    assert not path.exists()
+
+
+def test_pool_answers_repeated_prompts_from_the_cache(tmp_path: Path) -> None:
+    calls: list[object] = []
+
+    class Model:
+        def invoke(self, messages: object, **kwargs: object) -> AIMessage:
+            calls.append(messages)
+            return AIMessage(content="What brings you in?")
+
+    pool = LLMPool(
+        [Deployment("gpt", Model())],  # type: ignore[arg-type]
+        cache=CompletionCache(tmp_path),
+    )
+    prompt = [HumanMessage(content="Hello")]
+
+    assert pool.invoke(prompt).response_metadata["deployment"] == "gpt"
+    again = pool.invoke(prompt)
+    assert again.content == "What brings you in?"
+    assert again.response_metadata == {"deployment": "cache"}
+    assert len(calls) == 1
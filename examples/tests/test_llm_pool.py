@@ -0,0 +1,120 @@
+"""Balancing and failover in the doctor's LLM pool."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from cli.llm_pool import Deployment, LLMPool
+
+PROMPT: list[BaseMessage] = [HumanMessage(content="Hello")]
+
+
+class Throttled(Exception):
+    """Looks like an OpenAI rate-limit error."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str | None = None) -> None:
+        super().__init__("rate limited")
+        headers = {} if retry_after is None else {"retry-after": retry_after}
+        self.response = type("Response", (), {"headers": headers})()
+
+
+class FakeModel:
+    """Answers with its own name, after ``delay``; raises queued errors first."""
+
+    def __init__(self, name: str, delay: float = 0.0) -> None:
+        self.name = name
+        self.delay = delay
+        self.errors: list[Exception] = []
+        self.calls = 0
+
+    def invoke(self, messages: list[BaseMessage], **kwargs: Any) -> AIMessage:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        time.sleep(self.delay)
+        return AIMessage(content=self.name)
+
+
+def _pool(*models: FakeModel, **options: Any) -> LLMPool:
+    return LLMPool(
+        [Deployment(m.name, m, **options) for m in models]  # type: ignore[arg-type]
+    )
+
+
+def test_calls_are_spread_by_weight() -> None:
+    heavy, light = FakeModel("heavy"), FakeModel("light")
+    pool = LLMPool(
+        [
+            Deployment("heavy", heavy, weight=2.0),  # type: ignore[arg-type]
+            Deployment("light", light),  # type: ignore[arg-type]
+        ]
+    )
+    answers = [pool.invoke(PROMPT).response_metadata["deployment"] for _ in range(30)]
+
+    assert answers.count("heavy") == 20
+    assert answers.count("light") == 10
+
+
+def test_throttled_deployment_fails_over_and_is_benched() -> None:
+    first, second = FakeModel("first"), FakeModel("second")
+    first.errors.append(Throttled(retry_after="60"))
+    pool = _pool(first, second)
+
+    assert pool.invoke(PROMPT).content == "second"
+    assert pool.deployments[0].benched_until > time.monotonic() + 50
+    assert [pool.invoke(PROMPT).content for _ in range(3)] == ["second"] * 3
+    assert first.calls == 1
+
+
+def test_every_deployment_throttled_raises_the_last_error() -> None:
+    first, second = FakeModel("first"), FakeModel("second")
+    first.errors.append(Throttled())
+    last = Throttled("bad header")
+    second.errors.append(last)
+    pool = _pool(first, second)
+
+    with pytest.raises(Throttled) as raised:
+        pool.invoke(PROMPT)
+    assert raised.value is last
+    # An unparseable Retry-After benches for the default cooldown.
+    assert pool.deployments[1].benched_until > time.monotonic() + 5
+
+
+def test_other_errors_do_not_fail_over() -> None:
+    first, second = FakeModel("first"), FakeModel("second")
+    first.errors.append(ValueError("bad request"))
+    pool = _pool(first, second)
+
+    with pytest.raises(ValueError):
+        pool.invoke(PROMPT)
+    assert second.calls == 0
+    assert pool.deployments[0].in_flight == 0
+
+
+def test_max_concurrency_makes_calls_wait_for_a_slot() -> None:
+    model = FakeModel("only", delay=0.2)
+    pool = _pool(model, max_concurrency=1)
+    started = threading.Event()
+
+    with ThreadPoolExecutor(1) as executor:
+        busy = executor.submit(lambda: (started.set(), pool.invoke(PROMPT)))
+        started.wait()
+        time.sleep(0.02)
+        with pytest.raises(TimeoutError):
+            pool.invoke(PROMPT, timeout=0.05)
+        assert pool.invoke(PROMPT, timeout=1.0).content == "only"
+        busy.result()
+    assert model.calls == 2
+
+
+def test_pool_needs_a_deployment() -> None:
+    with pytest.raises(ValueError):
+        LLMPool([])
@@ -0,0 +1,102 @@
+"""The load tester, run against an in-process stand-in."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from virtual_clinic import VirtualClinic
+from virtual_clinic.standin import LatencyModel, StandIn, synthetic_patients
+
+import cli
+from cli.loadtest import LoadStats, percentile, run_load
+
+
+def test_percentile_is_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_report_summarises_latencies_and_errors() -> None:
+    stats = LoadStats()
+    for seconds in (0.01, 0.02, 0.03, 0.04):
+        stats.latencies["patients.get"].append(seconds)
+    stats.errors["patients.get", "ServerError"] += 1
+    stats.finish(ok=True)
+
+    report = stats.report(target="t", duration=2.0, conversations=1)
+    row = report["endpoints"]["patients.get"]
+    assert row["requests"] == 5
+    assert row["errors"] == 1
+    assert row["p50_ms"] == pytest.approx(20.0)
+    assert row["max_ms"] == pytest.approx(40.0)
+    assert report["errors"] == {"ServerError": 1}
+    assert report["requests_per_s"] == 2.5
+
+
+def test_run_load_counts_every_request() -> None:
+    patients = synthetic_patients(3, seed=0)
+    api = StandIn(patients, seed=0)
+    with VirtualClinic(token="test", transport=api.transport()) as client:
+        stats, _ = run_load(
+            client,
+            [p.patient.id for p in patients],
+            conversations=6,
+            turns=2,
+            concurrency=3,
+        )
+
+    assert (stats.completed, stats.failed, stats.turns) == (6, 0, 12)
+    assert len(stats.latencies["conversations.create"]) == 6
+    assert len(stats.latencies["conversations.send_message"]) == 12
+    assert len(stats.latencies["conversations.get"]) == 6
+
+
+def test_batch_deadline_skips_conversations_not_yet_started() -> None:
+    patients = synthetic_patients(1, seed=0)
+    api = StandIn(
+        patients, latency={"conversations.create": LatencyModel(0.1, 0.1)}, seed=0
+    )
+    started = time.perf_counter()
+    with VirtualClinic(token="test", transport=api.transport()) as client:
+        stats, _ = run_load(
+            client,
+            [patients[0].patient.id],
+            conversations=20,
+            turns=1,
+            concurrency=1,
+            rate=10,
+            deadline_seconds=0.35,
+        )
+
+    assert time.perf_counter() - started < 1.5
+    assert stats.skipped > 0
+    assert stats.completed + stats.failed + stats.skipped == 20
+
+
+def test_cli_writes_a_json_report(tmp_path: Path) -> None:
+    output = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        cli.app,
+        ["loadtest", "--standin", "-n", "4", "-k", "1", "-c", "2", "--patients", "2"]
+        + ["--output", str(output)],
+    )
+    assert result.exit_code == 0, result.output
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["target"] == "stand-in"
+    assert report["completed"] == 4
+    assert report["endpoints"]["conversations.send_message"]["requests"] == 4
+
+
+def test_cli_rejects_zero_concurrency() -> None:
+    result = CliRunner().invoke(cli.app, ["loadtest", "--standin", "-c", "0"])
+    assert result.exit_code == 2
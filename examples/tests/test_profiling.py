@@ -0,0 +1,70 @@
+"""The span profiler behind ``--profile``."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from cli.profiling import Profiler
+
+
+def test_disabled_profiler_records_nothing() -> None:
+    profiler = Profiler(enabled=False)
+    with profiler.span("turn", turn=1) as args:
+        args["tokens"] = 10
+    assert profiler.events == []
+    assert profiler.summary() == []
+
+
+def test_spans_nest_and_carry_late_arguments() -> None:
+    profiler = Profiler()
+    with profiler.span("turn", turn=1):
+        with profiler.span("llm.invoke") as args:
+            time.sleep(0.01)
+            args["tokens"] = 42
+
+    inner, outer = profiler.events
+    assert (inner["name"], outer["name"]) == ("llm.invoke", "turn")
+    assert inner["args"] == {"tokens": 42}
+    assert outer["args"] == {"turn": 1}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["dur"] >= 10_000
+
+
+def test_summary_totals_per_name() -> None:
+    profiler = Profiler()
+    for _ in range(3):
+        with profiler.span("request"):
+            time.sleep(0.005)
+
+    (row,) = profiler.summary()
+    assert row["name"] == "request"
+    assert row["count"] == 3
+    assert row["total_s"] >= 0.015
+    assert 0 < row["share"] <= 1
+
+
+def test_write_emits_chrome_trace_events_per_thread(tmp_path: Path) -> None:
+    profiler = Profiler()
+
+    def work() -> None:
+        with profiler.span("conversation"):
+            pass
+
+    thread = threading.Thread(target=work, name="worker-1")
+    thread.start()
+    thread.join()
+    with profiler.span("main"):
+        pass
+    path = tmp_path / "trace.json"
+    profiler.write(path)
+
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    metadata = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert [e["name"] for e in spans] == ["conversation", "main"]
+    assert len({e["tid"] for e in spans}) == 2
+    assert {e["tid"] for e in metadata} == {e["tid"] for e in spans}
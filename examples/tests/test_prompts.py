@@ -0,0 +1,41 @@
+"""Recognising the doctor's final assessment."""
+
+from __future__ import annotations
+
+from cli.prompts import assessment_detector, get_system_prompt
+
+ASSESSMENT = """\
+## Assessment
+1. **Key findings**: long-standing hypertension.
+2. **Differential diagnosis**: essential hypertension, renal artery stenosis.
+"""
+
+
+def test_heading_detector() -> None:
+    detect = assessment_detector("heading", "diagnosis")
+    assert detect is not None
+    assert detect(ASSESSMENT)
+    assert detect("Thanks.\n\n### assessment\n...")
+    assert not detect("What would your assessment of the pain be, 1 to 10?")
+    assert not detect("Do you have any allergies?")
+
+
+def test_sections_detector_needs_every_section_of_the_task() -> None:
+    detect = assessment_detector("sections", "diagnosis")
+    assert detect is not None
+    assert detect(ASSESSMENT.replace("## Assessment\n", ""))
+    assert not detect("**Key findings**: none yet. How are you sleeping?")
+
+    treatment = assessment_detector("sections", "treatment")
+    assert treatment is not None
+    assert not treatment(ASSESSMENT)
+
+
+def test_off_disables_detection() -> None:
+    assert assessment_detector("off", "event") is None
+
+
+def test_system_prompt_asks_for_the_heading() -> None:
+    prompt = get_system_prompt("diagnosis", "Jane Doe")
+    assert "Jane Doe" in prompt
+    assert "`## Assessment`" in prompt
@@ -0,0 +1,110 @@
+"""Scoring assessments against EHR ground truth."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from cli.scoring import TermIndex, ground_truth, normalize, score_runs
+
+DETAIL: dict[str, Any] = {
+    "conditions": [
+        {"code": "44054006", "description": "Diabetes mellitus type 2 (disorder)"},
+        {"code": "38341003", "description": "Hypertension (disorder)"},
+        {
+            "code": "195662009",
+            "description": "Acute viral pharyngitis (disorder)",
+            "stop": "2019-02-01",
+        },
+    ],
+    "medications": [
+        {"code": "860975", "description": "24 HR Metformin hydrochloride 500 MG"},
+    ],
+    "careplans": [],
+    "encounters": [
+        {
+            "encounterClass": "emergency",
+            "code": "50849002",
+            "description": "Emergency room admission",
+            "reasonCode": "22298006",
+            "reasonDescription": "Myocardial infarction (disorder)",
+        },
+        {"encounterClass": "ambulatory", "code": "1", "description": "Check up"},
+    ],
+}
+
+
+def test_normalize_drops_tags_stopwords_and_dosages() -> None:
+    assert normalize("Migraines (disorder) with aura") == ["migraine", "aura"]
+    assert normalize("24 HR Metformin hydrochloride 500 MG") == [
+        "metformin",
+        "hydrochloride",
+    ]
+
+
+def test_ground_truth_per_task_type() -> None:
+    assert ground_truth(DETAIL, "diagnosis") == {
+        "44054006": "Diabetes mellitus type 2 (disorder)",
+        "38341003": "Hypertension (disorder)",
+    }
+    assert list(ground_truth(DETAIL, "treatment")) == ["860975"]
+    assert ground_truth(DETAIL, "event") == {
+        "22298006": "Myocardial infarction (disorder)"
+    }
+
+
+def test_term_index_matches_by_token_coverage() -> None:
+    index = TermIndex(ground_truth(DETAIL, "diagnosis"))
+    text = "Likely type 2 diabetes mellitus; also hypertensive?"
+    assert index.match(text, threshold=1.0) == [0]
+    assert index.match("diabetes mellitus", threshold=0.5) == [0]
+    assert index.match("diabetes mellitus", threshold=1.0) == []
+
+
+def _write_runs(root: Path, runs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    for run in runs:
+        run["_path"] = str(root / f"{run['conversation_id']}.json")
+    return runs
+
+
+def test_score_runs_groups_by_patient(tmp_path: Path) -> None:
+    patients = tmp_path / "patients"
+    patients.mkdir()
+    for pid in ("p1", "p2"):
+        (patients / f"{pid}.json").write_text(json.dumps(DETAIL), encoding="utf-8")
+    runs = _write_runs(
+        tmp_path,
+        [
+            {
+                "conversation_id": "c1",
+                "patient_id": "p1",
+                "task_type": "diagnosis",
+                "assessment": "Type 2 diabetes mellitus and hypertension.",
+            },
+            {
+                "conversation_id": "c2",
+                "patient_id": "p2",
+                "task_type": "diagnosis",
+                "assessment": "Hypertension.",
+            },
+            {
+                "conversation_id": "c3",
+                "patient_id": "p2",
+                "task_type": "event",
+                "assessment": "Acute myocardial infarction.",
+            },
+            {"conversation_id": "c4", "patient_id": "p3", "assessment": "?"},
+        ],
+    )
+
+    for workers in (1, 2):
+        scores = {
+            s.conversation_id: s for s in score_runs(runs, patients, workers=workers)
+        }
+        assert scores["c1"].recall == 1.0
+        assert scores["c2"].recall == 0.5
+        assert scores["c2"].missed_terms == ["Diabetes mellitus type 2 (disorder)"]
+        assert scores["c3"].matched == 1
+        assert scores["c4"].recall is None
+        assert scores["c4"].error == "no cached patient"
@@ -0,0 +1,110 @@
+"""TranscriptIndex search, checked against a linear scan."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cli.search import TranscriptIndex, parse_query, tokenize
+from cli.store import TranscriptStore
+
+_WORDS = (
+    "chest pain aspirin fever cough headache nausea insulin metformin "
+    "dizziness rash fatigue shortness of breath since yesterday morning"
+).split()
+
+
+def _transcripts(n: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "conversation_id": f"conv-{i}",
+            "patient_id": f"patient-{i % 7}",
+            "task_type": rng.choice(["diagnosis", "treatment", "event"]),
+            "messages": [
+                {
+                    "role": rng.choice(["doctor", "patient"]),
+                    "content": " ".join(rng.choices(_WORDS, k=rng.randint(3, 12))),
+                }
+                for _ in range(rng.randint(2, 8))
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def _matches(content: str, clauses: list[tuple[str, ...]]) -> bool:
+    terms = tokenize(content)
+    return all(
+        any(terms[i : i + len(c)] == list(c) for i in range(len(terms)))
+        for c in clauses
+    )
+
+
+def _scan(
+    records: list[dict[str, Any]], query: str, **where: str
+) -> set[tuple[str, int]]:
+    """Brute-force search over the latest record of each conversation."""
+    latest = {r["conversation_id"]: r for r in records}
+    clauses = parse_query(query)
+    return {
+        (cid, i)
+        for cid, record in latest.items()
+        if all(record[k] == v for k, v in where.items() if k != "role")
+        for i, message in enumerate(record["messages"])
+        if where.get("role") in (None, message["role"])
+        and _matches(message["content"], clauses)
+    }
+
+
+def _hits(index: TranscriptIndex, query: str, **where: str) -> set[tuple[str, int]]:
+    return {
+        (hit.conversation_id, hit.message_index)
+        for hit in index.search(query, limit=None, **where)
+    }
+
+
+@pytest.mark.parametrize(
+    ("query", "where"),
+    [
+        ("pain", {}),
+        ('"chest pain"', {}),
+        ('"shortness of breath" aspirin', {}),
+        ("fever", {"role": "patient"}),
+        ("cough", {"task_type": "treatment", "patient_id": "patient-2"}),
+    ],
+)
+def test_index_matches_a_linear_scan(
+    tmp_path: Path, query: str, where: dict[str, str]
+) -> None:
+    records = _transcripts(200, seed=2)
+    # Supersede some conversations and spread them over several segments.
+    records += [{**r, "messages": r["messages"][::-1]} for r in records[:20]]
+    with TranscriptIndex(tmp_path / "index", max_segments=3) as index:
+        for start in range(0, len(records), 40):
+            index.add(records[start : start + 40])
+
+        assert _hits(index, query, **where) == _scan(records, query, **where)
+        index.merge()
+        assert _hits(index, query, **where) == _scan(records, query, **where)
+
+
+def test_index_update_resumes_from_the_store(tmp_path: Path) -> None:
+    records = _transcripts(60, seed=3)
+    with TranscriptStore(tmp_path / "store") as store:
+        for record in records[:30]:
+            store.append(record)
+        with TranscriptIndex(tmp_path / "index") as index:
+            assert index.update(tmp_path / "store") == 30
+            assert index.update(tmp_path / "store") == 0
+
+        for record in records[30:]:
+            store.append(record)
+
+    with TranscriptIndex(tmp_path / "index") as index:
+        assert index.update(tmp_path / "store") == 30
+        assert _hits(index, "insulin") == _scan(records, "insulin")
+        assert len(index) == sum(len(r["messages"]) for r in records)
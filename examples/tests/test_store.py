@@ -0,0 +1,78 @@
+"""The append-only transcript store."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cli.store import TranscriptStore
+
+
+def _transcripts(n: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "conversation_id": f"conv-{i}",
+            "patient_id": f"patient-{i % 7}",
+            "messages": [
+                {"role": "patient", "content": "x" * rng.randint(10, 400)}
+                for _ in range(rng.randint(2, 8))
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def test_store_returns_the_latest_record_per_conversation(tmp_path: Path) -> None:
+    records = _transcripts(50, seed=1)
+    with TranscriptStore(tmp_path, segment_bytes=4096) as store:
+        for record in records:
+            store.append(record)
+        final = {**records[3], "messages": records[3]["messages"][:1]}
+        store.append(final)
+
+        assert len(store) == 50
+        assert "conv-3" in store and "missing" not in store
+        assert store.get("conv-3") == final
+        assert store.get("conv-4") == records[4]
+        assert [r["conversation_id"] for r in store] == [
+            *(f"conv-{i}" for i in range(50) if i != 3),
+            "conv-3",
+        ]
+        assert len(list(store.scan())) == 51
+        with pytest.raises(KeyError):
+            store.get("missing")
+
+    assert len(list(tmp_path.glob("segment-*.log"))) > 1
+
+
+def test_store_reopens_and_sees_other_writers(tmp_path: Path) -> None:
+    records = _transcripts(10, seed=2)
+    with TranscriptStore(tmp_path) as writer, TranscriptStore(tmp_path) as reader:
+        writer.append(records[0])
+        assert reader.get("conv-0") == records[0]
+        writer.append(records[1])
+        assert len(reader) == 2
+
+    with TranscriptStore(tmp_path) as store:
+        for record in records[2:]:
+            store.append(record)
+        assert [r["conversation_id"] for r in store] == [
+            r["conversation_id"] for r in records
+        ]
+
+
+def test_torn_write_at_the_end_is_ignored_by_scan(tmp_path: Path) -> None:
+    records = _transcripts(3, seed=3)
+    with TranscriptStore(tmp_path) as store:
+        for record in records:
+            store.append(record)
+    segment = next(tmp_path.glob("segment-*.log"))
+    with segment.open("ab") as fh:
+        fh.write(b"\x10\x00\x00\x00partial")
+
+    with TranscriptStore(tmp_path) as store:
+        assert list(store.scan()) == records
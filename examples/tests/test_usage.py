@@ -0,0 +1,68 @@
+"""Token and cost accounting, and the budget that stops an interview."""
+
+from __future__ import annotations
+
+from langchain_core.messages import AIMessage
+
+from cli.usage import Budget, Pricing, UsageLedger, token_counts
+
+
+def _reply(prompt: int, completion: int) -> AIMessage:
+    return AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": prompt,
+            "output_tokens": completion,
+            "total_tokens": prompt + completion,
+        },
+    )
+
+
+def test_token_counts_fall_back_to_openai_token_usage() -> None:
+    assert token_counts(_reply(10, 3)) == (10, 3)
+    legacy = AIMessage(
+        content="ok",
+        response_metadata={"token_usage": {"prompt_tokens": 7, "completion_tokens": 2}},
+    )
+    assert token_counts(legacy) == (7, 2)
+    assert token_counts(AIMessage(content="ok")) == (0, 0)
+
+
+def test_ledger_prices_and_totals_turns() -> None:
+    ledger = UsageLedger(Pricing(prompt_per_million=2.0, completion_per_million=8.0))
+    ledger.record(1, _reply(1000, 100), 0.5)
+    ledger.record("wrap-up", _reply(2000, 200), 1.5)
+
+    assert ledger.total_tokens == 3300
+    assert ledger.cost == (3000 * 2.0 + 300 * 8.0) / 1_000_000
+    totals = ledger.to_dict()["total"]
+    assert totals["calls"] == 2
+    assert totals["completion_tokens_per_s"] == 150.0
+    assert ledger.to_dict()["turns"][1]["turn"] == "wrap-up"
+
+
+def test_budget_reserves_room_for_another_turn() -> None:
+    ledger = UsageLedger()
+    budget = Budget(max_tokens=1000)
+    last = ledger.record(1, _reply(400, 100), 0.1)
+    assert budget.allows(ledger, last)
+
+    last = ledger.record(2, _reply(250, 50), 0.1)  # 800 used
+    assert not budget.exhausted(ledger)
+    assert not budget.allows(ledger, last)
+
+    ledger.record(3, _reply(200, 0), 0.1)
+    assert budget.exhausted(ledger)
+
+
+def test_budget_cost_and_compaction_limits() -> None:
+    ledger = UsageLedger(Pricing(prompt_per_million=1.0))
+    last = ledger.record(1, _reply(600, 0), 0.1)
+    assert Budget(max_cost=0.0006).exhausted(ledger)
+    assert not Budget(max_cost=0.001).allows(ledger, last)
+    assert Budget(max_cost=0.002).allows(ledger, last)
+    assert not Budget().exhausted(ledger)
+
+    assert Budget(compact_at=600).should_compact(last)
+    assert not Budget(compact_at=601).should_compact(last)
+    assert not Budget().should_compact(last)
@@ -0,0 +1,82 @@
+"""Guard the import-time cost of the package and the example CLI.
+
+Runs ``python -X importtime`` on an import statement and sums the self time
+of every module it loads that a bare interpreter does not. Fails if the total
+exceeds ``--budget-ms`` or if any ``--forbid`` module was imported.
+
+Usage::
+
+    python scripts/check_import_time.py virtual_clinic --budget-ms 50 \\
+        --forbid httpx --forbid pydantic
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Return ``{module: self_time_us}`` for everything ``code`` imports."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"{code!r} failed:\n{proc.stderr[-2000:]}")
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(1))
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="+", help="Modules to import.")
+    parser.add_argument("--budget-ms", type=float, required=True)
+    parser.add_argument(
+        "--forbid",
+        action="append",
+        default=[],
+        help="Top-level module that must not be imported (repeatable).",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Report the best of N runs.")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest modules.")
+    args = parser.parse_args()
+
+    baseline = set(import_times("pass"))
+    code = "; ".join(f"import {m}" for m in args.modules)
+    best: dict[str, int] | None = None
+    for _ in range(args.runs):
+        extra = {m: t for m, t in import_times(code).items() if m not in baseline}
+        if best is None or sum(extra.values()) < sum(best.values()):
+            best = extra
+    assert best is not None
+
+    total_ms = sum(best.values()) / 1000
+    print(f"{code}: {total_ms:.1f} ms across {len(best)} modules (budget {args.budget_ms:g} ms)")
+    for module, us in sorted(best.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {module}")
+
+    failed = False
+    forbidden = sorted(
+        m for m in best if m.split(".")[0] in set(args.forbid)
+    )
+    if forbidden:
+        print(f"FAIL: imported forbidden modules: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms exceeds the {args.budget_ms:g} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
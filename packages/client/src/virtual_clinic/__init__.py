@@ -25,45 +25,132 @@ Quick start::
     print(reply.content)
 """
 
-from .client import VirtualClinic
-from .exceptions import (
-    APIError,
-    AuthenticationError,
-    ConnectionError,
-    ForbiddenError,
-    NotFoundError,
-    ServerError,
-    ValidationError,
-    VirtualClinicError,
-)
-from .models import (
-    Allergy,
-    AssistantMessage,
-    CarePlan,
-    Condition,
-    ConversationSummary,
-    ConversationWithMessages,
-    CreatedConversation,
-    EHRSummary,
-    Encounter,
-    HealthStatus,
-    Immunization,
-    Medication,
-    Message,
-    MessageRole,
-    Observation,
-    PaginatedResponse,
-    Pagination,
-    Patient,
-    PatientDetail,
-    PatientSummary,
-    Procedure,
-    TaskType,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import VirtualClinic
+    from .deadline import Deadline
+    from .ehr_changes import ehr_fingerprint, merge_changes
+    from .ehr_index import EHRIndex
+    from .ehr_vocab import CompactPatient, CompactRecords, Vocabulary
+    from .exceptions import (
+        APIError,
+        AuthenticationError,
+        CircuitOpenError,
+        ConnectionError,
+        DeadlineExceededError,
+        ForbiddenError,
+        NotFoundError,
+        ServerError,
+        ValidationError,
+        VirtualClinicError,
+    )
+    from .models import (
+        Allergy,
+        AssistantMessage,
+        CarePlan,
+        Condition,
+        ConversationSpec,
+        ConversationSummary,
+        ConversationWithMessages,
+        CreatedConversation,
+        EHRSummary,
+        Encounter,
+        HealthStatus,
+        Immunization,
+        Medication,
+        Message,
+        MessageRole,
+        Observation,
+        PaginatedResponse,
+        Pagination,
+        Patient,
+        PatientChanges,
+        PatientDetail,
+        PatientSummary,
+        Procedure,
+        TaskType,
+    )
+    from .metrics import HealthMonitor, RequestMetrics
+    from .policies import CircuitBreakerPolicy, HedgePolicy, TimeoutPolicy
+    from .roster import RosterIndex
+
+# Public names are imported on first access (PEP 562), so ``import
+# virtual_clinic`` stays cheap: httpx and Pydantic are only loaded once a
+# client, model or helper is actually used.
+_LAZY_IMPORTS: dict[str, str] = {
+    "VirtualClinic": "client",
+    "Deadline": "deadline",
+    "ehr_fingerprint": "ehr_changes",
+    "merge_changes": "ehr_changes",
+    "EHRIndex": "ehr_index",
+    "CompactPatient": "ehr_vocab",
+    "CompactRecords": "ehr_vocab",
+    "Vocabulary": "ehr_vocab",
+    "APIError": "exceptions",
+    "AuthenticationError": "exceptions",
+    "CircuitOpenError": "exceptions",
+    "ConnectionError": "exceptions",
+    "DeadlineExceededError": "exceptions",
+    "ForbiddenError": "exceptions",
+    "NotFoundError": "exceptions",
+    "ServerError": "exceptions",
+    "ValidationError": "exceptions",
+    "VirtualClinicError": "exceptions",
+    "Allergy": "models",
+    "AssistantMessage": "models",
+    "CarePlan": "models",
+    "Condition": "models",
+    "ConversationSpec": "models",
+    "ConversationSummary": "models",
+    "ConversationWithMessages": "models",
+    "CreatedConversation": "models",
+    "EHRSummary": "models",
+    "Encounter": "models",
+    "HealthStatus": "models",
+    "Immunization": "models",
+    "Medication": "models",
+    "Message": "models",
+    "MessageRole": "models",
+    "Observation": "models",
+    "PaginatedResponse": "models",
+    "Pagination": "models",
+    "Patient": "models",
+    "PatientChanges": "models",
+    "PatientDetail": "models",
+    "PatientSummary": "models",
+    "Procedure": "models",
+    "TaskType": "models",
+    "HealthMonitor": "metrics",
+    "RequestMetrics": "metrics",
+    "CircuitBreakerPolicy": "policies",
+    "HedgePolicy": "policies",
+    "TimeoutPolicy": "policies",
+    "RosterIndex": "roster",
+}
 
 __all__ = [
     # Client
     "VirtualClinic",
+    # Policies
+    "TimeoutPolicy",
+    "HedgePolicy",
+    "CircuitBreakerPolicy",
+    "Deadline",
+    # Monitoring
+    "HealthMonitor",
+    "RequestMetrics",
+    # EHR helpers
+    "EHRIndex",
+    "RosterIndex",
+    "merge_changes",
+    "ehr_fingerprint",
+    "CompactPatient",
+    "CompactRecords",
+    "Vocabulary",
     # Exceptions
     "VirtualClinicError",
     "APIError",
@@ -73,12 +160,15 @@ __all__ = [
     "ValidationError",
     "ServerError",
     "ConnectionError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
     # Models — Health
     "HealthStatus",
     # Models — Patients
     "PatientSummary",
     "Patient",
     "PatientDetail",
+    "PatientChanges",
     "EHRSummary",
     "Condition",
     "Medication",
@@ -92,6 +182,7 @@ __all__ = [
     "ConversationSummary",
     "ConversationWithMessages",
     "CreatedConversation",
+    "ConversationSpec",
     "Message",
     "AssistantMessage",
     # Models — Shared
@@ -103,3 +194,16 @@ __all__ = [
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
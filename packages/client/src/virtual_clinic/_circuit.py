@@ -0,0 +1,141 @@
+"""Per-endpoint circuit breaker with a ``health()`` half-open probe."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from .exceptions import CircuitOpenError
+from .models import HealthStatus
+from .policies import ENDPOINTS, CircuitBreakerPolicy
+
+
+class _Circuit:
+    """Rolling call outcomes and open/closed state for one endpoint."""
+
+    __slots__ = ("calls", "bad", "open_until")
+
+    def __init__(self) -> None:
+        self.calls: deque[tuple[float, bool]] = deque()
+        self.bad = 0
+        self.open_until: float | None = None
+
+    def prune(self, cutoff: float) -> None:
+        while self.calls and self.calls[0][0] < cutoff:
+            _, bad = self.calls.popleft()
+            self.bad -= bad
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.bad = 0
+        self.open_until = None
+
+
+class CircuitBreaker:
+    """Track call outcomes per endpoint and fail fast while a circuit is open.
+
+    Args:
+        policy: Thresholds and timings.
+        probe: Called (by one thread at a time) when an open circuit's
+            cooldown has elapsed. Returns ``True`` if the API is healthy.
+    """
+
+    def __init__(self, policy: CircuitBreakerPolicy, probe: Callable[[], bool]) -> None:
+        self.policy = policy
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._circuits: dict[str, _Circuit] = {}
+
+    def before(self, endpoint: str) -> None:
+        """Raise :class:`CircuitOpenError` if ``endpoint`` should not be called."""
+        with self._lock:
+            remaining = self._remaining(endpoint)
+        if remaining is None:
+            return
+        if remaining > 0:
+            raise CircuitOpenError(endpoint, remaining)
+
+        # Half-open: one caller probes, everyone else keeps failing fast.
+        if not self._probe_lock.acquire(blocking=False):
+            raise CircuitOpenError(endpoint, 0.0)
+        try:
+            with self._lock:
+                remaining = self._remaining(endpoint)
+            if remaining is None:
+                return
+            healthy = self._probe()
+        finally:
+            self._probe_lock.release()
+
+        with self._lock:
+            now = time.monotonic()
+            if healthy:
+                for circuit in self._circuits.values():
+                    if circuit.open_until is not None and circuit.open_until <= now:
+                        circuit.reset()
+                return
+            circuit = self._circuit(endpoint)
+            circuit.open_until = now + self.policy.cooldown
+        raise CircuitOpenError(endpoint, self.policy.cooldown)
+
+    def record(self, endpoint: str, *, failed: bool, seconds: float) -> None:
+        """Record the outcome of a call that was allowed through."""
+        slow = self.policy.slow_call_seconds
+        bad = failed or (slow is not None and seconds > slow)
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.open_until is not None:
+                return
+            now = time.monotonic()
+            circuit.calls.append((now, bad))
+            circuit.bad += bad
+            circuit.prune(now - self.policy.window_seconds)
+            total = len(circuit.calls)
+            if (
+                total >= self.policy.min_calls
+                and circuit.bad / total >= self.policy.failure_rate
+            ):
+                circuit.open_until = now + self.policy.cooldown
+
+    def trip_all(self) -> None:
+        """Open every endpoint's circuit, e.g. after a failed health check."""
+        with self._lock:
+            open_until = time.monotonic() + self.policy.cooldown
+            for endpoint in ENDPOINTS:
+                if endpoint != "health":
+                    self._circuit(endpoint).open_until = open_until
+
+    def is_healthy(self, status: HealthStatus) -> bool:
+        """Return whether a health report is good enough to close a circuit."""
+        return (
+            status.status == "ok"
+            and status.database == "connected"
+            and (
+                status.db_latency_ms is None
+                or status.db_latency_ms <= self.policy.max_db_latency_ms
+            )
+        )
+
+    def state(self, endpoint: str) -> str:
+        """Return ``"closed"``, ``"open"`` or ``"half-open"`` for ``endpoint``."""
+        with self._lock:
+            remaining = self._remaining(endpoint)
+        if remaining is None:
+            return "closed"
+        return "open" if remaining > 0 else "half-open"
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def _remaining(self, endpoint: str) -> float | None:
+        """Seconds left open, ``<= 0`` if half-open, ``None`` if closed."""
+        circuit = self._circuits.get(endpoint)
+        if circuit is None or circuit.open_until is None:
+            return None
+        return circuit.open_until - time.monotonic()
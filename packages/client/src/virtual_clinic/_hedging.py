@@ -0,0 +1,73 @@
+"""Latency tracking and hedged execution of idempotent requests."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import TypeVar
+
+from .policies import HedgePolicy
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies, per endpoint."""
+
+    def __init__(self, window: int) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def percentile(self, endpoint: str, q: float) -> tuple[float, int]:
+        """Return ``(latency, sample_count)`` at percentile ``q`` (0-100)."""
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if not samples:
+            return 0.0, 0
+        rank = min(len(samples) - 1, max(0, round(q / 100 * (len(samples) - 1))))
+        return samples[rank], len(samples)
+
+
+def hedge_delay(
+    policy: HedgePolicy, tracker: LatencyTracker, endpoint: str
+) -> float | None:
+    """Return how long to wait before hedging, or ``None`` to not hedge."""
+    if endpoint not in policy.endpoints:
+        return None
+    latency, count = tracker.percentile(endpoint, policy.percentile)
+    if count < policy.min_samples:
+        return None
+    return min(policy.max_delay, max(policy.min_delay, latency))
+
+
+def hedged_call(executor: Executor, fn: Callable[[], T], delay: float) -> T:
+    """Run ``fn``, starting a second copy if the first is slower than ``delay``.
+
+    The first attempt to succeed wins. If every attempt fails, the primary
+    attempt's exception is raised. The losing attempt is left to finish in
+    the background and its result is discarded.
+    """
+    primary = executor.submit(fn)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    attempts: list[Future[T]] = [primary, executor.submit(fn)]
+    pending = set(attempts)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+    return primary.result()
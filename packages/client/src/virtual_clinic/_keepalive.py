@@ -0,0 +1,60 @@
+"""Background thread that keeps pooled connections from going idle.
+
+httpx closes pooled connections that have been idle for ``keepalive_expiry``
+(5 seconds by default), and servers and load balancers drop idle ones too.
+During an interview, the doctor LLM often thinks for longer than that
+between turns, so the next ``send_message`` pays for a new TCP and TLS
+handshake. Pinging the API more often than connections expire keeps them
+open.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+
+class Keepalive:
+    """Call ``ping`` every ``interval`` seconds until stopped.
+
+    Errors raised by ``ping`` are ignored: a failed ping only means the next
+    request may have to reconnect. Also drives other periodic client work,
+    such as :class:`~virtual_clinic.HealthMonitor` checks. ``on_stop`` is
+    called on the thread once it stops, to release what the pings use.
+    """
+
+    def __init__(
+        self,
+        ping: Callable[[], object],
+        interval: float,
+        *,
+        name: str = "virtual-clinic-keepalive",
+        on_stop: Callable[[], object] | None = None,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.interval = interval
+        self._ping = ping
+        self._on_stop = on_stop
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop pinging and wait for an in-flight ping to finish."""
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    self._ping()
+                except Exception:
+                    pass
+        finally:
+            if self._on_stop is not None:
+                self._on_stop()
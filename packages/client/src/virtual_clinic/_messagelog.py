@@ -0,0 +1,126 @@
+"""Client-side cache of conversation messages for incremental fetching.
+
+Each conversation's messages are kept in a :class:`MessageLog`, in server
+order and indexed by id. The last cached message id is the cursor for the
+next ``GET /api/conversations/{id}?after=...``, so polling a conversation
+only transfers the messages that are new since the previous poll.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from .models import Message
+
+
+def parse_timestamp(value: str) -> datetime | None:
+    """Parse an ISO 8601 timestamp as the API writes it (``Z`` suffix allowed).
+
+    Naive timestamps are taken as UTC. Returns ``None`` if ``value`` is not a
+    timestamp.
+    """
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class MessageLog:
+    """The cached messages of one conversation."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._messages: list[Message] = []
+        self._positions: dict[str, int] = {}
+
+    @property
+    def last_id(self) -> str | None:
+        """Id of the newest cached message, the cursor for the next fetch."""
+        with self._lock:
+            return self._messages[-1].id if self._messages else None
+
+    def merge(self, messages: list[Message]) -> None:
+        """Append the messages not cached yet, keeping the server's order.
+
+        Messages already cached (by id) are skipped, so a full history from a
+        server that ignores ``after`` merges cleanly.
+        """
+        with self._lock:
+            for message in messages:
+                if message.id in self._positions:
+                    continue
+                self._positions[message.id] = len(self._messages)
+                self._messages.append(message)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._messages.clear()
+            self._positions.clear()
+
+    def after(self, cursor: str | None) -> list[Message]:
+        """Return the cached messages after ``cursor``.
+
+        Args:
+            cursor: ``None`` for all messages, a message id for the messages
+                after it, or an ISO 8601 timestamp for the messages created
+                at or after it.
+
+        Raises:
+            ValueError: If ``cursor`` is neither a cached message id nor a
+                timestamp.
+        """
+        with self._lock:
+            if cursor is None:
+                return list(self._messages)
+            position = self._positions.get(cursor)
+            if position is not None:
+                return self._messages[position + 1 :]
+            since = parse_timestamp(cursor)
+            if since is None:
+                raise ValueError(
+                    f"after={cursor!r} is neither a message id in this "
+                    "conversation nor an ISO 8601 timestamp"
+                )
+            # Messages are ordered by creation time: scan back from the end.
+            start = len(self._messages)
+            while start > 0:
+                created = parse_timestamp(self._messages[start - 1].created_at)
+                if created is not None and created < since:
+                    break
+                start -= 1
+            return self._messages[start:]
+
+
+class MessageCache:
+    """Least-recently-used :class:`MessageLog` per conversation.
+
+    Args:
+        max_conversations: Number of conversations kept; the least recently
+            used log is dropped beyond it.
+    """
+
+    def __init__(self, max_conversations: int = 256) -> None:
+        self._max = max_conversations
+        self._lock = threading.Lock()
+        self._logs: OrderedDict[str, MessageLog] = OrderedDict()
+
+    def log(self, conversation_id: str) -> MessageLog:
+        """Return the log of ``conversation_id``, creating an empty one."""
+        with self._lock:
+            log = self._logs.get(conversation_id)
+            if log is None:
+                log = self._logs[conversation_id] = MessageLog()
+                while len(self._logs) > self._max:
+                    self._logs.popitem(last=False)
+            else:
+                self._logs.move_to_end(conversation_id)
+            return log
+
+    def forget(self, conversation_id: str) -> None:
+        with self._lock:
+            self._logs.pop(conversation_id, None)
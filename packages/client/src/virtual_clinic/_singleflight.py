@@ -0,0 +1,105 @@
+"""Single-flight coalescing of identical in-flight calls.
+
+When several threads ask for the same resource at the same time, only the
+first one (the *leader*) performs the call. The others block until it
+finishes and then receive the same result, or the same exception. Errors
+that only concern the leader (see ``retry_on``) make a follower try again
+instead.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class WaitTimeout(Exception):
+    """A follower stopped waiting for the leader's call to finish."""
+
+
+class _Call(Generic[T]):
+    """A call in flight, shared between the leader and its followers."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    Calls are only coalesced while one is in flight: as soon as the leader
+    returns, the key is forgotten and the next call performs a fresh
+    request. Nothing is cached.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[Any]] = {}
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], T],
+        *,
+        timeout: float | None = None,
+        retry_on: tuple[type[Exception], ...] = (),
+    ) -> T:
+        """Run ``fn`` unless a call with the same ``key`` is already running.
+
+        Only :class:`Exception` subclasses are passed on to followers. If the
+        leader is interrupted by anything else (e.g. ``KeyboardInterrupt`` in
+        its thread), or fails with one of ``retry_on``, its followers try
+        again, one of them as the new leader.
+
+        Args:
+            key: Identifies the call. Calls with equal keys are coalesced.
+            fn: The function to run if this thread becomes the leader.
+            timeout: Longest time to wait as a follower, in seconds.
+            retry_on: Exceptions that only concern the leader (e.g. its own
+                deadline running out) and are not passed on to followers.
+
+        Returns:
+            The leader's return value.
+
+        Raises:
+            WaitTimeout: If this thread was a follower and the leader did not
+                finish within ``timeout``.
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if call is None:
+                    call = self._calls[key] = _Call[T]()
+            if leader:
+                break
+
+            wait = None if expires is None else max(0.0, expires - time.monotonic())
+            if not call.done.wait(wait):
+                raise WaitTimeout(f"gave up waiting for an identical call ({key!r})")
+            if call.error is None:
+                return call.result  # type: ignore[return-value]
+            if isinstance(call.error, Exception) and not isinstance(
+                call.error, retry_on
+            ):
+                raise call.error
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
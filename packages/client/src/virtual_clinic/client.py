@@ -19,31 +19,57 @@ Usage::
 
 from __future__ import annotations
 
-from typing import Any
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, TypeVar
 
 import httpx
 
+from ._circuit import CircuitBreaker
 from ._constants import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, USER_AGENT
+from ._hedging import LatencyTracker, hedge_delay, hedged_call
+from ._keepalive import Keepalive
+from ._messagelog import MessageCache
+from ._singleflight import SingleFlight, WaitTimeout
+from .deadline import Deadline
+from .ehr_changes import merge_changes
+from .metrics import RequestMetrics
 from .exceptions import (
     APIError,
     AuthenticationError,
     ConnectionError,
+    DeadlineExceededError,
     ForbiddenError,
     NotFoundError,
     ServerError,
     ValidationError,
+    VirtualClinicError,
 )
 from .models import (
     AssistantMessage,
+    ConversationSpec,
     ConversationSummary,
     ConversationWithMessages,
     CreatedConversation,
     HealthStatus,
+    Message,
     PaginatedResponse,
+    PatientChanges,
     PatientDetail,
     PatientSummary,
     TaskType,
 )
+from .policies import (
+    DEFAULT_TIMEOUT_POLICIES,
+    CircuitBreakerPolicy,
+    Endpoint,
+    HedgePolicy,
+    TimeoutPolicy,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -84,6 +110,239 @@ def _raise_for_status(response: httpx.Response) -> None:
     raise APIError(status_code=status, message=message, details=details, body=body)
 
 
+def _clamp(timeout: httpx.Timeout, seconds: float) -> httpx.Timeout:
+    """Cap every phase of ``timeout`` at ``seconds``."""
+    return httpx.Timeout(
+        connect=min(timeout.connect or seconds, seconds),
+        read=min(timeout.read or seconds, seconds),
+        write=min(timeout.write or seconds, seconds),
+        pool=min(timeout.pool or seconds, seconds),
+    )
+
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+def _fan_out(
+    fn: Callable[[U], T],
+    items: Sequence[U],
+    concurrency: int,
+    pool: ThreadPoolExecutor | None = None,
+) -> list[T | Exception]:
+    """Call ``fn`` on every item from up to ``concurrency`` threads.
+
+    Results are in input order; where a call raised, its slot holds the
+    exception instead. Each call runs in a copy of the caller's context, so an
+    active :class:`~virtual_clinic.Deadline` applies to it. The threads come
+    from ``pool`` if given (which is left running), else from a pool of their
+    own.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if not items:
+        return []
+
+    def run(item: U) -> T | Exception:
+        try:
+            return fn(item)
+        except Exception as exc:
+            return exc
+
+    owned = pool is None
+    if pool is None:
+        pool = ThreadPoolExecutor(
+            max_workers=min(concurrency, len(items)),
+            thread_name_prefix="virtual-clinic-fan-out",
+        )
+    try:
+        futures = [
+            pool.submit(contextvars.copy_context().run, run, item) for item in items
+        ]
+        return [future.result() for future in futures]
+    finally:
+        if owned:
+            # On Ctrl-C, drop the calls not started yet instead of waiting.
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Requester:
+    """Send requests over the shared connection pool and parse the responses.
+
+    Every request is tagged with its :data:`~virtual_clinic.policies.Endpoint`
+    name, which selects its timeout policy, whether it may be hedged, and
+    which circuit of the optional :class:`CircuitBreaker` it reports to.
+
+    When ``coalesce`` is enabled, identical GETs (same path and params) that
+    are in flight at the same time share a single request and its parsed
+    result. Callers therefore receive the *same* model instance and should
+    treat it as read-only.
+
+    Inside a :class:`~virtual_clinic.Deadline`, each request's timeouts are
+    capped at the time remaining, and requests fail fast with
+    :class:`DeadlineExceededError` once it has passed.
+    """
+
+    _HEDGE_WORKERS = 100
+    """Hedging thread cap; matches httpx's default connection limit."""
+
+    def __init__(
+        self,
+        http: httpx.Client,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        timeouts: Mapping[str, TimeoutPolicy | float] | None = None,
+        hedge: HedgePolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        coalesce: bool = True,
+    ) -> None:
+        self._http = http
+        self.breaker = breaker
+        self.metrics = RequestMetrics()
+        self._flight = SingleFlight() if coalesce else None
+
+        policies = dict(DEFAULT_TIMEOUT_POLICIES)
+        for endpoint, policy in (timeouts or {}).items():
+            if not isinstance(policy, TimeoutPolicy):
+                policy = TimeoutPolicy.uniform(policy)
+            policies[endpoint] = policy
+        self._timeouts = {name: p.to_httpx() for name, p in policies.items()}
+        self._default_timeout = httpx.Timeout(timeout)
+
+        self._hedge = hedge
+        self._latency = LatencyTracker(hedge.window) if hedge is not None else None
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def timeout_for(self, endpoint: Endpoint) -> httpx.Timeout:
+        """Return the timeout applied to requests to ``endpoint``."""
+        return self._timeouts.get(endpoint, self._default_timeout)
+
+    def get(
+        self,
+        endpoint: Endpoint,
+        path: str,
+        parse: Callable[[Any], T],
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> T:
+        """``GET`` ``path`` and return ``parse(response.json())``."""
+        # Captured here: hedged attempts run on executor threads, which do not
+        # see this thread's active deadline.
+        deadline = Deadline.current()
+
+        def send() -> httpx.Response:
+            return self._send(endpoint, "GET", path, deadline=deadline, params=params)
+
+        def fetch() -> T:
+            delay = None
+            if self._hedge is not None and self._latency is not None:
+                delay = hedge_delay(self._hedge, self._latency, endpoint)
+            if delay is None:
+                response = send()
+            else:
+                response = hedged_call(self._hedge_executor(), send, delay)
+            return parse(response.json())
+
+        if self._flight is None:
+            return fetch()
+        key = (path, tuple(sorted((params or {}).items())))
+        # A follower waits for the leader's request no longer than its own
+        # deadline allows. The leader's deadline is its own: when that runs
+        # out, followers with time left send the request again.
+        timeout = None if deadline is None else deadline.remaining()
+        try:
+            return self._flight.do(
+                key, fetch, timeout=timeout, retry_on=(DeadlineExceededError,)
+            )
+        except WaitTimeout:
+            raise DeadlineExceededError(endpoint) from None
+
+    def post(
+        self,
+        endpoint: Endpoint,
+        path: str,
+        parse: Callable[[Any], T],
+        *,
+        json: dict[str, Any] | None = None,
+    ) -> T:
+        """``POST`` ``json`` to ``path`` and return ``parse(response.json())``."""
+        response = self._send(
+            endpoint, "POST", path, deadline=Deadline.current(), json=json
+        )
+        return parse(response.json())
+
+    def ping(self, path: str) -> None:
+        """``GET`` ``path`` as a request of its own, to open or refresh a connection.
+
+        Unlike :meth:`get`, the request is never coalesced or hedged, and it is
+        not reported to the circuit breaker.
+        """
+        self._send("health", "GET", path)
+
+    def close(self) -> None:
+        """Stop the hedging threads, abandoning any losing attempts."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _send(
+        self,
+        endpoint: Endpoint,
+        method: str,
+        path: str,
+        *,
+        deadline: Deadline | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send one request, enforcing the circuit breaker and recording latency."""
+        timeout = self.timeout_for(endpoint)
+        if deadline is not None:
+            if deadline.expired:
+                raise DeadlineExceededError(endpoint)
+            timeout = _clamp(timeout, deadline.remaining())
+
+        breaker = self.breaker if endpoint != "health" else None
+        if breaker is not None:
+            breaker.before(endpoint)
+
+        started = time.perf_counter()
+        failed: bool | None = None
+        outcome = "error"
+        try:
+            response = self._http.request(method, path, timeout=timeout, **kwargs)
+            outcome = f"{response.status_code // 100}xx"
+            failed = response.status_code >= 500
+            _raise_for_status(response)
+        except httpx.TransportError as exc:
+            timed_out = isinstance(exc, httpx.TimeoutException)
+            if timed_out and deadline is not None and deadline.expired:
+                # Our own budget ran out; not a sign of an unhealthy endpoint.
+                outcome = "deadline"
+                raise DeadlineExceededError(endpoint) from exc
+            if timed_out:
+                outcome = "timeout"
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.metrics.observe(endpoint, outcome, elapsed)
+            if breaker is not None and failed is not None:
+                breaker.record(endpoint, failed=failed, seconds=elapsed)
+
+        if self._latency is not None:
+            self._latency.record(endpoint, elapsed)
+        return response
+
+    def _hedge_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._HEDGE_WORKERS,
+                    thread_name_prefix="virtual-clinic-hedge",
+                )
+            return self._executor
+
+
 # ---------------------------------------------------------------------------
 # Resource classes
 # ---------------------------------------------------------------------------
@@ -95,8 +354,8 @@ class PatientsResource:
     Requires an **admin** token.
     """
 
-    def __init__(self, http: httpx.Client) -> None:
-        self._http = http
+    def __init__(self, requester: _Requester) -> None:
+        self._requester = requester
 
     def list(
         self, *, page: int = 1, limit: int = 20
@@ -115,10 +374,12 @@ class PatientsResource:
             ForbiddenError: If the token does not have admin privileges.
         """
         params: dict[str, Any] = {"page": page, "limit": limit}
-        response = self._http.get("/api/patients", params=params)
-        _raise_for_status(response)
-        data = response.json()
-        return PaginatedResponse[PatientSummary].model_validate(data)
+        return self._requester.get(
+            "patients.list",
+            "/api/patients",
+            PaginatedResponse[PatientSummary].model_validate,
+            params=params,
+        )
 
     def get(self, patient_id: str) -> PatientDetail:
         """Get a patient's full profile with complete EHR data.
@@ -134,17 +395,99 @@ class PatientsResource:
             ForbiddenError: If the token does not have admin privileges.
             NotFoundError: If the patient does not exist.
         """
-        response = self._http.get(f"/api/patients/{patient_id}")
-        _raise_for_status(response)
-        data = response.json()
-        return PatientDetail.model_validate(data["data"])
+        return self._requester.get(
+            "patients.get",
+            f"/api/patients/{patient_id}",
+            lambda data: PatientDetail.model_validate(data["data"]),
+        )
+
+    def get_changes(
+        self, patient_id: str, *, since: str | datetime
+    ) -> PatientChanges:
+        """Get the patient's EHR records that changed at or after ``since``.
+
+        A record counts as changed when its ``start``, ``stop`` or ``date``
+        falls at or after ``since``; records edited without a new date are
+        not included. Demographics, the summary and a fingerprint of the
+        full EHR are always included. Apply the result to a cached profile with
+        :func:`~virtual_clinic.merge_changes`, or use :meth:`refresh`.
+
+        Args:
+            patient_id: The patient's UUID.
+            since: ISO 8601 timestamp or datetime (naive means UTC),
+                typically the ``until`` of the previous call.
+
+        Returns:
+            A :class:`PatientChanges` with the changed records.
+
+        Raises:
+            AuthenticationError: If the token is missing or invalid.
+            ForbiddenError: If the token does not have admin privileges.
+            NotFoundError: If the patient does not exist.
+            ValidationError: If ``since`` is not a timestamp.
+        """
+        if isinstance(since, datetime):
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            since = since.isoformat()
+        return self._requester.get(
+            "patients.get_changes",
+            f"/api/patients/{patient_id}/changes",
+            lambda data: PatientChanges.model_validate(data["data"]),
+            params={"since": since},
+        )
+
+    def refresh(
+        self, detail: PatientDetail, *, since: str | datetime
+    ) -> tuple[PatientDetail, str]:
+        """Bring a cached profile up to date, downloading only what changed.
+
+        Falls back to a full :meth:`get` when the merged profile disagrees
+        with the server's counts or fingerprint (e.g. a record was edited
+        without a new date, or a reseed rewrote the patient's history).
+
+        Args:
+            detail: The cached profile.
+            since: When ``detail`` was fetched (the ``until`` returned by the
+                previous refresh).
+
+        Returns:
+            ``(detail, until)``: the refreshed profile and the ``since`` to
+            pass next time.
+        """
+        changes = self.get_changes(detail.patient.id, since=since)
+        try:
+            return merge_changes(detail, changes), changes.until
+        except ValueError:
+            return self.get(detail.patient.id), changes.until
+
+    def get_many(
+        self, patient_ids: Iterable[str], *, concurrency: int = 16
+    ) -> list[PatientDetail | Exception]:
+        """Get many patients' profiles concurrently.
+
+        Args:
+            patient_ids: The patients' UUIDs.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            One result per ID, in the same order: the :class:`PatientDetail`,
+            or the exception its request raised (e.g. :class:`NotFoundError`).
+        """
+        return _fan_out(self.get, list(patient_ids), concurrency)
 
 
 class ConversationsResource:
-    """Methods for the ``/api/conversations`` endpoints."""
+    """Methods for the ``/api/conversations`` endpoints.
 
-    def __init__(self, http: httpx.Client) -> None:
-        self._http = http
+    Messages seen by :meth:`get` and :meth:`get_messages` are cached per
+    conversation (the most recently used 256), so :meth:`get_messages` only
+    downloads what is new.
+    """
+
+    def __init__(self, requester: _Requester) -> None:
+        self._requester = requester
+        self._messages = MessageCache()
 
     def list(
         self,
@@ -171,10 +514,12 @@ class ConversationsResource:
         if task_type is not None:
             params["taskType"] = task_type
 
-        response = self._http.get("/api/conversations", params=params)
-        _raise_for_status(response)
-        data = response.json()
-        return PaginatedResponse[ConversationSummary].model_validate(data)
+        return self._requester.get(
+            "conversations.list",
+            "/api/conversations",
+            PaginatedResponse[ConversationSummary].model_validate,
+            params=params,
+        )
 
     def create(
         self,
@@ -204,10 +549,54 @@ class ConversationsResource:
         if metadata is not None:
             body["metadata"] = metadata
 
-        response = self._http.post("/api/conversations", json=body)
-        _raise_for_status(response)
-        data = response.json()
-        return CreatedConversation.model_validate(data["data"])
+        return self._requester.post(
+            "conversations.create",
+            "/api/conversations",
+            lambda data: CreatedConversation.model_validate(data["data"]),
+            json=body,
+        )
+
+    def create_many(
+        self,
+        specs: Iterable[ConversationSpec | tuple[str, TaskType]],
+        *,
+        concurrency: int = 16,
+    ) -> list[CreatedConversation | Exception]:
+        """Start many conversations concurrently.
+
+        One failed creation does not stop the others: each result is either
+        the :class:`CreatedConversation` or the exception its request raised
+        (e.g. :class:`NotFoundError` for an unknown patient). A tuple that is
+        not a valid spec gets pydantic's ``ValidationError`` in its slot.
+
+        Args:
+            specs: A :class:`ConversationSpec` or ``(patient_id, task_type)``
+                tuple per conversation.
+            concurrency: Maximum number of requests in flight at once.
+
+        Returns:
+            One result per spec, in the same order.
+
+        Example::
+
+            results = client.conversations.create_many(
+                [(pid, "diagnosis") for pid in patient_ids], concurrency=32
+            )
+            failed = [r for r in results if isinstance(r, Exception)]
+        """
+
+        def create(
+            spec: ConversationSpec | tuple[str, TaskType],
+        ) -> CreatedConversation:
+            if not isinstance(spec, ConversationSpec):
+                spec = ConversationSpec(patient_id=spec[0], task_type=spec[1])
+            return self.create(
+                patient_id=spec.patient_id,
+                task_type=spec.task_type,
+                metadata=spec.metadata,
+            )
+
+        return _fan_out(create, list(specs), concurrency)
 
     def get(self, conversation_id: str) -> ConversationWithMessages:
         """Retrieve a conversation with its full message history.
@@ -221,10 +610,62 @@ class ConversationsResource:
         Raises:
             NotFoundError: If the conversation does not exist.
         """
-        response = self._http.get(f"/api/conversations/{conversation_id}")
-        _raise_for_status(response)
-        data = response.json()
-        return ConversationWithMessages.model_validate(data["data"])
+        conversation = self._fetch(conversation_id)
+        self._messages.log(conversation_id).merge(conversation.messages)
+        return conversation
+
+    def get_messages(
+        self, conversation_id: str, *, after: str | None = None
+    ) -> list[Message]:
+        """Return a conversation's messages, fetching only the new ones.
+
+        The first call downloads the full history; later calls ask the server
+        only for the messages after the newest one cached, which keeps
+        polling a long conversation cheap. Against a server that does not
+        support ``after``, the full history is downloaded and deduplicated.
+
+        Args:
+            conversation_id: The conversation's UUID.
+            after: ``None`` for all messages, a message ID for the messages
+                after it, or an ISO 8601 timestamp for the messages created
+                at or after it.
+
+        Returns:
+            The matching :class:`Message` objects, oldest first.
+
+        Raises:
+            NotFoundError: If the conversation does not exist.
+            ValueError: If ``after`` is neither a message ID in this
+                conversation nor a timestamp.
+        """
+        log = self._messages.log(conversation_id)
+        cursor = log.last_id
+        if cursor is None:
+            conversation = self._fetch(conversation_id)
+        else:
+            try:
+                conversation = self._fetch(conversation_id, after=cursor)
+            except NotFoundError:
+                # The cursor message is gone (or the conversation is): start
+                # over so the caller gets the server's current answer.
+                log.clear()
+                conversation = self._fetch(conversation_id)
+        log.merge(conversation.messages)
+        return log.after(after)
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop the cached messages of a conversation."""
+        self._messages.forget(conversation_id)
+
+    def _fetch(
+        self, conversation_id: str, *, after: str | None = None
+    ) -> ConversationWithMessages:
+        return self._requester.get(
+            "conversations.get",
+            f"/api/conversations/{conversation_id}",
+            lambda data: ConversationWithMessages.model_validate(data["data"]),
+            params={"after": after} if after is not None else None,
+        )
 
     def send_message(self, conversation_id: str, *, content: str) -> AssistantMessage:
         """Send a message to the simulated patient and receive a response.
@@ -243,13 +684,12 @@ class ConversationsResource:
             ValidationError: If the message content is invalid.
             NotFoundError: If the conversation does not exist.
         """
-        response = self._http.post(
+        return self._requester.post(
+            "conversations.send_message",
             f"/api/conversations/{conversation_id}/messages",
+            lambda data: AssistantMessage.model_validate(data["data"]),
             json={"content": content},
         )
-        _raise_for_status(response)
-        data = response.json()
-        return AssistantMessage.model_validate(data["data"])
 
 
 # ---------------------------------------------------------------------------
@@ -263,8 +703,26 @@ class VirtualClinic:
     Args:
         base_url: The API's base URL (e.g. ``"https://virtual-clinic-api.vercel.app"``).
         token: A JWT bearer token provided by the workshop organizers.
-        timeout: Request timeout in seconds. Defaults to 60s to accommodate
-            LLM response generation.
+        timeout: Request timeout in seconds for endpoints without their own
+            timeout policy (by default only ``conversations.send_message``).
+            Defaults to 60s to accommodate LLM response generation.
+        timeouts: Per-endpoint :class:`TimeoutPolicy` overrides, keyed by
+            endpoint name (e.g. ``"patients.list"``). A float applies the
+            same value to every phase. Merged over
+            :data:`~virtual_clinic.policies.DEFAULT_TIMEOUT_POLICIES`.
+        hedge: Optional :class:`HedgePolicy`. When set, slow idempotent GETs
+            are retried in parallel after a percentile-based delay and the
+            first answer wins.
+        circuit_breaker: Optional :class:`CircuitBreakerPolicy`. When set,
+            endpoints with a high rolling error rate (or slow calls) fail
+            fast with :class:`CircuitOpenError` until :meth:`health` reports
+            the API as healthy again.
+        coalesce: Share one in-flight request between concurrent identical
+            GETs (same path and params), e.g. many threads fetching the same
+            patient. Coalesced callers receive the same model instance.
+        transport: Optional httpx transport to send requests through instead
+            of the network, e.g. :meth:`StandIn.transport()
+            <virtual_clinic.standin.StandIn.transport>` for load tests.
 
     Usage::
 
@@ -310,6 +768,11 @@ class VirtualClinic:
         base_url: str = DEFAULT_BASE_URL,
         token: str,
         timeout: float = DEFAULT_TIMEOUT,
+        timeouts: Mapping[str, TimeoutPolicy | float] | None = None,
+        hedge: HedgePolicy | None = None,
+        circuit_breaker: CircuitBreakerPolicy | None = None,
+        coalesce: bool = True,
+        transport: httpx.BaseTransport | None = None,
     ) -> None:
         self._http = httpx.Client(
             base_url=base_url,
@@ -318,28 +781,152 @@ class VirtualClinic:
                 "User-Agent": USER_AGENT,
             },
             timeout=timeout,
+            transport=transport,
+        )
+        self._requester = _Requester(
+            self._http,
+            timeout=timeout,
+            timeouts=timeouts,
+            hedge=hedge,
+            breaker=(
+                CircuitBreaker(circuit_breaker, probe=self._probe_health)
+                if circuit_breaker is not None
+                else None
+            ),
+            coalesce=coalesce,
         )
-        self.patients = PatientsResource(self._http)
+
+        self.patients = PatientsResource(self._requester)
         """Access patient endpoints (admin only). See :class:`PatientsResource`."""
 
-        self.conversations = ConversationsResource(self._http)
+        self.conversations = ConversationsResource(self._requester)
         """Access conversation endpoints. See :class:`ConversationsResource`."""
 
+        self.metrics = self._requester.metrics
+        """Counts and latencies of the requests sent. See :class:`RequestMetrics`."""
+
+        self._keepalive: Keepalive | None = None
+        self._keepalive_lock = threading.Lock()
+
     def health(self) -> HealthStatus:
         """Check API health and database connectivity.
 
         This endpoint is public and does not require authentication.
 
+        If a circuit breaker is configured, an unhealthy report (or a failed
+        check) opens every endpoint's circuit.
+
         Returns:
             A :class:`HealthStatus` with service status and database connectivity info.
         """
+        breaker = self._requester.breaker
         try:
-            response = self._http.get("/api/health")
-        except httpx.ConnectError as exc:
-            raise ConnectionError(str(exc)) from exc
+            status = self._requester.get(
+                "health", "/api/health", HealthStatus.model_validate
+            )
+        except (httpx.TransportError, ServerError) as exc:
+            if breaker is not None:
+                breaker.trip_all()
+            if isinstance(exc, httpx.ConnectError):
+                raise ConnectionError(str(exc)) from exc
+            raise
+
+        if breaker is not None and not breaker.is_healthy(status):
+            breaker.trip_all()
+        return status
+
+    def map(
+        self, fn: Callable[[U], T], items: Iterable[U], *, concurrency: int = 16
+    ) -> list[T | Exception]:
+        """Call ``fn`` on every item from a pool of worker threads.
+
+        For batches of blocking client calls, e.g.
+        ``client.map(client.conversations.get, conversation_ids)``. The
+        workers share this client's connection pool, and each runs in a copy
+        of the caller's context, so an active :class:`Deadline` applies.
+
+        Args:
+            fn: Called once per item.
+            items: The inputs.
+            concurrency: Maximum number of calls running at once.
+
+        Returns:
+            One result per item, in the same order: ``fn``'s return value, or
+            the exception it raised.
+        """
+        return _fan_out(fn, list(items), concurrency)
 
-        _raise_for_status(response)
-        return HealthStatus.model_validate(response.json())
+    def warmup(self, connections: int = 4) -> int:
+        """Open and prime pooled connections before the first real request.
+
+        Sends ``connections`` concurrent ``GET /api/health`` requests (never
+        coalesced), so DNS resolution and the TCP and TLS handshakes are paid
+        here rather than by the first calls of an interview. Connections are
+        only kept while less than httpx's keepalive expiry (5s) idle; see
+        :meth:`start_keepalive`.
+
+        Args:
+            connections: Number of connections to open (at most the pool's
+                connection limit, 100 by default, are opened at once).
+
+        Returns:
+            The number of requests that succeeded.
+        """
+        return self._ping(connections)
+
+    def _ping(self, connections: int, pool: ThreadPoolExecutor | None = None) -> int:
+        results = _fan_out(
+            lambda _: self._requester.ping("/api/health"),
+            range(connections),
+            max(1, connections),
+            pool,
+        )
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    def start_keepalive(self, interval: float = 4.0, *, connections: int = 1) -> None:
+        """Keep pooled connections hot with periodic health pings.
+
+        A daemon thread sends ``connections`` concurrent health pings, as
+        :meth:`warmup` does, every ``interval`` seconds until
+        :meth:`stop_keepalive` or :meth:`close`, so connections are not
+        dropped while the doctor LLM thinks between turns. Failed pings are
+        ignored. Calling it again replaces the running keepalive.
+
+        Args:
+            interval: Seconds between pings. Keep it below the connections'
+                idle expiry (5s for httpx, often 60s or more for servers).
+            connections: Connections to keep open, e.g. the number of
+                interviews run in parallel.
+        """
+        # One pool for the keepalive's lifetime rather than one per tick.
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, connections),
+            thread_name_prefix="virtual-clinic-keepalive",
+        )
+        keepalive = Keepalive(
+            lambda: self._ping(connections, pool), interval, on_stop=pool.shutdown
+        )
+        with self._keepalive_lock:
+            previous, self._keepalive = self._keepalive, keepalive
+        if previous is not None:
+            previous.stop()
+        keepalive.start()
+
+    def stop_keepalive(self) -> None:
+        """Stop the keepalive started by :meth:`start_keepalive`, if any."""
+        with self._keepalive_lock:
+            keepalive, self._keepalive = self._keepalive, None
+        if keepalive is not None:
+            keepalive.stop()
+
+    def _probe_health(self) -> bool:
+        """Half-open probe for the circuit breaker."""
+        try:
+            status = self.health()
+        except (VirtualClinicError, httpx.HTTPError):
+            return False
+        breaker = self._requester.breaker
+        return breaker is None or breaker.is_healthy(status)
 
     def close(self) -> None:
         """Close the underlying HTTP connection pool.
@@ -347,6 +934,8 @@ class VirtualClinic:
         It is good practice to call this when you are done using the client,
         or use the client as a context manager instead.
         """
+        self.stop_keepalive()
+        self._requester.close()
         self._http.close()
 
     def __enter__(self) -> VirtualClinic:
@@ -0,0 +1,375 @@
+"""Vectorized cohort statistics over many patients.
+
+A :class:`Cohort` encodes many :class:`~virtual_clinic.models.PatientDetail`
+objects once into integer-coded sparse matrices (patients x codes) for
+conditions, medications and procedures, plus flat arrays for demographics and
+encounter costs. Prevalence, group-by counts and co-occurrence are then
+single sparse matrix operations instead of Python loops.
+
+Requires the ``cohort`` extra::
+
+    pip install "virtual-clinic[cohort]"
+
+Usage::
+
+    from virtual_clinic.cohort import Cohort
+
+    details = [client.patients.get(pid) for pid in patient_ids]
+    cohort = Cohort.from_details(details)
+    cohort = Cohort.from_directory("patients/")  # or a local EHR store
+
+    cohort.conditions.top(10)                        # most prevalent conditions
+    cohort.group_by("conditions", "gender")          # counts per gender
+    cohort.cross("conditions", "medications")        # condition x medication
+    cohort.encounter_costs(by="encounter_class")     # cost distributions
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal, cast
+
+try:
+    import numpy as np
+    from scipy import sparse  # pyright: ignore[reportMissingTypeStubs]
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "virtual_clinic.cohort requires numpy and scipy. "
+        'Install them with: pip install "virtual-clinic[cohort]"'
+    ) from exc
+
+from .models import PatientDetail
+
+CodeKind = Literal["conditions", "medications", "procedures"]
+"""Record kinds encoded as patient x code matrices."""
+
+Demographic = Literal["gender", "race", "ethnicity", "state", "marital"]
+"""Patient fields available for grouping."""
+
+_CODE_KINDS: tuple[CodeKind, ...] = ("conditions", "medications", "procedures")
+_DEMOGRAPHICS: tuple[Demographic, ...] = ("gender", "race", "ethnicity", "state", "marital")
+
+
+def _to_float(value: str | None) -> float:
+    if value is None or value == "":
+        return float("nan")
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+def _encode(values: Sequence[str | None]) -> tuple[list[str], Any]:
+    """Integer-code ``values``; ``None`` becomes ``"unknown"``."""
+    labels: dict[str, int] = {}
+    codes = np.fromiter(
+        (labels.setdefault(v or "unknown", len(labels)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return list(labels), codes
+
+
+def _triu(matrix: Any) -> Any:
+    """Strict upper triangle of a square sparse matrix, in COO format.
+
+    scipy ships no complete type information; keep its partially unknown
+    types from leaking into the callers.
+    """
+    triu = cast(Any, sparse).triu
+    return triu(matrix, k=1).tocoo()
+
+
+@dataclass(frozen=True)
+class CodeMatrix:
+    """A sparse patients x codes count matrix for one record kind.
+
+    Attributes:
+        codes: Column labels (record codes).
+        descriptions: Description for each code (first one seen).
+        matrix: ``scipy.sparse.csr_matrix`` of shape
+            ``(n_patients, n_codes)``; entry ``(i, j)`` counts patient ``i``'s
+            records with code ``j``.
+    """
+
+    codes: list[str]
+    descriptions: list[str]
+    matrix: Any
+
+    @property
+    def presence(self) -> Any:
+        """Binary (0/1) version of :attr:`matrix`."""
+        binary = self.matrix.copy()
+        binary.data = np.ones_like(binary.data)
+        return binary
+
+    def patient_counts(self) -> Any:
+        """Number of patients with at least one record of each code."""
+        return np.asarray(self.presence.sum(axis=0)).ravel()
+
+    def prevalence(self) -> Any:
+        """Fraction of patients with at least one record of each code."""
+        n_patients = self.matrix.shape[0]
+        return self.patient_counts() / max(n_patients, 1)
+
+    def top(self, n: int = 10) -> list[tuple[str, str, int]]:
+        """Return the ``n`` most prevalent ``(code, description, patients)``."""
+        counts = self.patient_counts()
+        order = np.argsort(-counts, kind="stable")[:n]
+        return [
+            (self.codes[j], self.descriptions[j], int(counts[j])) for j in order
+        ]
+
+    def cooccurrence(self) -> Any:
+        """Return the ``codes x codes`` matrix of patients sharing both codes.
+
+        The diagonal equals :meth:`patient_counts`.
+        """
+        presence = self.presence
+        return (presence.T @ presence).tocsr()
+
+    def top_pairs(self, n: int = 10) -> list[tuple[str, str, int]]:
+        """Return the ``n`` code pairs shared by the most patients."""
+        upper = _triu(self.cooccurrence())
+        order = np.argsort(-upper.data, kind="stable")[:n]
+        return [
+            (self.codes[upper.row[k]], self.codes[upper.col[k]], int(upper.data[k]))
+            for k in order
+        ]
+
+
+class Cohort:
+    """Integer-coded, vectorized view over many patients.
+
+    Build with :meth:`from_details` or :meth:`from_directory`. Every row of every matrix corresponds to
+    ``patient_ids[i]``.
+    """
+
+    def __init__(
+        self,
+        patient_ids: list[str],
+        matrices: dict[CodeKind, CodeMatrix],
+        demographics: dict[Demographic, tuple[list[str], Any]],
+        birth_years: Any,
+        encounters: dict[str, Any],
+        encounter_classes: list[str],
+    ) -> None:
+        self.patient_ids = patient_ids
+        self._matrices = matrices
+        self._demographics = demographics
+        self.birth_years = birth_years
+        """``int32`` array of birth years, one per patient."""
+        self._encounters = encounters
+        self._encounter_classes = encounter_classes
+
+    @classmethod
+    def from_details(
+        cls, details: Iterable[PatientDetail], *, active_only: bool = False
+    ) -> Cohort:
+        """Encode patients into a cohort.
+
+        This is the only step that loops over records in Python.
+
+        Args:
+            details: Patient profiles, e.g. from ``client.patients.get()``.
+            active_only: Only count records without a ``stop`` date.
+        """
+        patient_ids: list[str] = []
+        demo_values: dict[Demographic, list[str | None]] = {d: [] for d in _DEMOGRAPHICS}
+        birth_years: list[int] = []
+        vocab: dict[CodeKind, dict[str, int]] = {k: {} for k in _CODE_KINDS}
+        descriptions: dict[CodeKind, list[str]] = {k: [] for k in _CODE_KINDS}
+        rows: dict[CodeKind, list[int]] = {k: [] for k in _CODE_KINDS}
+        cols: dict[CodeKind, list[int]] = {k: [] for k in _CODE_KINDS}
+        enc_patient: list[int] = []
+        enc_class: list[str | None] = []
+        enc_base: list[float] = []
+        enc_claim: list[float] = []
+        enc_coverage: list[float] = []
+
+        for i, detail in enumerate(details):
+            patient = detail.patient
+            patient_ids.append(patient.id)
+            for field in _DEMOGRAPHICS:
+                demo_values[field].append(getattr(patient, field))
+            birth_years.append(int(patient.birth_date[:4]))
+
+            for kind in _CODE_KINDS:
+                kind_vocab = vocab[kind]
+                for rec in getattr(detail, kind):
+                    if active_only and rec.stop:
+                        continue
+                    j = kind_vocab.get(rec.code)
+                    if j is None:
+                        j = kind_vocab[rec.code] = len(kind_vocab)
+                        descriptions[kind].append(rec.description)
+                    rows[kind].append(i)
+                    cols[kind].append(j)
+
+            for enc in detail.encounters:
+                enc_patient.append(i)
+                enc_class.append(enc.encounter_class)
+                enc_base.append(_to_float(enc.base_cost))
+                enc_claim.append(_to_float(enc.total_claim_cost))
+                enc_coverage.append(_to_float(enc.payer_coverage))
+
+        n_patients = len(patient_ids)
+        matrices: dict[CodeKind, CodeMatrix] = {}
+        for kind in _CODE_KINDS:
+            data = np.ones(len(rows[kind]), dtype=np.int32)
+            matrix = sparse.coo_matrix(
+                (data, (rows[kind], cols[kind])),
+                shape=(n_patients, len(vocab[kind])),
+            ).tocsr()
+            matrix.sum_duplicates()
+            matrices[kind] = CodeMatrix(list(vocab[kind]), descriptions[kind], matrix)
+
+        class_labels, class_codes = _encode(enc_class)
+        return cls(
+            patient_ids=patient_ids,
+            matrices=matrices,
+            demographics={d: _encode(demo_values[d]) for d in _DEMOGRAPHICS},
+            birth_years=np.asarray(birth_years, dtype=np.int32),
+            encounters={
+                "patient": np.asarray(enc_patient, dtype=np.int32),
+                "class": class_codes,
+                "base_cost": np.asarray(enc_base, dtype=np.float64),
+                "total_claim_cost": np.asarray(enc_claim, dtype=np.float64),
+                "payer_coverage": np.asarray(enc_coverage, dtype=np.float64),
+            },
+            encounter_classes=class_labels,
+        )
+
+    @classmethod
+    def from_directory(
+        cls, directory: str | Path, *, active_only: bool = False
+    ) -> Cohort:
+        """Encode a local EHR store: a directory of ``<patient_id>.json`` files.
+
+        Each file holds one ``PatientDetail`` as the API returns it, like the
+        caches written by the CLI's ``score`` command or read by the stand-in's
+        ``--patients-dir``. Files are parsed one at a time, so the profiles are
+        never all in memory at once.
+
+        Args:
+            directory: The store directory. Files are read in name order.
+            active_only: Only count records without a ``stop`` date.
+        """
+        paths = sorted(Path(directory).glob("*.json"))
+        return cls.from_details(
+            (PatientDetail.model_validate_json(path.read_bytes()) for path in paths),
+            active_only=active_only,
+        )
+
+    def __len__(self) -> int:
+        return len(self.patient_ids)
+
+    @property
+    def conditions(self) -> CodeMatrix:
+        """Patients x condition codes."""
+        return self._matrices["conditions"]
+
+    @property
+    def medications(self) -> CodeMatrix:
+        """Patients x medication codes."""
+        return self._matrices["medications"]
+
+    @property
+    def procedures(self) -> CodeMatrix:
+        """Patients x procedure codes."""
+        return self._matrices["procedures"]
+
+    def demographic(self, field: Demographic) -> tuple[list[str], Any]:
+        """Return ``(labels, codes)`` for a demographic field.
+
+        ``codes`` is an ``int32`` array with one entry per patient indexing
+        into ``labels``.
+        """
+        return self._demographics[field]
+
+    def _group_indicator(self, field: Demographic) -> tuple[list[str], Any]:
+        labels, codes = self._demographics[field]
+        n = len(codes)
+        indicator = sparse.csr_matrix(
+            (np.ones(n, dtype=np.int32), (codes, np.arange(n))),
+            shape=(len(labels), n),
+        )
+        return labels, indicator
+
+    def group_by(self, kind: CodeKind, field: Demographic) -> tuple[list[str], Any]:
+        """Count patients with each code, per demographic group.
+
+        Returns:
+            ``(group_labels, counts)`` where ``counts`` is a dense
+            ``(n_groups, n_codes)`` array.
+        """
+        labels, indicator = self._group_indicator(field)
+        counts = indicator @ self._matrices[kind].presence
+        return labels, counts.toarray()
+
+    def group_sizes(self, field: Demographic) -> dict[str, int]:
+        """Number of patients per demographic group."""
+        labels, codes = self._demographics[field]
+        sizes = np.bincount(codes, minlength=len(labels))
+        return {label: int(size) for label, size in zip(labels, sizes)}
+
+    def cross(self, row_kind: CodeKind, col_kind: CodeKind) -> Any:
+        """Return a sparse ``row codes x col codes`` matrix of shared patients.
+
+        For example ``cross("conditions", "medications")[i, j]`` counts the
+        patients with condition ``i`` who also have medication ``j``.
+        """
+        rows = self._matrices[row_kind].presence
+        cols = self._matrices[col_kind].presence
+        return (rows.T @ cols).tocsr()
+
+    def encounter_costs(
+        self,
+        *,
+        column: Literal["base_cost", "total_claim_cost", "payer_coverage"] = "total_claim_cost",
+        by: Literal["encounter_class"] | Demographic | None = None,
+        percentiles: Sequence[float] = (50, 90, 99),
+    ) -> dict[str, dict[str, float]]:
+        """Summarize the distribution of encounter costs.
+
+        Args:
+            column: Which cost field to summarize.
+            by: Group by encounter class or a patient demographic field.
+            percentiles: Percentiles to report.
+
+        Returns:
+            ``{group: {"count", "mean", "total", "p50", ...}}``. Without
+            ``by`` the only group is ``"all"``.
+        """
+        values = self._encounters[column]
+        if by is None:
+            labels, groups = ["all"], np.zeros(len(values), dtype=np.int32)
+        elif by == "encounter_class":
+            labels, groups = self._encounter_classes, self._encounters["class"]
+        else:
+            labels, patient_groups = self._demographics[by]
+            groups = patient_groups[self._encounters["patient"]]
+
+        valid = ~np.isnan(values)
+        values, groups = values[valid], groups[valid]
+        order = np.argsort(groups, kind="stable")
+        values, groups = values[order], groups[order]
+        bounds = np.searchsorted(groups, np.arange(len(labels) + 1))
+
+        summary: dict[str, dict[str, float]] = {}
+        for g, label in enumerate(labels):
+            chunk = values[bounds[g] : bounds[g + 1]]
+            if chunk.size == 0:
+                continue
+            stats = {
+                "count": float(chunk.size),
+                "mean": float(chunk.mean()),
+                "total": float(chunk.sum()),
+            }
+            quantiles: list[float] = np.percentile(chunk, percentiles).tolist()
+            for q, v in zip(percentiles, quantiles):
+                stats[f"p{q:g}"] = float(v)
+            summary[label] = stats
+        return summary
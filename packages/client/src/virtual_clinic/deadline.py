@@ -0,0 +1,82 @@
+"""Wall-clock deadlines for a block of client calls.
+
+A :class:`Deadline` bounds the total time of everything done while it is
+active. Every request sent inside it has its httpx timeouts clamped to the
+time remaining, and once it has passed, requests raise
+:class:`~virtual_clinic.exceptions.DeadlineExceededError` instead of being
+sent. Deadlines nest; the earliest one wins::
+
+    from virtual_clinic import Deadline
+
+    with Deadline(600):                 # the whole batch
+        for patient_id in patient_ids:
+            with Deadline(120):         # each interview, never past the batch's
+                run_interview(client, patient_id)
+
+The active deadlines are tracked per thread (and per asyncio task) with
+:mod:`contextvars`. The client's own fan-out helpers (``client.map``,
+``patients.get_many``, ``conversations.create_many``) run each call in a
+copy of the caller's context, so those calls inherit the active deadline.
+Threads you start yourself do not: pass the :class:`Deadline` along and
+enter it again in the worker (``with deadline:``), or run the work with
+``contextvars.copy_context().run``.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any
+
+_ACTIVE: ContextVar[tuple[Deadline, ...]] = ContextVar(
+    "virtual_clinic_deadlines", default=()
+)
+
+
+class Deadline:
+    """A point in time after which calls should no longer be made.
+
+    Args:
+        seconds: Time from now until the deadline.
+
+    Use it as a context manager to apply it to client calls, or query it
+    directly (:meth:`remaining`, :attr:`expired`) to budget other work such
+    as LLM calls.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+        """Expiry time on the :func:`time.monotonic` clock."""
+
+    @classmethod
+    def current(cls) -> Deadline | None:
+        """Return the earliest deadline active in this context, if any."""
+        active = _ACTIVE.get()
+        if not active:
+            return None
+        return min(active, key=lambda d: d.expires_at)
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline (``0`` once it has passed)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+
+    def __enter__(self) -> Deadline:
+        _ACTIVE.set((*_ACTIVE.get(), self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        active = list(_ACTIVE.get())
+        # Remove the most recent entry of this deadline.
+        for i in range(len(active) - 1, -1, -1):
+            if active[i] is self:
+                del active[i]
+                break
+        _ACTIVE.set(tuple(active))
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f})"
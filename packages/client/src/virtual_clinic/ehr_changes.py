@@ -0,0 +1,167 @@
+"""Apply EHR deltas to a cached patient profile.
+
+``patients.get_changes(patient_id, since=...)`` returns only the records
+whose ``start``, ``stop`` or ``date`` falls after ``since``, so refreshing a
+cached :class:`~virtual_clinic.models.PatientDetail` costs bandwidth in
+proportion to what changed. :func:`merge_changes` folds such a delta into
+the cached profile::
+
+    from virtual_clinic import merge_changes
+
+    detail = client.patients.get(patient_id)
+    synced_at = ...                          # when ``detail`` was fetched
+    changes = client.patients.get_changes(patient_id, since=synced_at)
+    detail = merge_changes(detail, changes)
+    synced_at = changes.until
+
+``client.patients.refresh(detail, since=...)`` does both steps and falls
+back to a full fetch when the delta cannot be applied.
+
+Records have no ids of their own (except encounters and care plans), so a
+changed record replaces the cached one with the same kind, start (or date),
+code and encounter; e.g. a condition that has since resolved gains its
+``stop``.
+
+The schema has no modification timestamps, so only records with a new
+``start``, ``stop`` or ``date`` are picked up. An edit that keeps every date
+before ``since`` (a corrected code, a reseed with the same dates) is not in
+the delta; :func:`merge_changes` detects it by comparing the merged profile's
+:func:`ehr_fingerprint` with the server's, and raises ``ValueError``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from typing import Any, TypeVar
+
+from .models import PatientChanges, PatientDetail
+
+T = TypeVar("T")
+
+RECENT_OBSERVATIONS = 30
+"""Number of observations the API returns in ``recent_observations``."""
+
+_COUNTED = (
+    ("conditions", "conditions_count"),
+    ("medications", "medications_count"),
+    ("allergies", "allergies_count"),
+    ("procedures", "procedures_count"),
+    ("encounters", "encounters_count"),
+    ("immunizations", "immunizations_count"),
+)
+
+
+def _by_id(record: Any) -> Hashable:
+    return record.id
+
+
+def _by_start(record: Any) -> Hashable:
+    return (record.start, record.code, record.encounter_id)
+
+
+def _by_date(record: Any) -> Hashable:
+    return (record.date, record.code, record.encounter_id)
+
+
+_KEYS: dict[str, Callable[[Any], Hashable]] = {
+    "conditions": _by_start,
+    "medications": _by_start,
+    "allergies": _by_start,
+    "procedures": _by_start,
+    "careplans": _by_id,
+    "recent_observations": _by_date,
+    "encounters": _by_id,
+    "immunizations": _by_date,
+}
+
+
+def _merge(
+    cached: Sequence[T], changed: Sequence[T], key: Callable[[T], Hashable]
+) -> list[T]:
+    """Replace cached records by key with their changed versions; append new ones."""
+    updates = {key(record): record for record in changed}
+    merged = [updates.pop(key(record), record) for record in cached]
+    merged.extend(record for record in changed if key(record) in updates)
+    return merged
+
+
+_ALIASES = {kind: PatientDetail.model_fields[kind].alias or kind for kind in _KEYS}
+_FINGERPRINT_FIELDS = (
+    "id",
+    "start",
+    "stop",
+    "date",
+    "code",
+    "description",
+    "encounterId",
+    "value",
+)
+
+
+def ehr_fingerprint(detail: PatientDetail | Mapping[str, Any]) -> str:
+    """SHA-256 over every record's identity, dates, code, description and value.
+
+    Independent of record order. Matches the ``fingerprint`` the changes
+    endpoint computes over the full current EHR.
+
+    Args:
+        detail: A profile, or its JSON as the API sends it (camelCase).
+    """
+    if isinstance(detail, PatientDetail):
+        data = detail.model_dump(mode="json", by_alias=True, include=set(_KEYS))
+    else:
+        data = {_ALIASES[kind]: detail.get(_ALIASES[kind], ()) for kind in _KEYS}
+    lines = sorted(
+        json.dumps(
+            [kind, *(record.get(field) for field in _FINGERPRINT_FIELDS)],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        for kind, records in data.items()
+        for record in records
+    )
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def merge_changes(detail: PatientDetail, changes: PatientChanges) -> PatientDetail:
+    """Return ``detail`` with ``changes`` applied (``detail`` is not modified).
+
+    The demographics and summary are replaced, changed records replace their
+    cached versions and new records are appended. ``recent_observations``
+    keeps the last :data:`RECENT_OBSERVATIONS`, like the API.
+
+    Raises:
+        ValueError: If the merged profile disagrees with the server's summary
+            counts or ``fingerprint``, i.e. records changed without a date in
+            the window (for example, a corrected record or a reseed). Fetch
+            the profile again with ``patients.get()``.
+    """
+    update: dict[str, Any] = {"patient": changes.patient, "summary": changes.summary}
+    for field, key in _KEYS.items():
+        update[field] = _merge(getattr(detail, field), getattr(changes, field), key)
+    update["recent_observations"] = update["recent_observations"][
+        -RECENT_OBSERVATIONS:
+    ]
+
+    for field, count in _COUNTED:
+        expected = getattr(changes.summary, count)
+        if len(update[field]) != expected:
+            raise ValueError(
+                f"cached {field} out of sync: {len(update[field])} after merging, "
+                f"{expected} on the server"
+            )
+    active = sum(1 for careplan in update["careplans"] if not careplan.stop)
+    if active != changes.summary.active_careplan_count:
+        raise ValueError(
+            f"cached careplans out of sync: {active} active after merging, "
+            f"{changes.summary.active_careplan_count} on the server"
+        )
+
+    merged = detail.model_copy(update=update)
+    if changes.fingerprint is not None and (
+        ehr_fingerprint(merged) != changes.fingerprint
+    ):
+        raise ValueError("cached records out of sync with the server's fingerprint")
+    return merged
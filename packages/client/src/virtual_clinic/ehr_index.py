@@ -0,0 +1,306 @@
+"""Indexed, time-aware view over a patient's EHR.
+
+:class:`EHRIndex` parses every ``start``/``stop``/``date`` string of a
+:class:`~virtual_clinic.models.PatientDetail` once and builds:
+
+- an interval tree per record kind with a time span (conditions,
+  medications, allergies, procedures, care plans, encounters), for
+  point-in-time and range queries in ``O(log n + k)``;
+- sorted timestamp arrays for dated records (observations, immunizations);
+- ``code -> records`` hash maps for every kind.
+
+Usage::
+
+    from virtual_clinic import EHRIndex
+
+    index = EHRIndex(client.patients.get(patient_id))
+
+    index.active("conditions", "2019-06-01")
+    index.overlapping("medications", "2019-01-01", "2019-12-31")
+    index.by_code("conditions", "44054006")
+
+Intervals are closed: a record is active at ``t`` if ``start <= t <= stop``.
+A missing ``stop`` means the record is still active, and a date-only ``stop``
+(``"2019-06-01"``) covers that whole day.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, timezone
+from typing import Generic, Literal, TypeVar, Union
+
+from .models import (
+    Allergy,
+    CarePlan,
+    Condition,
+    Encounter,
+    Immunization,
+    Medication,
+    Observation,
+    PatientDetail,
+    Procedure,
+)
+
+IntervalKind = Literal[
+    "conditions", "medications", "allergies", "procedures", "careplans", "encounters"
+]
+"""Record kinds that span a ``start``/``stop`` interval."""
+
+DatedKind = Literal["recent_observations", "immunizations"]
+"""Record kinds with a single ``date``."""
+
+EHRKind = Literal[
+    "conditions",
+    "medications",
+    "allergies",
+    "procedures",
+    "careplans",
+    "encounters",
+    "recent_observations",
+    "immunizations",
+]
+"""Any record kind, named after the :class:`PatientDetail` field."""
+
+EHRRecord = Union[
+    Condition,
+    Medication,
+    Allergy,
+    Procedure,
+    CarePlan,
+    Encounter,
+    Observation,
+    Immunization,
+]
+
+TimeLike = Union[datetime, date, str, float]
+"""A point in time: a datetime, a date, an ISO-8601 string or POSIX seconds."""
+
+R = TypeVar("R")
+
+_INTERVAL_KINDS: tuple[IntervalKind, ...] = (
+    "conditions",
+    "medications",
+    "allergies",
+    "procedures",
+    "careplans",
+    "encounters",
+)
+_DATED_KINDS: tuple[DatedKind, ...] = ("recent_observations", "immunizations")
+
+# ---------------------------------------------------------------------------
+# Timestamps
+# ---------------------------------------------------------------------------
+
+
+def to_timestamp(value: TimeLike) -> float:
+    """Convert a time-like value to POSIX seconds (naive values are UTC).
+
+    Accepts the formats the API returns: ``"2019-06-01"``,
+    ``"2019-06-01T08:30:00Z"`` and ``"2019-06-01T08:30:00.000+00:00"``.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        value = datetime.fromisoformat(text)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _stop_timestamp(value: str) -> float:
+    """Convert a ``stop`` to POSIX seconds; a date-only stop ends with its day."""
+    stop = to_timestamp(value)
+    if len(value.strip()) == len("YYYY-MM-DD"):
+        # Just before the next midnight, as intervals are closed.
+        stop = math.nextafter(stop + 86400, -math.inf)
+    return stop
+
+
+# ---------------------------------------------------------------------------
+# Interval tree
+# ---------------------------------------------------------------------------
+
+
+class _Node(Generic[R]):
+    """A node of a static centered interval tree."""
+
+    __slots__ = ("center", "starts", "by_start", "stops", "by_stop", "left", "right")
+
+    def __init__(self, center: float, items: list[tuple[float, float, int, R]]) -> None:
+        self.center = center
+        asc = sorted(items, key=lambda item: item[0])
+        self.starts = [item[0] for item in asc]
+        self.by_start = [(item[2], item[3]) for item in asc]
+        desc = sorted(items, key=lambda item: -item[1])
+        self.stops = [-item[1] for item in desc]
+        self.by_stop = [(item[2], item[3]) for item in desc]
+        self.left: _Node[R] | None = None
+        self.right: _Node[R] | None = None
+
+
+class IntervalTree(Generic[R]):
+    """Static centered interval tree over closed ``[start, stop]`` intervals.
+
+    Args:
+        intervals: ``(start, stop, record)`` triples. Use ``math.inf`` for an
+            open-ended ``stop``. A ``stop`` before ``start`` is treated as a
+            single point in time.
+    """
+
+    def __init__(self, intervals: Sequence[tuple[float, float, R]]) -> None:
+        items = [
+            (start, max(start, stop), i, rec)
+            for i, (start, stop, rec) in enumerate(intervals)
+        ]
+        self._root = self._build(items)
+        self._size = len(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def _build(cls, items: list[tuple[float, float, int, R]]) -> _Node[R] | None:
+        if not items:
+            return None
+        endpoints = sorted(
+            p for item in items for p in (item[0], item[1]) if not math.isinf(p)
+        )
+        center = endpoints[len(endpoints) // 2] if endpoints else 0.0
+        left = [item for item in items if item[1] < center]
+        right = [item for item in items if item[0] > center]
+        here = [item for item in items if item[0] <= center <= item[1]]
+        node = _Node(center, here)
+        node.left = cls._build(left)
+        node.right = cls._build(right)
+        return node
+
+    def at(self, t: float) -> list[R]:
+        """Return records whose interval contains ``t``, in insertion order."""
+        hits: list[tuple[int, R]] = []
+        node = self._root
+        while node is not None:
+            if t < node.center:
+                hits.extend(node.by_start[: bisect_right(node.starts, t)])
+                node = node.left
+            elif t > node.center:
+                hits.extend(node.by_stop[: bisect_right(node.stops, -t)])
+                node = node.right
+            else:
+                hits.extend(node.by_start)
+                break
+        hits.sort(key=lambda hit: hit[0])
+        return [rec for _, rec in hits]
+
+    def overlapping(self, start: float, stop: float) -> list[R]:
+        """Return records whose interval intersects ``[start, stop]``."""
+        hits: list[tuple[int, R]] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if stop < node.center:
+                hits.extend(node.by_start[: bisect_right(node.starts, stop)])
+                stack.append(node.left)
+            elif start > node.center:
+                hits.extend(node.by_stop[: bisect_right(node.stops, -start)])
+                stack.append(node.right)
+            else:
+                hits.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        hits.sort(key=lambda hit: hit[0])
+        return [rec for _, rec in hits]
+
+
+# ---------------------------------------------------------------------------
+# EHR index
+# ---------------------------------------------------------------------------
+
+
+class EHRIndex:
+    """Point-in-time, range and by-code queries over one patient's EHR.
+
+    Building the index is ``O(n log n)`` in the number of records; every
+    query afterwards avoids re-parsing dates and scanning the full history.
+    Records are returned in chronological order (by ``start``/``date``).
+
+    Args:
+        detail: The patient's full profile from ``client.patients.get()``.
+    """
+
+    def __init__(self, detail: PatientDetail) -> None:
+        self.detail = detail
+        self._trees: dict[str, IntervalTree[EHRRecord]] = {}
+        self._dates: dict[str, tuple[list[float], list[EHRRecord]]] = {}
+        self._codes: dict[str, dict[str, list[EHRRecord]]] = {}
+
+        for kind in _INTERVAL_KINDS:
+            records: list[EHRRecord] = list(getattr(detail, kind))
+            spans = [
+                (
+                    to_timestamp(rec.start),  # type: ignore[union-attr]
+                    _stop_timestamp(rec.stop) if rec.stop else math.inf,  # type: ignore[union-attr]
+                    rec,
+                )
+                for rec in records
+            ]
+            spans.sort(key=lambda span: span[0])
+            self._trees[kind] = IntervalTree(spans)
+            self._codes[kind] = self._code_map(span[2] for span in spans)
+
+        for kind in _DATED_KINDS:
+            dated = sorted(
+                ((to_timestamp(rec.date), rec) for rec in getattr(detail, kind)),  # type: ignore[union-attr]
+                key=lambda pair: pair[0],
+            )
+            self._dates[kind] = ([t for t, _ in dated], [rec for _, rec in dated])
+            self._codes[kind] = self._code_map(rec for _, rec in dated)
+
+    @staticmethod
+    def _code_map(records: Iterable[EHRRecord]) -> dict[str, list[EHRRecord]]:
+        codes: dict[str, list[EHRRecord]] = {}
+        for rec in records:
+            code = rec.code
+            if code:
+                codes.setdefault(code, []).append(rec)
+        return codes
+
+    def active(self, kind: IntervalKind, at: TimeLike) -> list[EHRRecord]:
+        """Return ``kind`` records active at ``at`` (``start <= at <= stop``)."""
+        return self._trees[kind].at(to_timestamp(at))
+
+    def overlapping(
+        self, kind: EHRKind, start: TimeLike, stop: TimeLike
+    ) -> list[EHRRecord]:
+        """Return ``kind`` records active at any time within ``[start, stop]``.
+
+        For dated kinds (observations, immunizations) this returns records
+        dated within the range.
+        """
+        lo, hi = to_timestamp(start), to_timestamp(stop)
+        if kind in self._dates:
+            times, records = self._dates[kind]
+            return records[bisect_left(times, lo) : bisect_right(times, hi)]
+        return self._trees[kind].overlapping(lo, hi)
+
+    def by_code(self, kind: EHRKind, code: str) -> list[EHRRecord]:
+        """Return all ``kind`` records with the given code."""
+        return list(self._codes[kind].get(code, ()))
+
+    def codes(self, kind: EHRKind) -> set[str]:
+        """Return the distinct codes recorded for ``kind``."""
+        return set(self._codes[kind])
+
+    def snapshot(self, at: TimeLike) -> dict[IntervalKind, list[EHRRecord]]:
+        """Return every interval kind's active records at ``at``."""
+        t = to_timestamp(at)
+        return {kind: self._trees[kind].at(t) for kind in _INTERVAL_KINDS}
@@ -0,0 +1,384 @@
+"""Compact, interned in-memory storage for many patients' EHRs.
+
+Across a cohort, the same codes, descriptions, systems and reasons repeat on
+thousands of records, and every :class:`~virtual_clinic.models.PatientDetail`
+holds its own copy of each string inside its own model instance.
+:class:`CompactPatient` stores a patient's records column by column instead:
+
+- vocabulary-like fields (``code``, ``description``, ``system``,
+  ``reason_code``, ``reason_description``, ...) as integer ids into a
+  :class:`Vocabulary` shared by every patient, so each distinct string is
+  held once per cohort;
+- the remaining fields (dates, ids, values, costs) as UTF-8 bytes in one
+  buffer per record kind.
+
+Records are decoded back into models on access. Usage::
+
+    from virtual_clinic import CompactPatient, Vocabulary
+
+    vocabulary = Vocabulary()
+    cohort = {
+        detail.patient.id: CompactPatient.from_detail(detail, vocabulary)
+        for detail in details
+    }
+
+    patient = cohort[patient_id]
+    patient.conditions[0]                     # a Condition, decoded on access
+    patient.conditions.column("description")  # one field of every record
+    vocabulary.id("44054006") in patient.conditions.ids("code")
+
+:meth:`CompactPatient.from_json` encodes the API's JSON (or a cached
+``PatientDetail`` file) directly, without building a model per record.
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, TypeVar, overload
+
+from pydantic import BaseModel
+
+from .models import (
+    Allergy,
+    CarePlan,
+    Condition,
+    EHRSummary,
+    Encounter,
+    Immunization,
+    Medication,
+    Observation,
+    Patient,
+    PatientDetail,
+    Procedure,
+)
+
+R = TypeVar("R", bound=BaseModel)
+
+INTERNED_FIELDS = frozenset(
+    {
+        "code",
+        "description",
+        "system",
+        "reason_code",
+        "reason_description",
+        "category",
+        "type",
+        "units",
+        "encounter_class",
+        "organization_id",
+        "provider_id",
+        "payer_id",
+    }
+)
+"""Record fields stored as :class:`Vocabulary` ids; the rest are stored inline."""
+
+_RECORD_KINDS = (
+    "conditions",
+    "medications",
+    "allergies",
+    "procedures",
+    "careplans",
+    "recent_observations",
+    "encounters",
+    "immunizations",
+)
+_NONE = b"\xff"  # never valid UTF-8, so it cannot collide with a string
+
+
+class Vocabulary:
+    """Shared string table: each distinct string is stored once and numbered.
+
+    Id ``0`` stands for ``None``. Safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._strings: list[str | None] = [None]
+        self._lock = threading.Lock()
+
+    def intern(self, value: str | None) -> int:
+        """Return the id of ``value``, adding it if it is new."""
+        if value is None:
+            return 0
+        found = self._ids.get(value)
+        if found is not None:
+            return found
+        with self._lock:
+            found = self._ids.get(value)
+            if found is None:
+                found = self._ids[value] = len(self._strings)
+                self._strings.append(value)
+            return found
+
+    def id(self, value: str | None) -> int | None:
+        """Return the id of ``value``, or ``None`` if it was never interned."""
+        return 0 if value is None else self._ids.get(value)
+
+    def __getitem__(self, id: int) -> str | None:
+        return self._strings[id]
+
+    def __contains__(self, value: object) -> bool:
+        return value is None or value in self._ids
+
+    def __len__(self) -> int:
+        """Number of distinct strings (``None`` not counted)."""
+        return len(self._strings) - 1
+
+
+_LAYOUTS: dict[type[BaseModel], tuple[tuple[str, ...], tuple[str, ...]]] = {}
+
+
+def _layout(model: type[BaseModel]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Split ``model``'s fields (except ``patient_id``) into interned and inline."""
+    layout = _LAYOUTS.get(model)
+    if layout is None:
+        names = [name for name in model.model_fields if name != "patient_id"]
+        layout = _LAYOUTS[model] = (
+            tuple(name for name in names if name in INTERNED_FIELDS),
+            tuple(name for name in names if name not in INTERNED_FIELDS),
+        )
+    return layout
+
+
+def _getter(model: type[BaseModel], name: str) -> tuple[str, str]:
+    """``(alias, name)``: API JSON uses the camelCase alias."""
+    return model.model_fields[name].alias or name, name
+
+
+def _value(row: Mapping[str, Any], alias: str, name: str) -> str | None:
+    value = row[alias] if alias in row else row.get(name)
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+class CompactRecords(Sequence[R]):
+    """One patient's records of one kind, stored column by column.
+
+    A read-only sequence of models; indexing decodes the record. Built by
+    :class:`CompactPatient`.
+
+    Args:
+        model: The record model, e.g. :class:`~virtual_clinic.models.Condition`.
+        rows: Records as models, or as mappings keyed by field name or alias.
+        vocabulary: The vocabulary to intern :data:`INTERNED_FIELDS` into.
+        patient_id: The patient's id, set on every decoded record.
+    """
+
+    __slots__ = (
+        "model",
+        "vocabulary",
+        "_patient_id",
+        "_interned",
+        "_inline",
+        "_ids",
+        "_ends",
+        "_data",
+        "_count",
+    )
+
+    def __init__(
+        self,
+        model: type[R],
+        rows: Iterable[R | Mapping[str, Any]],
+        vocabulary: Vocabulary,
+        patient_id: str,
+    ) -> None:
+        self.model = model
+        self.vocabulary = vocabulary
+        self._patient_id = patient_id
+        self._interned, self._inline = _layout(model)
+
+        interned = [_getter(model, name) for name in self._interned]
+        inline = [_getter(model, name) for name in self._inline]
+        intern = vocabulary.intern
+        ids = array("I")
+        ends = array("I")
+        data = bytearray()
+        count = 0
+        for record in rows:
+            row: Mapping[str, Any] = (
+                record.__dict__ if isinstance(record, BaseModel) else record
+            )
+            ids.extend(intern(_value(row, *keys)) for keys in interned)
+            for keys in inline:
+                value = _value(row, *keys)
+                data += _NONE if value is None else value.encode("utf-8")
+                ends.append(len(data))
+            count += 1
+
+        self._ids = ids
+        self._ends = ends
+        self._data = bytes(data)
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> R: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[R]: ...
+
+    def __getitem__(self, index: int | slice) -> R | list[R]:
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[R]:
+        return (self._decode(i) for i in range(self._count))
+
+    def _decode(self, index: int) -> R:
+        fields: dict[str, Any] = {"patient_id": self._patient_id}
+        base = index * len(self._interned)
+        for offset, name in enumerate(self._interned):
+            fields[name] = self.vocabulary[self._ids[base + offset]]
+        base = index * len(self._inline)
+        for offset, name in enumerate(self._inline):
+            fields[name] = self._string(base + offset)
+        return self.model.model_construct(**fields)
+
+    def _string(self, slot: int) -> str | None:
+        start = self._ends[slot - 1] if slot else 0
+        raw = self._data[start : self._ends[slot]]
+        return None if raw == _NONE else raw.decode("utf-8")
+
+    def ids(self, field: str) -> array[int]:
+        """Vocabulary ids of an interned ``field``, one per record.
+
+        Comparing ids finds records without decoding them::
+
+            target = vocabulary.id("44054006")
+            has_diabetes = target in patient.conditions.ids("code")
+
+        Raises:
+            KeyError: If ``field`` is not interned for this record kind.
+        """
+        if field not in self._interned:
+            raise KeyError(f"{self.model.__name__}.{field} is not interned")
+        stride = len(self._interned)
+        return self._ids[self._interned.index(field) :: stride]
+
+    def column(self, field: str) -> list[str | None]:
+        """Decode one ``field`` of every record."""
+        if field in self._interned:
+            return [self.vocabulary[i] for i in self.ids(field)]
+        if field not in self._inline:
+            raise KeyError(f"{self.model.__name__} has no field {field!r}")
+        stride = len(self._inline)
+        offset = self._inline.index(field)
+        return [self._string(i * stride + offset) for i in range(self._count)]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers (the shared vocabulary excluded)."""
+        return (
+            len(self._data)
+            + self._ids.itemsize * len(self._ids)
+            + self._ends.itemsize * len(self._ends)
+        )
+
+
+class CompactPatient:
+    """A patient's EHR with records stored as :class:`CompactRecords`.
+
+    Demographics and the summary are kept as models. The record kinds are
+    attributes named after the :class:`~virtual_clinic.models.PatientDetail`
+    fields.
+
+    Args:
+        patient: Demographics.
+        summary: EHR summary.
+        records: Records of each kind, as models or as API JSON objects,
+            keyed by the ``PatientDetail`` field name.
+        vocabulary: Vocabulary shared across the cohort.
+    """
+
+    def __init__(
+        self,
+        patient: Patient,
+        summary: EHRSummary,
+        records: Mapping[str, Iterable[Any]],
+        vocabulary: Vocabulary,
+    ) -> None:
+        self.patient = patient
+        self.summary = summary
+        self.vocabulary = vocabulary
+        pid = patient.id
+
+        def get(kind: str) -> Iterable[Any]:
+            return records.get(kind, ())
+
+        self.conditions = CompactRecords(Condition, get("conditions"), vocabulary, pid)
+        self.medications = CompactRecords(
+            Medication, get("medications"), vocabulary, pid
+        )
+        self.allergies = CompactRecords(Allergy, get("allergies"), vocabulary, pid)
+        self.procedures = CompactRecords(Procedure, get("procedures"), vocabulary, pid)
+        self.careplans = CompactRecords(CarePlan, get("careplans"), vocabulary, pid)
+        self.recent_observations = CompactRecords(
+            Observation, get("recent_observations"), vocabulary, pid
+        )
+        self.encounters = CompactRecords(Encounter, get("encounters"), vocabulary, pid)
+        self.immunizations = CompactRecords(
+            Immunization, get("immunizations"), vocabulary, pid
+        )
+
+    @classmethod
+    def from_detail(
+        cls, detail: PatientDetail, vocabulary: Vocabulary
+    ) -> CompactPatient:
+        """Encode a :class:`PatientDetail`."""
+        return cls(
+            detail.patient,
+            detail.summary,
+            {kind: getattr(detail, kind) for kind in _RECORD_KINDS},
+            vocabulary,
+        )
+
+    @classmethod
+    def from_json(
+        cls, data: Mapping[str, Any], vocabulary: Vocabulary
+    ) -> CompactPatient:
+        """Encode a ``PatientDetail`` JSON object (camelCase, as the API sends it).
+
+        Records are read straight from the JSON; only the demographics and
+        summary are validated.
+        """
+        fields = PatientDetail.model_fields
+        records: dict[str, Iterable[Any]] = {}
+        for kind in _RECORD_KINDS:
+            alias = fields[kind].alias or kind
+            records[kind] = data.get(alias, data.get(kind)) or ()
+        return cls(
+            Patient.model_validate(data["patient"]),
+            EHRSummary.model_validate(data["summary"]),
+            records,
+            vocabulary,
+        )
+
+    def records(self, kind: str) -> CompactRecords[Any]:
+        """Records of ``kind``, a :class:`PatientDetail` field name."""
+        if kind not in _RECORD_KINDS:
+            raise KeyError(f"Unknown record kind: {kind!r}")
+        return getattr(self, kind)
+
+    def to_detail(self) -> PatientDetail:
+        """Decode every record into a full :class:`PatientDetail`."""
+        fields: dict[str, Any] = {"patient": self.patient, "summary": self.summary}
+        for kind in _RECORD_KINDS:
+            fields[kind] = list(self.records(kind))
+        return PatientDetail.model_construct(**fields)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the record columns (the shared vocabulary excluded)."""
+        return sum(self.records(kind).nbytes for kind in _RECORD_KINDS)
+
@@ -88,3 +88,33 @@ class ConnectionError(VirtualClinicError):
         self, message: str = "Failed to connect to the Virtual Clinic API"
     ) -> None:
         super().__init__(message)
+
+
+class CircuitOpenError(VirtualClinicError):
+    """The endpoint's circuit breaker is open; the request was not sent.
+
+    Attributes:
+        endpoint: The endpoint whose circuit is open (e.g. ``"patients.get"``).
+        retry_after: Seconds until the circuit will next probe the API.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit open for {endpoint}; retry in {retry_after:.1f}s"
+        )
+
+
+class DeadlineExceededError(VirtualClinicError):
+    """The active :class:`~virtual_clinic.Deadline` passed before the call finished.
+
+    Attributes:
+        operation: What was cut short (an endpoint name such as
+            ``"conversations.send_message"``, or e.g. ``"llm"`` for work
+            outside the client).
+    """
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        super().__init__(f"Deadline exceeded during {operation}")
@@ -0,0 +1,405 @@
+"""Client request metrics and a background health monitor, in Prometheus format.
+
+Every :class:`~virtual_clinic.VirtualClinic` records each request it sends in
+its :class:`RequestMetrics` (``client.metrics``): a count per endpoint and
+outcome and a latency histogram per endpoint. A :class:`HealthMonitor` adds
+periodic ``GET /api/health`` checks and can serve everything on a local
+``/metrics`` endpoint for Prometheus to scrape::
+
+    from virtual_clinic import HealthMonitor, VirtualClinic
+
+    client = VirtualClinic(token="...")
+    with HealthMonitor(client, interval=15) as monitor:
+        server = monitor.serve(port=9464)   # http://127.0.0.1:9464/metrics
+        run_batch(client)
+        server.shutdown()
+
+Histograms are cumulative, as Prometheus expects. Each also keeps a rolling
+window of recent samples, exported as ``..._recent_seconds`` quantile gauges
+for dashboards that need current latency without a PromQL rate.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Literal
+
+from ._keepalive import Keepalive
+from .exceptions import ServerError
+
+if TYPE_CHECKING:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from .client import VirtualClinic
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)  # fmt: skip
+"""Latency histogram bucket bounds in seconds (LLM replies take up to 60s)."""
+
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+"""Quantiles exported for the rolling windows."""
+
+HealthResult = Literal["up", "degraded", "down"]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Cumulative bucketed histogram with a rolling window of recent samples.
+
+    Not synchronized: the owner guards it with its own lock.
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, window: int = 1024
+    ) -> None:
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # last: +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantile(self, q: float) -> float | None:
+        """The ``q`` quantile (0-1) of the rolling window, ``None`` if empty."""
+        samples = sorted(self.recent)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, round(q * (len(samples) - 1)))]
+
+    def render(self, name: str, **labels: str) -> list[str]:
+        """Prometheus sample lines: cumulative buckets, sum and count."""
+        lines: list[str] = []
+        cumulative = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            cumulative += count
+            le = _labels(**labels, le=_number(bound))
+            lines.append(f"{name}_bucket{le} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**labels)} {_number(self.sum)}")
+        lines.append(f"{name}_count{_labels(**labels)} {self.count}")
+        return lines
+
+    def render_recent(self, name: str, **labels: str) -> list[str]:
+        """Sample lines for the :data:`QUANTILES` of the rolling window."""
+        lines: list[str] = []
+        for q in QUANTILES:
+            value = self.quantile(q)
+            if value is not None:
+                quantile = _labels(**labels, quantile=_number(q))
+                lines.append(f"{name}{quantile} {_number(value)}")
+        return lines
+
+
+def _family(
+    name: str, kind: str, description: str, samples: Iterable[str]
+) -> list[str]:
+    """A metric family: its ``HELP`` and ``TYPE`` lines, then its samples."""
+    lines = list(samples)
+    if not lines:
+        return []
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}", *lines]
+
+
+class RequestMetrics:
+    """Per-endpoint request counts and latencies of one client.
+
+    Outcomes are the response's status class (``2xx``, ``4xx``, ``5xx``),
+    ``timeout``, ``deadline`` (the caller's :class:`~virtual_clinic.Deadline`
+    ran out) or ``error`` (connection failures and other transport errors).
+    Requests refused by an open circuit are never sent, so not counted.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._requests: Counter[tuple[str, str]] = Counter()
+        self._latency: dict[str, Histogram] = {}
+
+    def observe(self, endpoint: str, outcome: str, seconds: float) -> None:
+        """Record one request."""
+        with self._lock:
+            self._requests[endpoint, outcome] += 1
+            histogram = self._latency.get(endpoint)
+            if histogram is None:
+                histogram = self._latency[endpoint] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def requests(self) -> dict[tuple[str, str], int]:
+        """Request counts keyed by ``(endpoint, outcome)``."""
+        with self._lock:
+            return dict(self._requests)
+
+    def render(self) -> list[str]:
+        """Prometheus text-format lines for these metrics."""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            latency = sorted(self._latency.items())
+            return [
+                *_family(
+                    "virtual_clinic_requests_total",
+                    "counter",
+                    "Requests sent by the client, by endpoint and outcome.",
+                    (
+                        f"virtual_clinic_requests_total"
+                        f"{_labels(endpoint=endpoint, outcome=outcome)} {count}"
+                        for (endpoint, outcome), count in requests
+                    ),
+                ),
+                *_family(
+                    "virtual_clinic_request_duration_seconds",
+                    "histogram",
+                    "Client-side request latency, by endpoint.",
+                    (
+                        line
+                        for endpoint, histogram in latency
+                        for line in histogram.render(
+                            "virtual_clinic_request_duration_seconds",
+                            endpoint=endpoint,
+                        )
+                    ),
+                ),
+                *_family(
+                    "virtual_clinic_request_recent_seconds",
+                    "gauge",
+                    "Quantiles of the most recent request latencies, by endpoint.",
+                    (
+                        line
+                        for endpoint, histogram in latency
+                        for line in histogram.render_recent(
+                            "virtual_clinic_request_recent_seconds",
+                            endpoint=endpoint,
+                        )
+                    ),
+                ),
+            ]
+
+
+class HealthMonitor:
+    """Poll ``GET /api/health`` in the background and export the results.
+
+    Args:
+        client: The client to check with; its :attr:`~VirtualClinic.metrics`
+            are exported alongside the health metrics.
+        interval: Seconds between checks.
+        buckets: Histogram bucket bounds in seconds.
+
+    A check is ``up`` when the API reports ``ok``, ``degraded`` when it
+    answers but reports ``degraded`` (database unreachable), and ``down``
+    when the request fails. Checks go through :meth:`VirtualClinic.health`,
+    so with a circuit breaker configured, a failed check also opens it.
+    """
+
+    def __init__(
+        self,
+        client: VirtualClinic,
+        *,
+        interval: float = 15.0,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.client = client
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._results: Counter[HealthResult] = Counter()
+        self._check_latency = Histogram(buckets)
+        self._db_latency = Histogram(buckets)
+        self._last: HealthResult | None = None
+        self._last_time: float | None = None
+        self._failures = 0
+        self._poller: Keepalive | None = None
+
+    def check(self) -> HealthResult:
+        """Run one health check now and record it."""
+        started = time.perf_counter()
+        db_latency_ms: int | None = None
+        try:
+            status = self.client.health()
+            result: HealthResult = "up" if status.status == "ok" else "degraded"
+            db_latency_ms = status.db_latency_ms
+        except ServerError as exc:
+            # The API answers 503 with a "degraded" body when the database is down.
+            degraded = (exc.body or {}).get("status") == "degraded"
+            result = "degraded" if degraded else "down"
+        except Exception:
+            result = "down"
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._results[result] += 1
+            self._check_latency.observe(elapsed)
+            if db_latency_ms is not None:
+                self._db_latency.observe(db_latency_ms / 1000)
+            self._last = result
+            self._last_time = time.time()
+            self._failures = 0 if result == "up" else self._failures + 1
+        return result
+
+    @property
+    def last(self) -> HealthResult | None:
+        """Result of the most recent check, ``None`` before the first."""
+        with self._lock:
+            return self._last
+
+    def start(self) -> HealthMonitor:
+        """Run a first check, then keep checking every ``interval`` seconds."""
+        self.stop()
+        self.check()
+        self._poller = Keepalive(
+            self.check, self.interval, name="virtual-clinic-health-monitor"
+        )
+        self._poller.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background checks."""
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
+    def render(self) -> str:
+        """All health and client request metrics in Prometheus text format."""
+        with self._lock:
+            up = 1 if self._last == "up" else 0
+            lines = [
+                *_family(
+                    "virtual_clinic_up",
+                    "gauge",
+                    "1 if the last health check reported ok, else 0.",
+                    [f"virtual_clinic_up {up}"] if self._last is not None else [],
+                ),
+                *_family(
+                    "virtual_clinic_health_checks_total",
+                    "counter",
+                    "Health checks, by result (up, degraded, down).",
+                    (
+                        f"virtual_clinic_health_checks_total"
+                        f"{_labels(result=result)} {self._results[result]}"
+                        for result in ("up", "degraded", "down")
+                    ),
+                ),
+                *_family(
+                    "virtual_clinic_health_consecutive_failures",
+                    "gauge",
+                    "Health checks in a row that were not up.",
+                    [f"virtual_clinic_health_consecutive_failures {self._failures}"],
+                ),
+                *_family(
+                    "virtual_clinic_health_last_check_timestamp_seconds",
+                    "gauge",
+                    "Unix time of the last health check.",
+                    [
+                        "virtual_clinic_health_last_check_timestamp_seconds "
+                        f"{_number(self._last_time)}"
+                    ]
+                    if self._last_time is not None
+                    else [],
+                ),
+                *self._histogram_families(
+                    "virtual_clinic_health_check_duration_seconds",
+                    "Round-trip time of health checks.",
+                    self._check_latency,
+                ),
+                *self._histogram_families(
+                    "virtual_clinic_db_latency_seconds",
+                    "Database latency reported by the health endpoint.",
+                    self._db_latency,
+                ),
+            ]
+        lines.extend(self.client.metrics.render())
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_families(
+        name: str, description: str, histogram: Histogram
+    ) -> list[str]:
+        if not histogram.count:
+            return []
+        recent = name.removesuffix("_seconds") + "_recent_seconds"
+        return [
+            *_family(name, "histogram", description, histogram.render(name)),
+            *_family(
+                recent,
+                "gauge",
+                f"Quantiles of the most recent samples of {name}.",
+                histogram.render_recent(recent),
+            ),
+        ]
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        """Serve :meth:`render` at ``/metrics`` from a background thread.
+
+        Args:
+            host: Interface to bind; the default only accepts local scrapes.
+            port: Port to bind; ``0`` picks a free one (see
+                ``server.server_port``).
+
+        Returns:
+            The running server. Call ``shutdown()`` to stop it.
+        """
+        from http.server import ThreadingHTTPServer
+
+        server = ThreadingHTTPServer((host, port), _handler(self))
+        server.daemon_threads = True
+        thread = threading.Thread(
+            target=server.serve_forever, name="virtual-clinic-metrics", daemon=True
+        )
+        thread.start()
+        return server
+
+    def __enter__(self) -> HealthMonitor:
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+def _handler(monitor: HealthMonitor) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to ``monitor``."""
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            data = monitor.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+            )
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
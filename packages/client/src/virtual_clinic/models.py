@@ -266,6 +266,35 @@ class PatientDetail(BaseModel):
     immunizations: list[Immunization]
 
 
+class PatientChanges(BaseModel):
+    """A patient's EHR records that changed in a time window.
+
+    Returned by ``GET /api/patients/{id}/changes``. A record is included when
+    its ``start``, ``stop`` or ``date`` falls at or after ``since``; records
+    edited without a new date are not included. The demographics, summary and
+    ``fingerprint`` are always current and complete. Apply it to a cached
+    profile with :func:`~virtual_clinic.merge_changes`.
+    """
+
+    model_config = _CamelConfig
+
+    since: str
+    until: str
+    """Server time of the snapshot; the ``since`` of the next refresh."""
+    patient: Patient
+    summary: EHRSummary
+    conditions: list[Condition]
+    medications: list[Medication]
+    allergies: list[Allergy]
+    procedures: list[Procedure]
+    careplans: list[CarePlan]
+    recent_observations: list[Observation]
+    encounters: list[Encounter]
+    immunizations: list[Immunization]
+    fingerprint: str | None = None
+    """Hash of the full current EHR (see :func:`~virtual_clinic.ehr_fingerprint`)."""
+
+
 # ---------------------------------------------------------------------------
 # Conversations
 # ---------------------------------------------------------------------------
@@ -314,6 +343,19 @@ class ConversationWithMessages(BaseModel):
     messages: list[Message]
 
 
+class ConversationSpec(BaseModel):
+    """The parameters of one conversation to create.
+
+    Used by ``conversations.create_many()``.
+    """
+
+    model_config = _CamelConfig
+
+    patient_id: str
+    task_type: TaskType
+    metadata: str | None = None
+
+
 class CreatedConversation(BaseModel):
     """A newly created conversation.
 
@@ -0,0 +1,163 @@
+"""Per-endpoint request policies for the Virtual Clinic client.
+
+Endpoints are identified by the resource method that calls them, e.g.
+``"patients.get"`` or ``"conversations.send_message"``.
+
+Usage::
+
+    from virtual_clinic import (
+        CircuitBreakerPolicy,
+        HedgePolicy,
+        TimeoutPolicy,
+        VirtualClinic,
+    )
+
+    client = VirtualClinic(
+        token="...",
+        timeouts={"patients.list": TimeoutPolicy(read=10.0)},
+        hedge=HedgePolicy(percentile=95.0),
+        circuit_breaker=CircuitBreakerPolicy(failure_rate=0.5),
+    )
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal, get_args
+
+import httpx
+
+Endpoint = Literal[
+    "health",
+    "patients.list",
+    "patients.get",
+    "patients.get_changes",
+    "conversations.list",
+    "conversations.create",
+    "conversations.get",
+    "conversations.send_message",
+]
+"""Name of an API endpoint, as used for policy lookups."""
+
+ENDPOINTS: tuple[str, ...] = get_args(Endpoint)
+"""All endpoint names."""
+
+
+@dataclass(frozen=True)
+class TimeoutPolicy:
+    """Timeouts (in seconds) applied to every request to one endpoint.
+
+    Attributes:
+        connect: Time allowed to establish a connection.
+        read: Time allowed between bytes of the response (i.e. waiting for
+            the server to answer).
+        write: Time allowed to send the request body.
+        pool: Time allowed to wait for a free connection from the pool.
+    """
+
+    connect: float = 5.0
+    read: float = 30.0
+    write: float = 10.0
+    pool: float = 5.0
+
+    @classmethod
+    def uniform(cls, seconds: float) -> TimeoutPolicy:
+        """Build a policy that uses ``seconds`` for every phase."""
+        return cls(connect=seconds, read=seconds, write=seconds, pool=seconds)
+
+    def to_httpx(self) -> httpx.Timeout:
+        """Convert to the equivalent :class:`httpx.Timeout`."""
+        return httpx.Timeout(
+            connect=self.connect,
+            read=self.read,
+            write=self.write,
+            pool=self.pool,
+        )
+
+
+DEFAULT_TIMEOUT_POLICIES: dict[str, TimeoutPolicy] = {
+    "health": TimeoutPolicy(connect=5.0, read=10.0),
+    "patients.list": TimeoutPolicy(),
+    "patients.get": TimeoutPolicy(),
+    "patients.get_changes": TimeoutPolicy(),
+    "conversations.list": TimeoutPolicy(),
+    "conversations.create": TimeoutPolicy(),
+    "conversations.get": TimeoutPolicy(),
+}
+"""Timeouts for endpoints that do not wait on the patient LLM.
+
+Endpoints missing from this mapping (``conversations.send_message``) use the
+client's ``timeout`` argument.
+"""
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Request hedging for idempotent ``GET`` endpoints.
+
+    If the first request has not answered after the endpoint's observed
+    ``percentile`` latency, a second identical request is sent and whichever
+    succeeds first is used. Only the slowest few percent of requests are
+    duplicated, which trims tail latency at a small cost in extra load.
+
+    Attributes:
+        percentile: Latency percentile (0-100) after which to hedge.
+        min_delay: Lower bound on the hedge delay, in seconds.
+        max_delay: Upper bound on the hedge delay, in seconds.
+        min_samples: Successful requests to observe on an endpoint before
+            hedging it. Until then requests are sent once.
+        window: Number of recent latencies kept per endpoint.
+        endpoints: Endpoints that may be hedged. Must be idempotent.
+    """
+
+    percentile: float = 95.0
+    min_delay: float = 0.05
+    max_delay: float = 5.0
+    min_samples: int = 20
+    window: int = 200
+    endpoints: frozenset[str] = frozenset(
+        {
+            "patients.list",
+            "patients.get",
+            "patients.get_changes",
+            "conversations.list",
+            "conversations.get",
+        }
+    )
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """Fail fast while the backend is unhealthy.
+
+    Each endpoint keeps a rolling window of recent calls. A call is *bad* if
+    it failed at the transport level (connection error, timeout), returned a
+    5xx, or took longer than ``slow_call_seconds``. Once at least
+    ``min_calls`` calls are in the window and the bad fraction reaches
+    ``failure_rate``, the endpoint's circuit opens and calls raise
+    :class:`~virtual_clinic.exceptions.CircuitOpenError` without touching the
+    network.
+
+    After ``cooldown`` seconds the circuit is *half-open*: the next call first
+    probes ``GET /api/health``. If the API reports ``ok`` with the database
+    connected and ``db_latency_ms`` within ``max_db_latency_ms``, the circuit
+    closes and the call proceeds; otherwise it stays open for another
+    cooldown. A failed :meth:`~virtual_clinic.VirtualClinic.health` call
+    opens every circuit at once.
+
+    Attributes:
+        failure_rate: Fraction (0-1) of bad calls that opens the circuit.
+        slow_call_seconds: Calls slower than this count as bad. ``None``
+            disables latency-based tripping.
+        window_seconds: Length of the rolling window.
+        min_calls: Calls required in the window before the circuit can open.
+        cooldown: Seconds to stay open before probing.
+        max_db_latency_ms: Highest healthy ``db_latency_ms`` for the probe.
+    """
+
+    failure_rate: float = 0.5
+    slow_call_seconds: float | None = None
+    window_seconds: float = 30.0
+    min_calls: int = 10
+    cooldown: float = 15.0
+    max_db_latency_ms: int = 1000
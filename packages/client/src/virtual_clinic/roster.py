@@ -0,0 +1,266 @@
+"""Local, columnar index of the patient roster.
+
+:class:`RosterIndex` pages through ``GET /api/patients`` once, keeps every
+:class:`~virtual_clinic.models.PatientSummary` field as a column, precomputes
+ages, and builds inverted indexes on the categorical columns. Selecting or
+sampling an evaluation cohort is then a local operation with no API calls.
+
+Usage::
+
+    from virtual_clinic import RosterIndex
+
+    roster = RosterIndex.fetch(client)      # pages the whole roster once
+    roster.save("roster.json")
+
+    roster = RosterIndex.load("roster.json")
+    women_in_ma = roster.select(gender="F", state="Massachusetts", min_age=40)
+    cohort = roster.sample(50, strata=("gender",), age_band=10, seed=0)
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Collection, Iterable, Sequence
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Union
+
+from .models import PatientSummary
+
+if TYPE_CHECKING:
+    from .client import VirtualClinic
+
+COLUMNS: tuple[str, ...] = tuple(PatientSummary.model_fields)
+"""Columns stored by the roster, in :class:`PatientSummary` field order."""
+
+CATEGORICAL: tuple[str, ...] = ("gender", "race", "ethnicity", "city", "state")
+"""Columns with an inverted ``value -> rows`` index."""
+
+_MAX_PAGE_SIZE = 100
+_FORMAT_VERSION = 1
+
+Match = Union[str, Collection[str], None]
+"""A filter value: one value, any of several values, or ``None`` for any."""
+
+
+def age_on(birth_date: str, on: date) -> int:
+    """Return the age in whole years on ``on`` of someone born on ``birth_date``."""
+    born = date.fromisoformat(birth_date[:10])
+    return on.year - born.year - ((on.month, on.day) < (born.month, born.day))
+
+
+class RosterIndex:
+    """Columnar patient roster with demographic filtering and sampling.
+
+    Rows are numbered ``0..len(roster) - 1`` in roster order. Ages are
+    computed once, as of ``as_of`` (or the date of death for deceased
+    patients).
+
+    Args:
+        columns: One list per name in :data:`COLUMNS`, all the same length.
+        as_of: Date to compute ages on. Defaults to today.
+    """
+
+    def __init__(
+        self, columns: dict[str, list[Any]], *, as_of: date | None = None
+    ) -> None:
+        self.columns = {name: list(columns.get(name, ())) for name in COLUMNS}
+        lengths = {len(col) for col in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All roster columns must have the same length")
+        self.as_of = as_of or date.today()
+
+        self.ages = array(
+            "h",
+            (
+                age_on(born, date.fromisoformat(died[:10]) if died else self.as_of)
+                for born, died in zip(
+                    self.columns["birth_date"], self.columns["death_date"]
+                )
+            ),
+        )
+        """Age in years of each row (``array('h')``)."""
+
+        self._by_age = sorted(range(len(self.ages)), key=self.ages.__getitem__)
+        self._sorted_ages = [self.ages[i] for i in self._by_age]
+        self._inverted: dict[str, dict[str, set[int]]] = {}
+        for name in CATEGORICAL:
+            index: dict[str, set[int]] = {}
+            for row, value in enumerate(self.columns[name]):
+                index.setdefault(value or "", set()).add(row)
+            self._inverted[name] = index
+        self._row_by_id = {pid: row for row, pid in enumerate(self.columns["id"])}
+
+    # -- construction ---------------------------------------------------------
+
+    @classmethod
+    def from_summaries(
+        cls, summaries: Iterable[PatientSummary], *, as_of: date | None = None
+    ) -> RosterIndex:
+        """Build a roster from :class:`PatientSummary` objects."""
+        columns: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+        for summary in summaries:
+            for name in COLUMNS:
+                columns[name].append(getattr(summary, name))
+        return cls(columns, as_of=as_of)
+
+    @classmethod
+    def fetch(
+        cls,
+        client: VirtualClinic,
+        *,
+        page_size: int = _MAX_PAGE_SIZE,
+        as_of: date | None = None,
+    ) -> RosterIndex:
+        """Page through ``GET /api/patients`` and build a roster (admin only)."""
+        summaries: list[PatientSummary] = []
+        page = 1
+        while True:
+            result = client.patients.list(page=page, limit=page_size)
+            summaries.extend(result.data)
+            if page >= result.pagination.total_pages:
+                break
+            page += 1
+        return cls.from_summaries(summaries, as_of=as_of)
+
+    @classmethod
+    def load(cls, path: str | Path, *, as_of: date | None = None) -> RosterIndex:
+        """Load a roster written by :meth:`save`."""
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        if payload.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported roster file format: {path}")
+        return cls(payload["columns"], as_of=as_of)
+
+    def save(self, path: str | Path) -> None:
+        """Write the roster columns to ``path`` as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": _FORMAT_VERSION, "columns": self.columns}
+        path.write_text(json.dumps(payload), encoding="utf-8")
+
+    # -- access ---------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def row(self, index: int) -> PatientSummary:
+        """Return row ``index`` as a :class:`PatientSummary`."""
+        return PatientSummary(**{name: self.columns[name][index] for name in COLUMNS})
+
+    def rows(self, indices: Iterable[int]) -> list[PatientSummary]:
+        """Return the given rows as :class:`PatientSummary` objects."""
+        return [self.row(i) for i in indices]
+
+    def get(self, patient_id: str) -> PatientSummary | None:
+        """Look up a patient by id."""
+        row = self._row_by_id.get(patient_id)
+        return None if row is None else self.row(row)
+
+    def values(self, column: str) -> dict[str, int]:
+        """Return ``{value: row_count}`` for a categorical column."""
+        return {
+            value: len(rows) for value, rows in sorted(self._inverted[column].items())
+        }
+
+    # -- queries --------------------------------------------------------------
+
+    def filter(
+        self,
+        *,
+        gender: Match = None,
+        race: Match = None,
+        ethnicity: Match = None,
+        city: Match = None,
+        state: Match = None,
+        min_age: int | None = None,
+        max_age: int | None = None,
+        alive: bool | None = None,
+    ) -> list[int]:
+        """Return the matching row indices, in roster order.
+
+        Categorical filters accept one value or a collection of values
+        (matched exactly). Age bounds are inclusive.
+        """
+        stages: list[set[int]] = []
+        for name, match in (
+            ("gender", gender),
+            ("race", race),
+            ("ethnicity", ethnicity),
+            ("city", city),
+            ("state", state),
+        ):
+            if match is None:
+                continue
+            wanted = [match] if isinstance(match, str) else match
+            index = self._inverted[name]
+            stages.append(set[int]().union(*(index.get(v, set[int]()) for v in wanted)))
+
+        if min_age is not None or max_age is not None:
+            lo = bisect_left(self._sorted_ages, min_age) if min_age is not None else 0
+            hi = (
+                bisect_right(self._sorted_ages, max_age)
+                if max_age is not None
+                else len(self._sorted_ages)
+            )
+            stages.append(set(self._by_age[lo:hi]))
+
+        if stages:
+            rows = stages[0].intersection(*stages[1:])
+        else:
+            rows = set(range(len(self)))
+        if alive is not None:
+            deaths = self.columns["death_date"]
+            rows = {row for row in rows if (deaths[row] is None) == alive}
+        return sorted(rows)
+
+    def select(self, **filters: Any) -> list[PatientSummary]:
+        """Like :meth:`filter`, but return :class:`PatientSummary` objects."""
+        return self.rows(self.filter(**filters))
+
+    def sample(
+        self,
+        n: int,
+        *,
+        strata: Sequence[str] = (),
+        age_band: int | None = None,
+        seed: int | None = None,
+        **filters: Any,
+    ) -> list[PatientSummary]:
+        """Draw up to ``n`` patients, stratified by demographic columns.
+
+        Each stratum receives a share of ``n`` proportional to its size
+        (largest-remainder rounding), sampled without replacement.
+
+        Args:
+            n: Number of patients to draw.
+            strata: Columns to stratify by (e.g. ``("gender", "state")``).
+            age_band: Also stratify by age bands of this many years.
+            seed: Seed for reproducible draws.
+            **filters: Restrict the population first; see :meth:`filter`.
+        """
+        rng = random.Random(seed)
+        population = self.filter(**filters)
+        groups: dict[tuple[Any, ...], list[int]] = {}
+        for row in population:
+            key = tuple(self.columns[c][row] for c in strata)
+            if age_band:
+                key += (self.ages[row] // age_band,)
+            groups.setdefault(key, []).append(row)
+
+        total = len(population)
+        n = min(n, total)
+        if n == 0:
+            return []
+        quotas = {key: n * len(rows) / total for key, rows in groups.items()}
+        alloc = {key: int(q) for key, q in quotas.items()}
+        leftover = n - sum(alloc.values())
+        for key in sorted(quotas, key=lambda k: alloc[k] - quotas[k])[:leftover]:
+            alloc[key] += 1
+
+        chosen: list[int] = []
+        for key, rows in groups.items():
+            chosen.extend(rng.sample(rows, alloc[key]))
+        return self.rows(sorted(chosen))
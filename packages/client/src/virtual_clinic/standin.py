@@ -0,0 +1,917 @@
+"""In-process stand-in for the Virtual Clinic API, for load testing.
+
+:class:`StandIn` implements the REST routes (``/api/health``,
+``/api/patients``, ``/api/conversations`` and ``.../messages``) in memory.
+Simulated patients answer with templated, rule-based replies drawn from their
+EHR instead of calling an LLM, and each endpoint can be given a latency
+distribution (and an error rate), so a harness can drive
+:class:`~virtual_clinic.VirtualClinic` or the CLI at thousands of turns per
+second without a database, an LLM deployment or a network.
+
+Usage::
+
+    from virtual_clinic import VirtualClinic
+    from virtual_clinic.standin import LatencyModel, StandIn, synthetic_patients
+
+    standin = StandIn(
+        synthetic_patients(100, seed=0),
+        latency={"conversations.send_message": LatencyModel(median=0.8, p99=4.0)},
+    )
+
+    # In-process: no sockets at all
+    client = VirtualClinic(token="test", transport=standin.transport())
+
+    # Over HTTP, for the CLI or other processes
+    server = standin.serve(port=8787)  # http://127.0.0.1:8787
+    ...
+    server.shutdown()
+
+Run ``python -m virtual_clinic.standin --patients 200 --port 8787`` to serve
+synthetic patients from the command line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, cast
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+from ._messagelog import parse_timestamp
+from .ehr_changes import ehr_fingerprint
+from .models import PatientDetail
+from .policies import Endpoint
+
+_Z99 = 2.3263478740408408
+"""99th percentile of the standard normal distribution."""
+
+_MAX_PAGE_SIZE = 100
+_MAX_MESSAGE_LENGTH = 4096
+_TASK_TYPES = ("diagnosis", "treatment", "event")
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Log-normal response-time distribution for one endpoint, in seconds.
+
+    Args:
+        median: Median latency. ``0`` disables the delay.
+        p99: 99th percentile latency. ``None`` (or a value not above
+            ``median``) makes every response take exactly ``median``.
+        error_rate: Fraction of requests answered with a ``503``.
+    """
+
+    median: float = 0.0
+    p99: float | None = None
+    error_rate: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency."""
+        if self.median <= 0:
+            return 0.0
+        if self.p99 is None or self.p99 <= self.median:
+            return self.median
+        sigma = math.log(self.p99 / self.median) / _Z99
+        return rng.lognormvariate(math.log(self.median), sigma)
+
+
+Responder = Callable[[dict[str, Any], list[dict[str, Any]], str], str]
+"""Produces a patient's reply: ``(detail_json, messages_so_far, question) -> reply``.
+
+``detail_json`` is the patient's camelCase ``PatientDetail`` JSON and
+``messages_so_far`` excludes the question being answered.
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds").replace(
+        "+00:00", "Z"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Rule-based replies
+# ---------------------------------------------------------------------------
+
+_SEMANTIC_TAG = re.compile(r"\s*\([^)]*\)\s*$")
+
+
+def _clean(description: str) -> str:
+    """Drop the SNOMED semantic tag and lowercase for use mid-sentence."""
+    return _SEMANTIC_TAG.sub("", description).lower()
+
+
+def _join(items: Iterable[str], limit: int = 4) -> str:
+    """``"a, b and c"``, de-duplicated and capped at ``limit`` items."""
+    unique = list(dict.fromkeys(items))[:limit]
+    if len(unique) <= 1:
+        return "".join(unique)
+    return f"{', '.join(unique[:-1])} and {unique[-1]}"
+
+
+def _active(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [r for r in records if not r.get("stop")]
+
+
+def _complaint(detail: dict[str, Any]) -> str:
+    active = sorted(_active(detail["conditions"]), key=lambda r: r["start"])
+    if active:
+        return f"I've been having trouble with my {_clean(active[-1]['description'])}."
+    reasons = [
+        e["reasonDescription"] for e in detail["encounters"] if e.get("reasonDescription")
+    ]
+    if reasons:
+        return f"I came in because of {_clean(reasons[-1])}."
+    return "Nothing in particular, doctor. I'm just here for a check-up."
+
+
+def _conditions(detail: dict[str, Any]) -> str:
+    names = [_clean(r["description"]) for r in detail["conditions"]]
+    if not names:
+        return "Nothing serious that I know of."
+    return f"I've been told I have {_join(reversed(names))}."
+
+
+def _medications(detail: dict[str, Any]) -> str:
+    names = [_clean(r["description"]) for r in _active(detail["medications"])]
+    if not names:
+        return "I'm not taking any medications right now."
+    return f"I take {_join(names)}."
+
+
+def _allergies(detail: dict[str, Any]) -> str:
+    names = [_clean(r["description"]) for r in detail["allergies"]]
+    if not names:
+        return "No allergies that I know of."
+    return f"I'm allergic to {_join(names)}."
+
+
+def _procedures(detail: dict[str, Any]) -> str:
+    names = [_clean(r["description"]) for r in detail["procedures"]]
+    if not names:
+        return "I haven't had any operations or procedures."
+    return f"I've had {_join(reversed(names), limit=3)}."
+
+
+def _immunizations(detail: dict[str, Any]) -> str:
+    names = [_clean(r["description"]) for r in detail["immunizations"]]
+    if not names:
+        return "I don't remember getting any vaccines recently."
+    return f"I've had my {_join(reversed(names), limit=3)} shots."
+
+
+def _events(detail: dict[str, Any]) -> str:
+    visits = [
+        e
+        for e in detail["encounters"]
+        if e.get("encounterClass") in ("emergency", "inpatient", "urgentcare")
+    ]
+    if not visits:
+        return "I haven't been to the hospital or the ER."
+    last = visits[-1]
+    reason = last.get("reasonDescription") or last.get("description") or "a problem"
+    return f"I went to the hospital in {last['start'][:4]} because of {_clean(reason)}."
+
+
+_RULES: tuple[tuple[tuple[str, ...], Callable[[dict[str, Any]], str]], ...] = (
+    (("allerg", "reaction"), _allergies),
+    (("medication", "medicine", "pill", "prescri", "drug", "taking"), _medications),
+    (("vaccin", "immuniz", "shot"), _immunizations),
+    (("surgery", "operation", "procedure"), _procedures),
+    (("hospital", "emergency", " er ", "admitted"), _events),
+    (("history", "condition", "diagnos", "medical problem"), _conditions),
+    (
+        ("bring", "brought", "symptom", "feel", "problem", "wrong", "concern", "help"),
+        _complaint,
+    ),
+)
+
+
+def templated_reply(
+    detail: dict[str, Any], messages: list[dict[str, Any]], question: str
+) -> str:
+    """Default :data:`Responder`: answer from the EHR by keyword rules.
+
+    The first question always gets the chief complaint (the most recent
+    active condition); later ones are matched against keywords for
+    allergies, medications, immunizations, procedures, hospital visits and
+    medical history.
+    """
+    if not messages:
+        return _complaint(detail)
+    text = f" {question.lower()} "
+    for keywords, answer in _RULES:
+        if any(k in text for k in keywords):
+            return answer(detail)
+    return "I'm not sure, doctor. Could you ask that another way?"
+
+
+# ---------------------------------------------------------------------------
+# Stand-in server
+# ---------------------------------------------------------------------------
+
+_ROUTES: tuple[tuple[str, re.Pattern[str], Endpoint], ...] = (
+    ("GET", re.compile(r"^/api/health$"), "health"),
+    ("GET", re.compile(r"^/api/patients$"), "patients.list"),
+    ("GET", re.compile(r"^/api/patients/(?P<id>[^/]+)$"), "patients.get"),
+    (
+        "GET",
+        re.compile(r"^/api/patients/(?P<id>[^/]+)/changes$"),
+        "patients.get_changes",
+    ),
+    ("GET", re.compile(r"^/api/conversations$"), "conversations.list"),
+    ("POST", re.compile(r"^/api/conversations$"), "conversations.create"),
+    ("GET", re.compile(r"^/api/conversations/(?P<id>[^/]+)$"), "conversations.get"),
+    (
+        "POST",
+        re.compile(r"^/api/conversations/(?P<id>[^/]+)/messages$"),
+        "conversations.send_message",
+    ),
+)
+
+_RECORD_KINDS = (
+    "conditions", "medications", "allergies", "procedures", "careplans",
+    "recentObservations", "encounters", "immunizations",
+)  # fmt: skip
+
+_SUMMARY_FIELDS = (
+    "id", "first", "last", "birthDate", "deathDate", "gender", "race",
+    "ethnicity", "city", "state",
+)  # fmt: skip
+
+Reply = tuple[int, dict[str, Any]]
+
+
+def _page(params: Mapping[str, str]) -> tuple[int, int]:
+    try:
+        page = max(1, int(params.get("page", 1)))
+        limit = min(_MAX_PAGE_SIZE, max(1, int(params.get("limit", 20))))
+    except ValueError:
+        page, limit = 1, 20
+    return page, limit
+
+
+def _paginated(rows: list[dict[str, Any]], params: Mapping[str, str]) -> Reply:
+    page, limit = _page(params)
+    start = (page - 1) * limit
+    return 200, {
+        "data": rows[start : start + limit],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": len(rows),
+            "totalPages": math.ceil(len(rows) / limit),
+        },
+    }
+
+
+def _validation_error(field: str, message: str) -> Reply:
+    return 400, {"error": "Validation error", "details": {field: [message]}}
+
+
+class StandIn:
+    """In-memory implementation of the Virtual Clinic API.
+
+    Args:
+        patients: Patients to serve.
+        latency: Per-endpoint :class:`LatencyModel`, keyed by endpoint name
+            (see :data:`~virtual_clinic.policies.Endpoint`). Endpoints not
+            listed respond immediately.
+        responder: Produces the patient's replies. Defaults to
+            :func:`templated_reply`.
+        token: If set, conversation and patient routes require
+            ``Authorization: Bearer <token>``. Any token is accepted otherwise.
+        seed: Seed for latency and error sampling.
+
+    All state lives in memory and is lost when the object is discarded.
+    Requests may be handled concurrently from any number of threads.
+    """
+
+    def __init__(
+        self,
+        patients: Iterable[PatientDetail],
+        *,
+        latency: Mapping[str, LatencyModel] | None = None,
+        responder: Responder = templated_reply,
+        token: str | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self._patients: dict[str, dict[str, Any]] = {}
+        for detail in patients:
+            data = detail.model_dump(mode="json", by_alias=True)
+            self._patients[detail.patient.id] = data
+        self._summaries = [
+            {k: d["patient"].get(k) for k in _SUMMARY_FIELDS}
+            for d in self._patients.values()
+        ]
+        self._latency = dict(latency or {})
+        self._responder = responder
+        self._token = token
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._conversations: dict[str, dict[str, Any]] = {}
+        self._messages: dict[str, list[dict[str, Any]]] = {}
+
+    # -- entry points ---------------------------------------------------------
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Mapping[str, str] | None = None,
+        body: Any = None,
+        authorization: str | None = None,
+    ) -> Reply:
+        """Handle one request and return ``(status_code, json_body)``.
+
+        Sleeps for the endpoint's sampled latency before answering.
+        """
+        params = params or {}
+        for route_method, pattern, endpoint in _ROUTES:
+            match = pattern.match(path)
+            if match is None or route_method != method:
+                continue
+            model = self._latency.get(endpoint)
+            if model is not None:
+                with self._rng_lock:
+                    delay = model.sample(self._rng)
+                    failed = self._rng.random() < model.error_rate
+                if delay:
+                    time.sleep(delay)
+                if failed:
+                    return 503, {"error": "Simulated failure"}
+            if endpoint != "health" and not self._authorized(authorization):
+                return 401, {
+                    "error": "Unauthorized — provide a valid Bearer token "
+                    "in the Authorization header"
+                }
+            return self._dispatch(endpoint, match.groupdict().get("id"), params, body)
+        return 404, {"error": f"No route for {method} {path}"}
+
+    def transport(self) -> httpx.MockTransport:
+        """Return an httpx transport that answers requests in-process.
+
+        Pass it to ``VirtualClinic(transport=...)``.
+        """
+        return httpx.MockTransport(self._handle_httpx)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """Serve the API over HTTP from a background thread.
+
+        Args:
+            host: Interface to bind.
+            port: Port to bind; ``0`` picks a free one (see
+                ``server.server_port``).
+
+        Returns:
+            The running server. Call ``shutdown()`` to stop it.
+        """
+        server = ThreadingHTTPServer((host, port), _handler(self))
+        server.daemon_threads = True
+        thread = threading.Thread(
+            target=server.serve_forever, name="virtual-clinic-standin", daemon=True
+        )
+        thread.start()
+        return server
+
+    def update_patient(self, detail: PatientDetail) -> None:
+        """Add a patient or replace their profile, e.g. to simulate new EHR data.
+
+        Records changed by the update are returned by ``patients.get_changes``
+        when their ``start``, ``stop`` or ``date`` is after its ``since``;
+        other edits only change the fingerprint, like on the real API.
+        """
+        data = detail.model_dump(mode="json", by_alias=True)
+        summary = {k: data["patient"].get(k) for k in _SUMMARY_FIELDS}
+        with self._lock:
+            self._patients[detail.patient.id] = data
+            self._summaries = [
+                s for s in self._summaries if s["id"] != detail.patient.id
+            ] + [summary]
+
+    def handle_raw(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, str],
+        raw: bytes,
+        authorization: str | None,
+    ) -> Reply:
+        """Like :meth:`handle`, for a request body that is still raw bytes.
+
+        Answers 400 if the body is not valid JSON.
+        """
+        try:
+            body = json.loads(raw) if raw else None
+        except json.JSONDecodeError:
+            return 400, {"error": "Invalid JSON body"}
+        return self.handle(
+            method, path, params=params, body=body, authorization=authorization
+        )
+
+    # -- adapters -------------------------------------------------------------
+
+    def _handle_httpx(self, request: httpx.Request) -> httpx.Response:
+        status, payload = self.handle_raw(
+            request.method,
+            request.url.path,
+            dict(request.url.params),
+            request.content,
+            request.headers.get("authorization"),
+        )
+        return httpx.Response(status, json=payload)
+
+    def _authorized(self, authorization: str | None) -> bool:
+        if not authorization or not authorization.startswith("Bearer "):
+            return False
+        return self._token is None or authorization[7:] == self._token
+
+    # -- routes ---------------------------------------------------------------
+
+    def _dispatch(
+        self,
+        endpoint: Endpoint,
+        item_id: str | None,
+        params: Mapping[str, str],
+        body: Any,
+    ) -> Reply:
+        if endpoint == "health":
+            return 200, {
+                "status": "ok",
+                "service": "virtual-clinic-standin",
+                "timestamp": _now(),
+                "database": "connected",
+                "dbLatencyMs": 0,
+            }
+        if endpoint == "patients.list":
+            return _paginated(self._summaries, params)
+        if endpoint == "patients.get":
+            detail = self._patients.get(item_id or "")
+            if detail is None:
+                return 404, {"error": "Patient not found"}
+            return 200, {"data": detail}
+        if endpoint == "patients.get_changes":
+            return self._patient_changes(item_id or "", params.get("since"))
+        if endpoint == "conversations.list":
+            return self._list_conversations(params)
+        if endpoint == "conversations.create":
+            return self._create_conversation(body)
+        if endpoint == "conversations.get":
+            return self._get_conversation(item_id or "", params.get("after"))
+        return self._send_message(item_id or "", body)
+
+    def _patient_changes(self, patient_id: str, since_param: str | None) -> Reply:
+        since = parse_timestamp(since_param) if since_param else None
+        if since is None:
+            return _validation_error("since", "Expected an ISO 8601 timestamp")
+        until = _now()
+        detail = self._patients.get(patient_id)
+        if detail is None:
+            return 404, {"error": "Patient not found"}
+
+        def changed(record: dict[str, Any]) -> bool:
+            for field in ("start", "stop", "date"):
+                value = record.get(field)
+                when = parse_timestamp(value) if value else None
+                if when is not None and when >= since:
+                    return True
+            return False
+
+        data: dict[str, Any] = {
+            "since": since.isoformat().replace("+00:00", "Z"),
+            "until": until,
+            "patient": detail["patient"],
+            "summary": detail["summary"],
+        }
+        for kind in _RECORD_KINDS:
+            data[kind] = [r for r in detail[kind] if changed(r)]
+        data["fingerprint"] = ehr_fingerprint(detail)
+        return 200, {"data": data}
+
+    def _list_conversations(self, params: Mapping[str, str]) -> Reply:
+        patient_id = params.get("patientId")
+        task_type = params.get("taskType")
+        if task_type not in _TASK_TYPES:
+            task_type = None
+        with self._lock:
+            rows = [
+                dict(c)
+                for c in reversed(self._conversations.values())
+                if (patient_id is None or c["patientId"] == patient_id)
+                and (task_type is None or c["taskType"] == task_type)
+            ]
+        return _paginated(rows, params)
+
+    def _create_conversation(self, body: Any) -> Reply:
+        if not isinstance(body, dict):
+            return _validation_error("patientId", "Required")
+        fields = cast("dict[str, Any]", body)
+        patient_id: Any = fields.get("patientId")
+        task_type: Any = fields.get("taskType")
+        try:
+            uuid.UUID(str(patient_id))
+        except ValueError:
+            return _validation_error("patientId", "patientId must be a valid UUID")
+        if task_type not in _TASK_TYPES:
+            return _validation_error(
+                "taskType",
+                "Invalid enum value. Expected 'diagnosis' | 'treatment' | 'event'",
+            )
+        detail = self._patients.get(str(patient_id))
+        if detail is None:
+            return 404, {"error": f"Patient {patient_id} not found"}
+
+        patient = detail["patient"]
+        created = _now()
+        conversation: dict[str, Any] = {
+            "id": str(uuid.uuid4()),
+            "patientId": patient_id,
+            "patientName": f"{patient['first']} {patient['last']}",
+            "taskType": task_type,
+            "createdAt": created,
+            "updatedAt": created,
+            "metadata": fields.get("metadata"),
+        }
+        with self._lock:
+            self._conversations[conversation["id"]] = conversation
+            self._messages[conversation["id"]] = []
+        return 201, {
+            "data": {
+                k: conversation[k]
+                for k in ("id", "patientId", "taskType", "patientName", "createdAt")
+            }
+        }
+
+    def _get_conversation(self, conversation_id: str, after: str | None) -> Reply:
+        with self._lock:
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None:
+                return 404, {"error": "Conversation not found"}
+            messages = list(self._messages[conversation_id])
+        if after:
+            # Like the API: a message id stands for its creation time, so
+            # messages sharing that timestamp are returned again (except the
+            # cursor itself) and the client deduplicates them.
+            cursor = next((m for m in messages if m["id"] == after), None)
+            if cursor is not None:
+                since = parse_timestamp(cursor["createdAt"])
+            else:
+                try:
+                    uuid.UUID(after)
+                except ValueError:
+                    pass
+                else:
+                    return 404, {
+                        "error": f"Message {after} not found in this conversation"
+                    }
+                since = parse_timestamp(after)
+                if since is None:
+                    return _validation_error(
+                        "after", "Expected a message id or an ISO timestamp"
+                    )
+            messages = [
+                m
+                for m in messages
+                if m["id"] != after
+                and (created := parse_timestamp(m["createdAt"])) is not None
+                and since is not None
+                and created >= since
+            ]
+        return 200, {"data": {**conversation, "messages": messages}}
+
+    def _send_message(self, conversation_id: str, body: Any) -> Reply:
+        fields = cast("dict[str, Any]", body) if isinstance(body, dict) else {}
+        content = fields.get("content")
+        if not isinstance(content, str) or not content:
+            return _validation_error("content", "Message content cannot be empty")
+        if len(content) > _MAX_MESSAGE_LENGTH:
+            return _validation_error(
+                "content", "Message content too long (max 4096 characters)"
+            )
+
+        with self._lock:
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None:
+                return 404, {"error": f"Conversation {conversation_id} not found"}
+            history = list(self._messages[conversation_id])
+            detail = self._patients[conversation["patientId"]]
+
+        reply = self._responder(detail, history, content)
+
+        with self._lock:
+            messages = self._messages[conversation_id]
+            for role, text in (("user", content), ("assistant", reply)):
+                messages.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "role": role,
+                        "content": text,
+                        "createdAt": _now(),
+                    }
+                )
+            conversation["updatedAt"] = messages[-1]["createdAt"]
+        return 200, {
+            "data": {
+                "conversationId": conversation_id,
+                "role": "assistant",
+                "content": reply,
+            }
+        }
+
+
+def _handler(standin: StandIn) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to ``standin``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            self._respond("GET")
+
+        def do_POST(self) -> None:
+            self._respond("POST")
+
+        def _respond(self, method: str) -> None:
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            status, payload = standin.handle_raw(
+                method,
+                url.path,
+                dict(parse_qsl(url.query)),
+                raw,
+                self.headers.get("Authorization"),
+            )
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+# ---------------------------------------------------------------------------
+# Synthetic patients
+# ---------------------------------------------------------------------------
+
+_FIRST = {
+    "F": ("Maria", "Aisha", "Linda", "Mei", "Sofia", "Grace", "Fatima", "Emily"),
+    "M": ("James", "Wei", "Carlos", "David", "Omar", "Michael", "Kenji", "Samuel"),
+}
+_LAST = ("Smith", "Garcia", "Nguyen", "Johnson", "Khan", "Brown", "Lopez", "Kim", "Davis")
+_PLACES = (
+    ("Boston", "Massachusetts"),
+    ("Worcester", "Massachusetts"),
+    ("Springfield", "Massachusetts"),
+    ("Cambridge", "Massachusetts"),
+    ("Lowell", "Massachusetts"),
+)
+_RACES = ("white", "black", "asian", "hispanic", "other")
+_CONDITIONS = (
+    ("44054006", "Diabetes mellitus type 2 (disorder)"),
+    ("59621000", "Essential hypertension (disorder)"),
+    ("195967001", "Asthma (disorder)"),
+    ("55822004", "Hyperlipidemia (disorder)"),
+    ("35489007", "Depressive disorder (disorder)"),
+    ("69896004", "Rheumatoid arthritis (disorder)"),
+    ("40055000", "Chronic sinusitis (disorder)"),
+    ("37320007", "Migraine (disorder)"),
+    ("230690007", "Cerebrovascular accident (disorder)"),
+    ("13645005", "Chronic obstructive lung disease (disorder)"),
+)
+_MEDICATIONS = (
+    ("860975", "24 HR Metformin hydrochloride 500 MG Extended Release Oral Tablet", "44054006"),
+    ("314076", "lisinopril 10 MG Oral Tablet", "59621000"),
+    ("895994", "120 ACTUAT Fluticasone propionate 0.044 MG/ACTUAT Metered Dose Inhaler", "195967001"),
+    ("259255", "atorvastatin 80 MG Oral Tablet", "55822004"),
+    ("312938", "sertraline 100 MG Oral Tablet", "35489007"),
+    ("310965", "Ibuprofen 200 MG Oral Tablet", "69896004"),
+    ("1870230", "NDA020800 0.3 ML Epinephrine 1 MG/ML Auto-Injector", ""),
+)
+_ALLERGIES = (
+    ("7980", "Penicillin V"),
+    ("300916003", "Latex allergy (finding)"),
+    ("91935009", "Allergy to peanuts (finding)"),
+    ("419474003", "Allergy to mould (finding)"),
+)
+_PROCEDURES = (
+    ("73761001", "Colonoscopy (procedure)"),
+    ("80146002", "Appendectomy (procedure)"),
+    ("232717009", "Coronary artery bypass grafting (procedure)"),
+    ("23426006", "Measurement of respiratory function (procedure)"),
+)
+_IMMUNIZATIONS = (
+    ("140", "Influenza  seasonal  injectable  preservative free"),
+    ("113", "Td (adult) preservative free"),
+    ("133", "Pneumococcal conjugate PCV 13"),
+    ("208", "SARS-COV-2 (COVID-19) vaccine  mRNA  spike protein  LNP  preservative free  30 mcg/0.3mL dose"),
+)
+_ENCOUNTER_CLASSES = ("wellness", "ambulatory", "outpatient", "emergency", "inpatient")
+
+
+def _day(rng: random.Random, start: date, stop: date) -> str:
+    return (start + timedelta(days=rng.randrange(max(1, (stop - start).days)))).isoformat()
+
+
+def synthetic_patient(rng: random.Random) -> PatientDetail:
+    """Generate one plausible patient with a small random EHR."""
+    pid = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    gender = rng.choice(("F", "M"))
+    today = date.today()
+    born = today - timedelta(days=rng.randrange(18 * 365, 90 * 365))
+    city, state = rng.choice(_PLACES)
+
+    encounters: list[dict[str, Any]] = []
+    for _ in range(rng.randint(2, 8)):
+        start = _day(rng, born + timedelta(days=18 * 365), today)
+        encounters.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "start": f"{start}T09:00:00Z",
+                "stop": f"{start}T10:00:00Z",
+                "patientId": pid,
+                "encounterClass": rng.choice(_ENCOUNTER_CLASSES),
+                "code": "185349003",
+                "description": "Encounter for check up (procedure)",
+            }
+        )
+    encounters.sort(key=lambda e: e["start"])
+
+    def dated(code: str, description: str, **extra: Any) -> dict[str, Any]:
+        return {
+            "start": _day(rng, born + timedelta(days=18 * 365), today),
+            "stop": None,
+            "patientId": pid,
+            "code": code,
+            "description": description,
+            **extra,
+        }
+
+    conditions = [dated(c, d) for c, d in rng.sample(_CONDITIONS, rng.randint(1, 4))]
+    for record in conditions:
+        if rng.random() < 0.3:
+            record["stop"] = _day(rng, date.fromisoformat(record["start"]), today)
+    active_codes = {c["code"] for c in conditions if not c["stop"]}
+    medications = [
+        dated(code, description, reasonCode=reason or None)
+        for code, description, reason in _MEDICATIONS
+        if reason in active_codes or (not reason and rng.random() < 0.1)
+    ]
+    allergies = [dated(c, d) for c, d in rng.sample(_ALLERGIES, rng.randint(0, 2))]
+    procedures = [dated(c, d) for c, d in rng.sample(_PROCEDURES, rng.randint(0, 2))]
+    immunizations = [
+        {"date": f"{_day(rng, today - timedelta(days=3650), today)}T09:00:00Z",
+         "patientId": pid, "code": c, "description": d}
+        for c, d in rng.sample(_IMMUNIZATIONS, rng.randint(1, 3))
+    ]  # fmt: skip
+    for visit in encounters:
+        if visit["encounterClass"] in ("emergency", "inpatient"):
+            _, reason = rng.choice(_CONDITIONS)
+            visit["reasonDescription"] = reason
+
+    return PatientDetail.model_validate(
+        {
+            "patient": {
+                "id": pid,
+                "first": rng.choice(_FIRST[gender]),
+                "last": rng.choice(_LAST),
+                "birthDate": born.isoformat(),
+                "gender": gender,
+                "race": rng.choice(_RACES),
+                "ethnicity": rng.choice(("nonhispanic", "hispanic")),
+                "city": city,
+                "state": state,
+            },
+            "summary": {
+                "conditionsCount": len(conditions),
+                "activeConditions": [
+                    c["description"] for c in conditions if not c["stop"]
+                ],
+                "medicationsCount": len(medications),
+                "activeMedications": [m["description"] for m in medications],
+                "allergiesCount": len(allergies),
+                "allergies": [a["description"] for a in allergies],
+                "encountersCount": len(encounters),
+                "proceduresCount": len(procedures),
+                "immunizationsCount": len(immunizations),
+                "activeCareplanCount": 0,
+            },
+            "conditions": conditions,
+            "medications": medications,
+            "allergies": allergies,
+            "procedures": procedures,
+            "careplans": [],
+            "recentObservations": [],
+            "encounters": encounters,
+            "immunizations": immunizations,
+        }
+    )
+
+
+def synthetic_patients(n: int, *, seed: int | None = None) -> list[PatientDetail]:
+    """Generate ``n`` synthetic patients (reproducibly, given a ``seed``)."""
+    rng = random.Random(seed)
+    return [synthetic_patient(rng) for _ in range(n)]
+
+
+def load_patients(directory: str | Path) -> list[PatientDetail]:
+    """Load cached ``PatientDetail`` JSON files (``<patient_id>.json``)."""
+    return [
+        PatientDetail.model_validate_json(path.read_text(encoding="utf-8"))
+        for path in sorted(Path(directory).glob("*.json"))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+
+def parse_latency(value: str) -> tuple[str, LatencyModel]:
+    """Parse ``ENDPOINT=MEDIAN[:P99[:ERROR_RATE]]`` (seconds) into a latency model.
+
+    Raises:
+        ValueError: If ``value`` is malformed.
+    """
+    endpoint, _, spec = value.partition("=")
+    parts = [float(p) for p in spec.split(":")] if spec else []
+    if not endpoint or not 1 <= len(parts) <= 3:
+        raise ValueError(f"expected ENDPOINT=MEDIAN[:P99[:ERROR_RATE]], got {value!r}")
+    return endpoint, LatencyModel(
+        median=parts[0],
+        p99=parts[1] if len(parts) > 1 else None,
+        error_rate=parts[2] if len(parts) > 2 else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve a stand-in API until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="python -m virtual_clinic.standin",
+        description="Serve an in-memory stand-in of the Virtual Clinic API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument(
+        "--patients", type=int, default=100, help="Synthetic patients to generate."
+    )
+    parser.add_argument(
+        "--patients-dir",
+        type=Path,
+        help="Serve cached PatientDetail JSON files instead of synthetic patients.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--token", help="Require this bearer token.")
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        action="append",
+        default=[],
+        metavar="ENDPOINT=MEDIAN[:P99[:ERROR_RATE]]",
+        help="Latency in seconds for an endpoint (repeatable).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.patients_dir is not None:
+        patients = load_patients(args.patients_dir)
+    else:
+        patients = synthetic_patients(args.patients, seed=args.seed)
+    standin = StandIn(
+        patients, latency=dict(args.latency), token=args.token, seed=args.seed
+    )
+    server = standin.serve(args.host, args.port)
+    print(
+        f"Serving {len(patients)} patients on "
+        f"http://{args.host}:{server.server_port} (Ctrl-C to stop)"
+    )
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+import httpx
+import pytest
+
+from virtual_clinic import VirtualClinic
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import StandIn, synthetic_patients
+
+
+class CountingTransport(httpx.BaseTransport):
+    """Wraps a stand-in transport, counting requests and optionally delaying them.
+
+    ``delay(request, n)`` returns the seconds to sleep before answering the
+    ``n``-th request (1-based) to the same path. Like a real transport, a
+    delay longer than the request's read timeout raises ``httpx.ReadTimeout``
+    once the timeout has passed.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.BaseTransport,
+        delay: Callable[[httpx.Request, int], float] | None = None,
+    ) -> None:
+        self.inner = inner
+        self.delay = delay
+        self.counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            n = self.counts[request.url.path] = self.counts.get(request.url.path, 0) + 1
+        if self.delay is not None:
+            delay = self.delay(request, n)
+            read = request.extensions.get("timeout", {}).get("read")
+            if read is not None and delay > read:
+                time.sleep(read)
+                raise httpx.ReadTimeout("timed out", request=request)
+            time.sleep(delay)
+        return self.inner.handle_request(request)
+
+
+@pytest.fixture
+def patients() -> list[PatientDetail]:
+    return synthetic_patients(5, seed=7)
+
+
+@pytest.fixture
+def standin(patients: list[PatientDetail]) -> StandIn:
+    return StandIn(patients, seed=7)
+
+
+@pytest.fixture
+def client(standin: StandIn) -> Iterator[VirtualClinic]:
+    with VirtualClinic(token="test", transport=standin.transport()) as client:
+        yield client
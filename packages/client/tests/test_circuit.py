@@ -0,0 +1,96 @@
+"""The per-endpoint circuit breaker and its health() probe."""
+
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+
+from virtual_clinic import (
+    CircuitBreakerPolicy,
+    CircuitOpenError,
+    ServerError,
+    VirtualClinic,
+)
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import StandIn
+
+
+class FlakyTransport(httpx.BaseTransport):
+    """Answers ``503`` for the paths in ``failing``; counts requests per path."""
+
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self.inner = inner
+        self.failing: set[str] = set()
+        self.counts: dict[str, int] = {}
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.counts[path] = self.counts.get(path, 0) + 1
+        if path in self.failing:
+            return httpx.Response(503, json={"error": "Unavailable"})
+        return self.inner.handle_request(request)
+
+
+def test_circuit_opens_then_closes_after_a_healthy_probe(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    path = f"/api/patients/{pid}"
+    transport = FlakyTransport(standin.transport())
+    transport.failing.add(path)
+    breaker = CircuitBreakerPolicy(min_calls=3, cooldown=0.2)
+    with VirtualClinic(
+        token="test", transport=transport, circuit_breaker=breaker
+    ) as client:
+        for _ in range(3):
+            with pytest.raises(ServerError):
+                client.patients.get(pid)
+        with pytest.raises(CircuitOpenError):
+            client.patients.get(pid)
+        # Other endpoints have circuits of their own.
+        assert client.patients.list().pagination.total == len(patients)
+        assert transport.counts[path] == 3
+
+        transport.failing.clear()
+        time.sleep(0.25)
+        assert client.patients.get(pid).patient.id == pid
+
+    assert transport.counts["/api/health"] == 1
+
+
+def test_unhealthy_probe_keeps_the_circuit_open(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    transport = FlakyTransport(standin.transport())
+    transport.failing.update({f"/api/patients/{pid}", "/api/health"})
+    breaker = CircuitBreakerPolicy(min_calls=2, cooldown=0.1)
+    with VirtualClinic(
+        token="test", transport=transport, circuit_breaker=breaker
+    ) as client:
+        for _ in range(2):
+            with pytest.raises(ServerError):
+                client.patients.get(pid)
+        time.sleep(0.15)
+        with pytest.raises(CircuitOpenError):
+            client.patients.get(pid)
+
+    assert transport.counts["/api/health"] == 1
+    assert transport.counts[f"/api/patients/{pid}"] == 2
+
+
+def test_failed_health_check_opens_every_circuit(standin: StandIn) -> None:
+    transport = FlakyTransport(standin.transport())
+    transport.failing.add("/api/health")
+    breaker = CircuitBreakerPolicy(cooldown=60)
+    with VirtualClinic(
+        token="test", transport=transport, circuit_breaker=breaker
+    ) as client:
+        with pytest.raises(ServerError):
+            client.health()
+        with pytest.raises(CircuitOpenError):
+            client.patients.list()
+
+    assert "/api/patients" not in transport.counts
@@ -0,0 +1,111 @@
+"""Cohort statistics, checked against plain Python loops."""
+
+from __future__ import annotations
+
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+
+import pytest
+
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import synthetic_patients
+
+pytest.importorskip("scipy")
+
+from virtual_clinic.cohort import Cohort  # noqa: E402
+
+
+@pytest.fixture
+def details() -> list[PatientDetail]:
+    return synthetic_patients(40, seed=11)
+
+
+def _patients_with(details: list[PatientDetail], kind: str) -> Counter[str]:
+    return Counter(code for d in details for code in {r.code for r in getattr(d, kind)})
+
+
+def test_prevalence_and_top_codes(details: list[PatientDetail]) -> None:
+    cohort = Cohort.from_details(details)
+    expected = _patients_with(details, "conditions")
+
+    counts = dict(zip(cohort.conditions.codes, cohort.conditions.patient_counts()))
+    assert counts == expected
+    assert cohort.conditions.prevalence().max() == max(expected.values()) / 40
+    top = cohort.conditions.top(3)
+    assert [n for _, _, n in top] == sorted(expected.values(), reverse=True)[:3]
+
+
+def test_group_by_counts_patients_per_group(details: list[PatientDetail]) -> None:
+    cohort = Cohort.from_details(details)
+    labels, counts = cohort.group_by("medications", "gender")
+
+    for g, label in enumerate(labels):
+        group = [d for d in details if d.patient.gender == label]
+        expected = _patients_with(group, "medications")
+        for j, code in enumerate(cohort.medications.codes):
+            assert counts[g, j] == expected[code]
+    assert cohort.group_sizes("gender") == Counter(d.patient.gender for d in details)
+
+
+def test_cooccurrence_and_cross(details: list[PatientDetail]) -> None:
+    cohort = Cohort.from_details(details)
+    pairs: Counter[tuple[str, str]] = Counter()
+    for d in details:
+        codes = sorted({c.code for c in d.conditions})
+        pairs.update(combinations(codes, 2))
+
+    top = cohort.conditions.top_pairs(5)
+    assert [n for _, _, n in top] == sorted(pairs.values(), reverse=True)[:5]
+    for a, b, n in top:
+        assert pairs[tuple(sorted((a, b)))] == n
+
+    cross = cohort.cross("conditions", "medications")
+    i = cohort.conditions.codes.index(top[0][0])
+    for j, med in enumerate(cohort.medications.codes):
+        assert cross[i, j] == sum(
+            1
+            for d in details
+            if top[0][0] in {c.code for c in d.conditions}
+            and med in {m.code for m in d.medications}
+        )
+
+
+def test_encounter_costs(details: list[PatientDetail]) -> None:
+    costs: list[float] = []
+    for n, encounter in enumerate(e for d in details for e in d.encounters):
+        if n % 5:  # leave some without a cost
+            encounter.total_claim_cost = f"{n * 12.5:.2f}"
+            costs.append(n * 12.5)
+    cohort = Cohort.from_details(details)
+
+    summary = cohort.encounter_costs()["all"]
+    assert summary["count"] == len(costs)
+    assert summary["total"] == pytest.approx(sum(costs))
+    assert summary["p50"] == pytest.approx(sorted(costs)[len(costs) // 2], rel=0.1)
+
+    by_class = cohort.encounter_costs(by="encounter_class")
+    assert sum(s["count"] for s in by_class.values()) == len(costs)
+    by_gender = cohort.encounter_costs(by="gender")
+    assert sum(s["total"] for s in by_gender.values()) == pytest.approx(sum(costs))
+
+
+def test_active_only_skips_stopped_records(details: list[PatientDetail]) -> None:
+    cohort = Cohort.from_details(details, active_only=True)
+    active = sum(1 for d in details for c in d.conditions if not c.stop)
+    assert cohort.conditions.matrix.sum() == active
+
+
+def test_from_directory_reads_a_local_store(
+    tmp_path: Path, details: list[PatientDetail]
+) -> None:
+    for detail in details:
+        path = tmp_path / f"{detail.patient.id}.json"
+        path.write_text(detail.model_dump_json(by_alias=True), encoding="utf-8")
+
+    cohort = Cohort.from_directory(tmp_path)
+    assert cohort.patient_ids == sorted(d.patient.id for d in details)
+    expected = _patients_with(details, "procedures")
+    assert dict(zip(cohort.procedures.codes, cohort.procedures.patient_counts())) == (
+        expected
+    )
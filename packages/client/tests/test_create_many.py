@@ -0,0 +1,49 @@
+"""Starting many conversations at once with ``create_many``."""
+
+from __future__ import annotations
+
+import time
+
+import pydantic
+
+from virtual_clinic import ConversationSpec, NotFoundError, VirtualClinic
+from virtual_clinic.models import CreatedConversation, PatientDetail
+from virtual_clinic.standin import StandIn
+
+from .conftest import CountingTransport
+
+
+def test_create_many_reports_invalid_specs_per_item(
+    client: VirtualClinic, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    results = client.conversations.create_many(
+        [
+            (pid, "diagnosis"),
+            (pid, "not-a-task"),  # type: ignore[list-item]
+            ("00000000-0000-0000-0000-000000000000", "treatment"),
+            ConversationSpec(patient_id=pid, task_type="event"),
+        ]
+    )
+
+    assert isinstance(results[0], CreatedConversation)
+    assert isinstance(results[1], pydantic.ValidationError)
+    assert isinstance(results[2], NotFoundError)
+    assert isinstance(results[3], CreatedConversation)
+    assert results[3].task_type == "event"
+
+
+def test_create_many_bounds_requests_in_flight(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    transport = CountingTransport(standin.transport(), lambda request, n: 0.1)
+    specs = [(p.patient.id, "diagnosis") for p in patients[:4]] * 2
+    with VirtualClinic(token="test", transport=transport) as client:
+        started = time.perf_counter()
+        results = client.conversations.create_many(specs, concurrency=4)
+        elapsed = time.perf_counter() - started
+
+    created = [r for r in results if isinstance(r, CreatedConversation)]
+    assert [r.patient_id for r in created] == [pid for pid, _ in specs]
+    assert transport.counts == {"/api/conversations": 8}
+    assert 0.2 <= elapsed < 0.6
@@ -0,0 +1,68 @@
+"""Incremental EHR refresh: get_changes, merge_changes and fingerprints."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from virtual_clinic import VirtualClinic, ehr_fingerprint, merge_changes
+from virtual_clinic.models import Encounter, PatientDetail
+from virtual_clinic.standin import StandIn
+
+
+def test_refresh_picks_up_a_new_record(
+    client: VirtualClinic, standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    cached = client.patients.get(pid)
+    since = datetime.now(timezone.utc)
+
+    updated = cached.model_copy(deep=True)
+    updated.encounters.append(
+        Encounter(
+            id="11111111-1111-1111-1111-111111111111",
+            start=(since + timedelta(seconds=1)).isoformat(),
+            patient_id=pid,
+            code="185349003",
+            description="Encounter for check up",
+        )
+    )
+    updated.summary.encounters_count += 1
+    standin.update_patient(updated)
+
+    changes = client.patients.get_changes(pid, since=since)
+    assert [e.id for e in changes.encounters] == [updated.encounters[-1].id]
+    assert changes.fingerprint == ehr_fingerprint(updated)
+    assert merge_changes(cached, changes) == client.patients.get(pid)
+
+
+def test_edit_without_a_new_date_forces_a_full_fetch(
+    client: VirtualClinic, standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    cached = client.patients.get(pid)
+    since = datetime.now(timezone.utc)
+
+    corrected = cached.model_copy(deep=True)
+    corrected.conditions[0].description = "Corrected description"
+    standin.update_patient(corrected)
+
+    changes = client.patients.get_changes(pid, since=since)
+    assert changes.conditions == []
+    with pytest.raises(ValueError, match="fingerprint"):
+        merge_changes(cached, changes)
+
+    refreshed, _ = client.patients.refresh(cached, since=since)
+    assert refreshed.conditions[0].description == "Corrected description"
+
+
+def test_fingerprint_ignores_record_order(patients: list[PatientDetail]) -> None:
+    detail = patients[1]
+    shuffled = detail.model_copy(
+        update={"conditions": list(reversed(detail.conditions))}
+    )
+    assert ehr_fingerprint(shuffled) == ehr_fingerprint(detail)
+    assert ehr_fingerprint(detail.model_dump(mode="json", by_alias=True)) == (
+        ehr_fingerprint(detail)
+    )
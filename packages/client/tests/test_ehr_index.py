@@ -0,0 +1,111 @@
+"""EHRIndex and its interval tree."""
+
+from __future__ import annotations
+
+import math
+import random
+
+from virtual_clinic import EHRIndex
+from virtual_clinic.ehr_index import IntervalTree, to_timestamp
+from virtual_clinic.models import Condition, Medication, PatientDetail
+
+
+def test_interval_tree_matches_a_linear_scan() -> None:
+    rng = random.Random(3)
+    intervals: list[tuple[float, float, int]] = []
+    for i in range(500):
+        start = rng.uniform(0, 1000)
+        stop = math.inf if rng.random() < 0.1 else start + rng.expovariate(0.02)
+        intervals.append((start, stop, i))
+    tree = IntervalTree(intervals)
+
+    for _ in range(200):
+        t = rng.uniform(-10, 1100)
+        assert tree.at(t) == [i for start, stop, i in intervals if start <= t <= stop]
+
+        lo = rng.uniform(-10, 1100)
+        hi = lo + rng.uniform(0, 50)
+        assert tree.overlapping(lo, hi) == [
+            i for start, stop, i in intervals if start <= hi and stop >= lo
+        ]
+
+
+def _with_conditions(
+    detail: PatientDetail, *spans: tuple[str, str | None]
+) -> PatientDetail:
+    conditions = [
+        Condition(
+            start=start,
+            stop=stop,
+            patient_id=detail.patient.id,
+            code=f"code-{i}",
+            description=f"Condition {i}",
+        )
+        for i, (start, stop) in enumerate(spans)
+    ]
+    return detail.model_copy(update={"conditions": conditions})
+
+
+def test_active_and_overlapping(patients: list[PatientDetail]) -> None:
+    detail = _with_conditions(
+        patients[0],
+        ("2010-01-01", "2012-01-01"),
+        ("2011-06-01", None),
+        ("2015-03-01", "2015-04-01"),
+    )
+    index = EHRIndex(detail)
+
+    def codes(records: list[object]) -> list[str]:
+        return [r.code for r in records]  # type: ignore[attr-defined]
+
+    assert codes(index.active("conditions", "2011-07-01")) == ["code-0", "code-1"]
+    assert codes(index.active("conditions", "2009-12-31")) == []
+    assert codes(index.active("conditions", "2020-01-01")) == ["code-1"]
+    assert codes(index.overlapping("conditions", "2013-01-01", "2015-03-01")) == [
+        "code-1",
+        "code-2",
+    ]
+    assert codes(index.by_code("conditions", "code-2")) == ["code-2"]
+    assert index.codes("conditions") == {"code-0", "code-1", "code-2"}
+
+
+def test_date_only_stop_covers_the_whole_day(patients: list[PatientDetail]) -> None:
+    detail = _with_conditions(patients[0], ("2019-06-01", "2019-06-10"))
+    detail.medications = [
+        Medication(
+            start="2019-06-01T08:00:00Z",
+            stop="2019-06-10T12:00:00Z",
+            patient_id=detail.patient.id,
+            code="med",
+            description="Medication",
+        )
+    ]
+    index = EHRIndex(detail)
+
+    assert len(index.active("conditions", "2019-06-10T18:30:00Z")) == 1
+    assert len(index.active("conditions", "2019-06-10T23:59:59.999Z")) == 1
+    assert index.active("conditions", "2019-06-11") == []
+    assert (
+        len(index.overlapping("conditions", "2019-06-10T20:00:00Z", "2019-07-01")) == 1
+    )
+    # A stop with a time of day is exact.
+    assert index.active("medications", "2019-06-10T12:00:01Z") == []
+    assert len(index.active("medications", "2019-06-10T12:00:00Z")) == 1
+
+
+def test_point_queries_match_a_linear_scan(patients: list[PatientDetail]) -> None:
+    detail = patients[0]
+    index = EHRIndex(detail)
+    for encounter in detail.encounters:
+        t = to_timestamp(encounter.start)
+        expected = [
+            e
+            for e in detail.encounters
+            if to_timestamp(e.start) <= t
+            and (
+                e.stop is None or t <= max(to_timestamp(e.start), to_timestamp(e.stop))
+            )
+        ]
+        assert sorted(map(id, index.active("encounters", t))) == sorted(
+            map(id, expected)
+        )
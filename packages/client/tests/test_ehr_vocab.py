@@ -0,0 +1,40 @@
+"""Compact patient storage with a shared vocabulary."""
+
+from __future__ import annotations
+
+import pytest
+
+from virtual_clinic import CompactPatient, Vocabulary
+from virtual_clinic.models import PatientDetail
+
+
+def test_compact_patient_round_trips(patients: list[PatientDetail]) -> None:
+    vocabulary = Vocabulary()
+    for detail in patients:
+        from_detail = CompactPatient.from_detail(detail, vocabulary)
+        from_json = CompactPatient.from_json(
+            detail.model_dump(mode="json", by_alias=True), vocabulary
+        )
+        assert from_detail.to_detail() == detail
+        assert from_json.to_detail() == detail
+        assert from_detail.to_detail().model_fields_set == detail.model_fields_set
+
+
+def test_compact_patients_share_one_vocabulary(
+    patients: list[PatientDetail],
+) -> None:
+    vocabulary = Vocabulary()
+    compact = [CompactPatient.from_detail(d, vocabulary) for d in patients]
+    descriptions = {c.description for d in patients for c in d.conditions}
+
+    assert len(vocabulary) >= len(descriptions)
+    assert all(vocabulary.id(text) is not None for text in descriptions)
+    first = compact[0].conditions
+    assert first.column("description") == [
+        c.description for c in patients[0].conditions
+    ]
+    assert list(first.ids("code")) == [
+        vocabulary.id(c.code) for c in patients[0].conditions
+    ]
+    with pytest.raises(KeyError):
+        first.ids("start")
@@ -0,0 +1,84 @@
+"""Batches of client calls with ``map`` and ``get_many``."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from virtual_clinic import (
+    Deadline,
+    DeadlineExceededError,
+    NotFoundError,
+    VirtualClinic,
+)
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import StandIn
+
+from .conftest import CountingTransport
+
+MISSING = "00000000-0000-0000-0000-000000000000"
+
+
+def test_get_many_keeps_order_and_reports_failures_per_item(
+    client: VirtualClinic, patients: list[PatientDetail]
+) -> None:
+    ids = [p.patient.id for p in reversed(patients)]
+    results = client.patients.get_many([*ids[:2], MISSING, *ids[2:]])
+
+    assert isinstance(results[2], NotFoundError)
+    found = [r for r in results if isinstance(r, PatientDetail)]
+    assert [r.patient.id for r in found] == ids
+
+
+def test_map_bounds_calls_in_flight(client: VirtualClinic) -> None:
+    lock = threading.Lock()
+    running = peak = 0
+
+    def work(n: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        if n == 3:
+            raise ValueError(n)
+        return n * n
+
+    results = client.map(work, range(12), concurrency=3)
+
+    assert peak == 3
+    assert isinstance(results[3], ValueError)
+    assert [r for i, r in enumerate(results) if i != 3] == [
+        i * i for i in range(12) if i != 3
+    ]
+    assert client.map(work, [], concurrency=3) == []
+    with pytest.raises(ValueError):
+        client.map(work, [1], concurrency=0)
+
+
+def test_get_many_runs_requests_concurrently(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    transport = CountingTransport(standin.transport(), lambda request, n: 0.1)
+    with VirtualClinic(token="test", transport=transport) as client:
+        started = time.perf_counter()
+        results = client.patients.get_many(p.patient.id for p in patients)
+        elapsed = time.perf_counter() - started
+
+    assert all(isinstance(r, PatientDetail) for r in results)
+    assert elapsed < 0.1 * len(patients) / 2
+
+
+def test_fan_out_inherits_the_deadline(
+    client: VirtualClinic, patients: list[PatientDetail]
+) -> None:
+    with Deadline(0.01):
+        time.sleep(0.02)
+        results = client.patients.get_many(p.patient.id for p in patients)
+        deadlines = client.map(lambda _: Deadline.current(), range(2))
+    assert all(isinstance(r, DeadlineExceededError) for r in results)
+    assert all(d is not None and d.expired for d in deadlines)
@@ -0,0 +1,72 @@
+"""Connection warmup and the keepalive thread."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+import virtual_clinic.client
+from virtual_clinic import VirtualClinic
+from virtual_clinic._keepalive import Keepalive
+from virtual_clinic.standin import StandIn
+
+from .conftest import CountingTransport
+
+
+def test_warmup_sends_one_ping_per_connection(standin: StandIn) -> None:
+    transport = CountingTransport(standin.transport())
+    with VirtualClinic(token="test", transport=transport) as client:
+        assert client.warmup(3) == 3
+        assert client.warmup(0) == 0
+
+    assert transport.counts == {"/api/health": 3}
+    assert client.metrics.requests() == {("health", "2xx"): 3}
+
+
+def test_keepalive_reuses_one_pool_until_stopped(
+    monkeypatch: pytest.MonkeyPatch, standin: StandIn
+) -> None:
+    pools: list[ThreadPoolExecutor] = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(virtual_clinic.client, "ThreadPoolExecutor", RecordingPool)
+    transport = CountingTransport(standin.transport())
+    with VirtualClinic(token="test", transport=transport) as client:
+        client.start_keepalive(0.02, connections=2)
+        time.sleep(0.15)
+        client.stop_keepalive()
+        pings = transport.counts["/api/health"]
+
+        assert pings >= 4 and pings % 2 == 0
+        assert len(pools) == 1
+        with pytest.raises(RuntimeError):  # shut down with the keepalive
+            pools[0].submit(print)
+        time.sleep(0.05)
+        assert transport.counts["/api/health"] == pings
+
+
+def test_keepalive_ignores_failed_pings_and_runs_on_stop() -> None:
+    calls: list[str] = []
+    stopped = threading.Event()
+
+    def ping() -> None:
+        calls.append("ping")
+        raise RuntimeError("unreachable")
+
+    keepalive = Keepalive(ping, 0.01, on_stop=stopped.set)
+    keepalive.start()
+    time.sleep(0.05)
+    keepalive.stop()
+
+    assert len(calls) >= 2
+    assert stopped.is_set()
+    with pytest.raises(ValueError):
+        Keepalive(ping, 0)
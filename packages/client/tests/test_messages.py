@@ -0,0 +1,140 @@
+"""Incremental ``get_messages`` polling with ``?after=``."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+import virtual_clinic.standin
+from virtual_clinic import NotFoundError, VirtualClinic
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import StandIn
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Records the ``after`` param of every request; ``fail`` may answer first."""
+
+    def __init__(
+        self,
+        inner: httpx.BaseTransport,
+        fail: Callable[[httpx.Request], httpx.Response | None] | None = None,
+    ) -> None:
+        self.inner = inner
+        self.fail = fail
+        self.afters: list[str | None] = []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.afters.append(request.url.params.get("after"))
+        if self.fail is not None and (response := self.fail(request)) is not None:
+            return response
+        return self.inner.handle_request(request)
+
+
+def _conversation(client: VirtualClinic, patients: list[PatientDetail]) -> str:
+    convo = client.conversations.create(
+        patient_id=patients[0].patient.id, task_type="diagnosis"
+    )
+    client.conversations.send_message(convo.id, content="What brings you in?")
+    return convo.id
+
+
+def test_polling_fetches_only_new_messages_by_id(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    transport = RecordingTransport(standin.transport())
+    with VirtualClinic(token="test", transport=transport) as client:
+        cid = _conversation(client, patients)
+        first = client.conversations.get_messages(cid)
+        client.conversations.send_message(cid, content="Any allergies?")
+        transport.afters.clear()
+
+        new = client.conversations.get_messages(cid, after=first[-1].id)
+        everything = client.conversations.get_messages(cid)
+
+    assert new[0].content == "Any allergies?"
+    assert len(new) == 2
+    assert [m.id for m in everything] == [m.id for m in first + new]
+    assert transport.afters == [first[-1].id, new[-1].id]
+
+
+def test_timestamp_cursor_includes_messages_created_at_that_time(
+    client: VirtualClinic, patients: list[PatientDetail]
+) -> None:
+    cid = _conversation(client, patients)
+    client.conversations.send_message(cid, content="Any allergies?")
+    messages = client.conversations.get_messages(cid)
+
+    since = messages[2].created_at
+    assert client.conversations.get_messages(cid, after=since) == messages[2:]
+    assert client.conversations.get_messages(cid, after="2000-01-01") == messages
+
+
+def test_invalid_cursor_is_rejected(
+    standin: StandIn, client: VirtualClinic, patients: list[PatientDetail]
+) -> None:
+    cid = _conversation(client, patients)
+    with pytest.raises(ValueError, match="neither a message id"):
+        client.conversations.get_messages(cid, after="yesterday")
+
+    status, body = standin.handle(
+        "GET",
+        f"/api/conversations/{cid}",
+        params={"after": "yesterday"},
+        authorization="Bearer test",
+    )
+    assert status == 400
+    assert "after" in body["details"]
+
+
+def test_missing_cursor_falls_back_to_a_full_fetch(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    gone = False
+
+    def cursor_gone(request: httpx.Request) -> httpx.Response | None:
+        if gone and "after" in request.url.params:
+            return httpx.Response(404, json={"error": "Message not found"})
+        return None
+
+    transport = RecordingTransport(standin.transport(), cursor_gone)
+    with VirtualClinic(token="test", transport=transport) as client:
+        cid = _conversation(client, patients)
+        first = client.conversations.get_messages(cid)
+        gone = True
+        transport.afters.clear()
+
+        again = client.conversations.get_messages(cid)
+        assert again == first
+        assert transport.afters == [first[-1].id, None]
+
+        with pytest.raises(NotFoundError):
+            client.conversations.get_messages("00000000-0000-0000-0000-000000000000")
+
+
+def test_messages_sharing_the_cursor_timestamp_are_not_duplicated(
+    monkeypatch: pytest.MonkeyPatch,
+    standin: StandIn,
+    client: VirtualClinic,
+    patients: list[PatientDetail],
+) -> None:
+    monkeypatch.setattr(virtual_clinic.standin, "_now", lambda: "2024-05-01T12:00:00Z")
+    cid = _conversation(client, patients)
+    first = client.conversations.get_messages(cid)
+    client.conversations.send_message(cid, content="Any allergies?")
+
+    # The server answers with every message at the cursor's timestamp.
+    status, body = standin.handle(
+        "GET",
+        f"/api/conversations/{cid}",
+        params={"after": first[-1].id},
+        authorization="Bearer test",
+    )
+    assert status == 200
+    assert len(body["data"]["messages"]) == 3
+
+    messages = client.conversations.get_messages(cid)
+    assert len(messages) == 4
+    assert len({m.id for m in messages}) == 4
+    assert messages[:2] == first
@@ -0,0 +1,93 @@
+"""Health checks and the Prometheus exporter."""
+
+from __future__ import annotations
+
+import time
+import urllib.error
+import urllib.request
+
+import httpx
+import pytest
+
+from virtual_clinic import HealthMonitor, VirtualClinic
+from virtual_clinic.standin import StandIn
+
+
+class HealthTransport(httpx.BaseTransport):
+    """Answers ``/api/health`` as ``status`` says; the stand-in answers the rest."""
+
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self.inner = inner
+        self.status = "ok"
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/api/health" or self.status == "ok":
+            return self.inner.handle_request(request)
+        if self.status == "degraded":
+            return httpx.Response(503, json={"status": "degraded"})
+        raise httpx.ConnectError("refused", request=request)
+
+
+def _samples(text: str, name: str) -> list[str]:
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+def test_nothing_is_reported_about_checks_before_the_first(
+    client: VirtualClinic,
+) -> None:
+    text = HealthMonitor(client).render()
+
+    assert "virtual_clinic_up" not in text
+    assert "virtual_clinic_health_last_check_timestamp_seconds" not in text
+    assert "virtual_clinic_health_check_duration_seconds" not in text
+    assert 'virtual_clinic_health_checks_total{result="up"} 0' in text
+
+
+def test_checks_are_counted_by_result(standin: StandIn) -> None:
+    transport = HealthTransport(standin.transport())
+    with VirtualClinic(token="test", transport=transport) as client:
+        monitor = HealthMonitor(client)
+        before = time.time()
+        assert monitor.check() == "up"
+        transport.status = "degraded"
+        assert monitor.check() == "degraded"
+        transport.status = "down"
+        assert monitor.check() == "down"
+        text = monitor.render()
+
+    assert monitor.last == "down"
+    assert _samples(text, "virtual_clinic_up") == ["virtual_clinic_up 0"]
+    assert 'virtual_clinic_health_checks_total{result="degraded"} 1' in text
+    assert _samples(text, "virtual_clinic_health_consecutive_failures") == [
+        "virtual_clinic_health_consecutive_failures 2"
+    ]
+    (stamp,) = _samples(text, "virtual_clinic_health_last_check_timestamp_seconds")
+    assert float(stamp.split()[-1]) >= before
+    assert "virtual_clinic_health_check_duration_seconds_count 3" in text
+    assert 'virtual_clinic_requests_total{endpoint="health",outcome="2xx"} 1' in text
+
+
+def test_start_checks_at_once_then_polls(client: VirtualClinic) -> None:
+    with HealthMonitor(client, interval=0.02) as monitor:
+        assert monitor.last == "up"
+        time.sleep(0.1)
+    count = client.metrics.requests()["health", "2xx"]
+    assert count >= 3
+    time.sleep(0.05)
+    assert client.metrics.requests()["health", "2xx"] == count
+
+
+def test_serve_exports_metrics_over_http(client: VirtualClinic) -> None:
+    monitor = HealthMonitor(client)
+    monitor.check()
+    server = monitor.serve(port=0)
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            body = response.read().decode()
+            assert response.headers["Content-Type"].startswith("text/plain")
+        assert "virtual_clinic_up 1" in body
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base}/other", timeout=5)
+    finally:
+        server.shutdown()
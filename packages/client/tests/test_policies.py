@@ -0,0 +1,79 @@
+"""Per-endpoint timeout policies and hedged GETs."""
+
+from __future__ import annotations
+
+import time
+
+import httpx
+
+from virtual_clinic import HedgePolicy, TimeoutPolicy, VirtualClinic
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import StandIn
+
+from .conftest import CountingTransport
+
+
+def test_each_endpoint_gets_its_own_timeouts(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    seen: dict[str, dict[str, float]] = {}
+    inner = standin.transport()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen[request.url.path] = request.extensions["timeout"]
+        return inner.handle_request(request)
+
+    pid = patients[0].patient.id
+    with VirtualClinic(
+        token="test",
+        transport=httpx.MockTransport(handler),
+        timeout=90.0,
+        timeouts={"patients.get": 2.5, "patients.list": TimeoutPolicy(read=7.0)},
+    ) as client:
+        client.patients.get(pid)
+        client.patients.list()
+        conversation = client.conversations.create(
+            patient_id=pid, task_type="diagnosis"
+        )
+        client.conversations.send_message(conversation.id, content="Hello")
+
+    assert seen[f"/api/patients/{pid}"] == dict.fromkeys(
+        ("connect", "read", "write", "pool"), 2.5
+    )
+    assert seen["/api/patients"]["read"] == 7.0
+    # conversations.create keeps its default; send_message uses ``timeout``.
+    assert seen["/api/conversations"]["read"] == 30.0
+    assert seen[f"/api/conversations/{conversation.id}/messages"]["read"] == 90.0
+
+
+def test_hedging_answers_a_stalled_request_from_the_second_attempt(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    # The first request warms up the latency tracker; the second stalls.
+    transport = CountingTransport(
+        standin.transport(), lambda request, n: 2.0 if n == 2 else 0.0
+    )
+    hedge = HedgePolicy(min_samples=1, min_delay=0.01, max_delay=0.05)
+    with VirtualClinic(token="test", transport=transport, hedge=hedge) as client:
+        client.patients.get(pid)
+        started = time.perf_counter()
+        detail = client.patients.get(pid)
+        elapsed = time.perf_counter() - started
+
+    assert detail.patient.id == pid
+    assert elapsed < 1.0
+    assert transport.counts[f"/api/patients/{pid}"] == 3
+
+
+def test_no_hedging_until_enough_latencies_are_observed(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    transport = CountingTransport(standin.transport(), lambda request, n: 0.1)
+    hedge = HedgePolicy(min_samples=5, min_delay=0.01, max_delay=0.01)
+    with VirtualClinic(token="test", transport=transport, hedge=hedge) as client:
+        for _ in range(3):
+            client.patients.get(pid)
+
+    assert transport.counts[f"/api/patients/{pid}"] == 3
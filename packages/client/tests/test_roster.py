@@ -0,0 +1,67 @@
+"""RosterIndex filtering and stratified sampling."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+
+from virtual_clinic import RosterIndex, VirtualClinic
+from virtual_clinic.models import PatientDetail, PatientSummary
+
+
+def _roster() -> RosterIndex:
+    summaries = [
+        PatientSummary(
+            id=f"p{i}",
+            first="First",
+            last="Last",
+            birth_date=f"{1950 + i % 50}-01-01",
+            death_date="2020-01-01" if i % 10 == 0 else None,
+            gender="F" if i < 60 else "M",
+            state="MA" if i % 4 else "NY",
+        )
+        for i in range(100)
+    ]
+    return RosterIndex.from_summaries(summaries, as_of=date(2025, 6, 1))
+
+
+def test_filter_combines_columns_and_age() -> None:
+    roster = _roster()
+    rows = roster.filter(gender="F", state=["NY"], min_age=40, max_age=60, alive=True)
+
+    expected = [
+        i
+        for i in range(len(roster))
+        if roster.columns["gender"][i] == "F"
+        and roster.columns["state"][i] == "NY"
+        and 40 <= roster.ages[i] <= 60
+        and roster.columns["death_date"][i] is None
+    ]
+    assert rows == expected
+
+
+def test_sample_is_proportional_to_each_stratum() -> None:
+    roster = _roster()
+    sample = roster.sample(10, strata=("gender",), seed=1)
+
+    assert len(sample) == 10
+    assert len({p.id for p in sample}) == 10
+    assert Counter(p.gender for p in sample) == {"F": 6, "M": 4}
+
+
+def test_sample_is_reproducible_and_capped_at_the_population() -> None:
+    roster = _roster()
+    first = roster.sample(7, strata=("gender", "state"), age_band=10, seed=5)
+    again = roster.sample(7, strata=("gender", "state"), age_band=10, seed=5)
+    assert first == again
+
+    population = roster.filter(state="NY")
+    assert len(roster.sample(1000, state="NY", seed=5)) == len(population)
+    assert roster.sample(5, gender="X") == []
+
+
+def test_fetch_pages_through_the_api(
+    client: VirtualClinic, patients: list[PatientDetail]
+) -> None:
+    roster = RosterIndex.fetch(client, page_size=2)
+    assert sorted(roster.columns["id"]) == sorted(p.patient.id for p in patients)
@@ -0,0 +1,155 @@
+"""Coalescing of identical in-flight GETs, and the deadlines of their callers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from virtual_clinic import Deadline, DeadlineExceededError, VirtualClinic
+from virtual_clinic._singleflight import SingleFlight
+from virtual_clinic.models import PatientDetail
+from virtual_clinic.standin import StandIn
+
+from .conftest import CountingTransport
+
+
+def test_concurrent_identical_gets_share_one_request(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    transport = CountingTransport(standin.transport(), lambda request, n: 0.2)
+    with VirtualClinic(token="test", transport=transport) as client:
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: client.patients.get(pid), range(8)))
+
+    assert transport.counts == {f"/api/patients/{pid}": 1}
+    assert all(result is results[0] for result in results)
+
+
+def test_different_params_are_not_coalesced(standin: StandIn) -> None:
+    transport = CountingTransport(standin.transport(), lambda request, n: 0.1)
+    with VirtualClinic(token="test", transport=transport) as client:
+        with ThreadPoolExecutor(2) as pool:
+            pages = list(pool.map(lambda p: client.patients.list(page=p), (1, 2)))
+
+    assert transport.counts == {"/api/patients": 2}
+    assert [page.pagination.page for page in pages] == [1, 2]
+
+
+def test_coalescing_can_be_disabled(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    transport = CountingTransport(standin.transport(), lambda request, n: 0.1)
+    with VirtualClinic(token="test", transport=transport, coalesce=False) as client:
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda _: client.patients.get(pid), range(4)))
+
+    assert transport.counts == {f"/api/patients/{pid}": 4}
+
+
+def test_followers_receive_the_leaders_exception() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing() -> str:
+        release.wait()
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "key", failing)
+        time.sleep(0.05)
+        follower = pool.submit(flight.do, "key", lambda: "unused")
+        time.sleep(0.05)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="boom"):
+                future.result(timeout=5)
+
+
+def test_follower_outlives_the_leaders_deadline(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    transport = CountingTransport(
+        standin.transport(), lambda request, n: 0.5 if n == 1 else 0.0
+    )
+    with VirtualClinic(token="test", transport=transport) as client:
+
+        def lead() -> PatientDetail:
+            with Deadline(0.2):
+                return client.patients.get(pid)
+
+        with ThreadPoolExecutor(1) as pool:
+            leader = pool.submit(lead)
+            time.sleep(0.05)  # let the leader's request start
+            # No deadline of its own: the leader's running out is no reason
+            # to fail.
+            assert client.patients.get(pid).patient.id == pid
+            with pytest.raises(DeadlineExceededError):
+                leader.result()
+
+    assert transport.counts == {f"/api/patients/{pid}": 2}
+
+
+def test_coalesced_follower_honours_its_own_deadline(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    pid = patients[0].patient.id
+    transport = CountingTransport(standin.transport(), lambda request, n: 1.0)
+    with VirtualClinic(token="test", transport=transport) as client:
+        with ThreadPoolExecutor(1) as pool:
+            leader = pool.submit(client.patients.get, pid)
+            time.sleep(0.1)  # let the leader's request start
+
+            started = time.perf_counter()
+            with pytest.raises(DeadlineExceededError), Deadline(0.1):
+                client.patients.get(pid)
+            waited = time.perf_counter() - started
+
+            assert leader.result().patient.id == pid
+    assert waited < 0.5
+
+
+def test_followers_retry_when_the_leader_is_interrupted() -> None:
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    outcomes: list[object] = []
+
+    def interrupted() -> str:
+        started.set()
+        release.wait()
+        raise KeyboardInterrupt
+
+    def lead() -> None:
+        try:
+            flight.do("key", interrupted)
+        except KeyboardInterrupt as exc:
+            outcomes.append(exc)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait()
+    with ThreadPoolExecutor(1) as pool:
+        follower = pool.submit(flight.do, "key", lambda: "follower")
+        time.sleep(0.05)  # let the follower start waiting
+        release.set()
+        assert follower.result(timeout=5) == "follower"
+    leader.join()
+    assert len(outcomes) == 1 and isinstance(outcomes[0], KeyboardInterrupt)
+
+
+def test_expired_deadline_fails_fast_without_a_request(
+    standin: StandIn, patients: list[PatientDetail]
+) -> None:
+    transport = CountingTransport(standin.transport())
+    with VirtualClinic(token="test", transport=transport) as client:
+        with Deadline(0.01):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceededError):
+                client.patients.get(patients[0].patient.id)
+    assert transport.counts == {}